@@ -16,6 +16,13 @@ __docformat__ = 'reStructuredText'
 
 import sys
 import pprint
+import threading
+import time
+import Queue
+try:
+    import resource
+except ImportError:                     # not available on Windows
+    resource = None
 from docutils import __version__, __version_details__, SettingsSpec
 from docutils import frontend, io, utils, readers, writers
 from docutils.frontend import OptionParser
@@ -75,6 +82,10 @@ class Publisher:
         """An object containing Docutils settings as instance attributes.
         Set by `self.process_command_line()` or `self.get_settings()`."""
 
+        self.timings = None
+        """Instrumentation data of the last `publish()` call with the
+        "timings" setting, a dictionary (see `publish_timed()`)."""
+
         self._stderr = ErrorOutput()
 
     def set_reader(self, reader_name, parser, parser_name):
@@ -98,9 +109,11 @@ class Publisher:
         if self.writer is None:
             self.set_writer(writer_name)
 
-    def setup_option_parser(self, usage=None, description=None,
-                            settings_spec=None, config_section=None,
-                            **defaults):
+    def get_components(self, settings_spec=None, config_section=None):
+        """
+        Return the settings components: parser, reader, writer, and
+        `settings_spec` (set up for `config_section`, if given).
+        """
         if config_section:
             if not settings_spec:
                 settings_spec = SettingsSpec()
@@ -109,8 +122,13 @@ class Publisher:
             if len(parts) > 1 and parts[-1] == 'application':
                 settings_spec.config_section_dependencies = ['applications']
         #@@@ Add self.source & self.destination to components in future?
+        return (self.parser, self.reader, self.writer, settings_spec)
+
+    def setup_option_parser(self, usage=None, description=None,
+                            settings_spec=None, config_section=None,
+                            **defaults):
         option_parser = OptionParser(
-            components=(self.parser, self.reader, self.writer, settings_spec),
+            components=self.get_components(settings_spec, config_section),
             defaults=defaults, read_config_files=True,
             usage=usage, description=description)
         return option_parser
@@ -123,10 +141,14 @@ class Publisher:
         Set components first (`self.set_reader` & `self.set_writer`).
         Explicitly setting `self.settings` disables command line option
         processing from `self.publish()`.
+
+        Component defaults are cached, see
+        `OptionParser.get_default_settings()`.  (`usage` and `description`
+        are not used.)
         """
-        option_parser = self.setup_option_parser(
-            usage, description, settings_spec, config_section, **defaults)
-        self.settings = option_parser.get_default_values()
+        self.settings = OptionParser.get_default_settings(
+            components=self.get_components(settings_spec, config_section),
+            defaults=defaults, read_config_files=True)
         return self.settings
 
     def process_programmatic_settings(self, settings_spec,
@@ -213,11 +235,14 @@ class Publisher:
                     argv, usage, description, settings_spec, config_section,
                     **(settings_overrides or {}))
             self.set_io()
-            self.document = self.reader.read(self.source, self.parser,
-                                             self.settings)
-            self.apply_transforms()
-            output = self.writer.write(self.document, self.destination)
-            self.writer.assemble_parts()
+            if getattr(self.settings, 'timings', None):
+                output = self.publish_timed()
+            else:
+                self.document = self.reader.read(self.source, self.parser,
+                                                 self.settings)
+                self.apply_transforms()
+                output = self.writer.write(self.document, self.destination)
+                self.writer.assemble_parts()
         except SystemExit, error:
             exit = 1
             exit_status = error.code
@@ -239,9 +264,108 @@ class Publisher:
             sys.exit(exit_status)
         return output
 
+    def publish_timed(self):
+        """
+        Run `self.reader`, the transforms and `self.writer` like `publish()`
+        and store instrumentation data in `self.timings`, a dictionary with
+        the keys
+
+        * "read", "parse", "transforms", "translate", "write", "total":
+          the time spent in each phase, in seconds.  "read" and "write"
+          are the input and output calls of `self.source` and
+          `self.destination` (including decoding and encoding),
+          "translate" includes ``Writer.assemble_parts()``;
+        * "transform_timings": a list of ``(transform class name, priority,
+          seconds)`` tuples, one for each transform applied;
+        * "nodes_parsed", "nodes": the number of nodes in the document tree
+          after parsing and after the transforms;
+        * "node_classes": a dictionary mapping node class names to the
+          number of nodes of that class after the transforms;
+        * "peak_memory": the peak resident memory of the process in
+          kilobytes, or None if the platform does not report it.
+
+        Return the writer's output.
+        """
+        timings = self.timings = {'transform_timings': []}
+        io_times = {'read': 0, 'write': 0}
+        self.source.read = _timed(self.source.read, io_times, 'read')
+        self.destination.write = _timed(self.destination.write, io_times,
+                                        'write')
+        try:
+            start = time.time()
+            self.document = self.reader.read(self.source, self.parser,
+                                             self.settings)
+            timings['read'] = io_times['read']
+            timings['parse'] = time.time() - start - io_times['read']
+            timings['nodes_parsed'] = _count_nodes(self.document)
+            transformer = self.document.transformer
+            transformer.timings = timings['transform_timings']
+            start = time.time()
+            try:
+                self.apply_transforms()
+            finally:
+                transformer.timings = None
+            timings['transforms'] = time.time() - start
+            node_classes = timings['node_classes'] = {}
+            timings['nodes'] = _count_nodes(self.document, node_classes)
+            start = time.time()
+            output = self.writer.write(self.document, self.destination)
+            self.writer.assemble_parts()
+            timings['write'] = io_times['write']
+            timings['translate'] = time.time() - start - io_times['write']
+        finally:
+            del self.source.read, self.destination.write
+        timings['total'] = 0
+        for phase in self.timing_phases:
+            timings['total'] += timings[phase]
+        timings['peak_memory'] = None
+        if resource is not None:
+            timings['peak_memory'] = resource.getrusage(
+                resource.RUSAGE_SELF).ru_maxrss
+            if sys.platform == 'darwin':  # reported in bytes
+                timings['peak_memory'] //= 1024
+        return output
+
+    timing_phases = ('read', 'parse', 'transforms', 'translate', 'write')
+    """The phases of `publish()` timed by `publish_timed()`, in order."""
+
+    def report_timings(self, transforms=10):
+        """
+        Write `self.timings` to stderr, with the `transforms` slowest
+        transform classes.
+        """
+        timings = self.timings
+        print >>self._stderr, '\n::: Timings:'
+        for phase in self.timing_phases + ('total',):
+            if phase in timings:
+                print >>self._stderr, '  %-12s %9.3f s' % (phase,
+                                                           timings[phase])
+        totals = {}
+        for name, priority, seconds in timings['transform_timings']:
+            count, total = totals.get(name, (0, 0))
+            totals[name] = (count + 1, total + seconds)
+        slowest = [(total, count, name)
+                   for name, (count, total) in totals.items()]
+        slowest.sort()
+        slowest.reverse()
+        if slowest:
+            print >>self._stderr, ('\n::: Slowest transforms '
+                                   '(seconds, applications, class):')
+        for total, count, name in slowest[:transforms]:
+            print >>self._stderr, '  %9.3f %5d  %s' % (total, count, name)
+        if 'nodes' in timings:
+            print >>self._stderr, (
+                '\n::: Nodes: %d after parsing, %d after transforms'
+                % (timings['nodes_parsed'], timings['nodes']))
+        if timings.get('peak_memory') is not None:
+            print >>self._stderr, ('::: Peak memory: %.1f MB'
+                                   % (timings['peak_memory'] / 1024.0))
+
     def debugging_dumps(self):
         if not self.document:
             return
+        if getattr(self.settings, 'timings', None) and self.timings:
+            self.report_timings()
         if self.settings.dump_settings:
             print >>self._stderr, '\n::: Runtime settings:'
             print >>self._stderr, pprint.pformat(self.settings.__dict__)
@@ -321,6 +445,34 @@ command line used.""" % (__version__,
                self.settings.output_encoding_error_handler,
                __version__, sys.version.split()[0]))
 
+
+def _timed(function, times, key):
+    """
+    Return a wrapper of `function` adding the time spent in each call
+    to ``times[key]``.
+    """
+    def timed(*args, **kwargs):
+        start = time.time()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            times[key] += time.time() - start
+    return timed
+
+def _count_nodes(document, node_classes=None):
+    """
+    Return the number of nodes in `document`.  If given, count the nodes
+    by class name in the `node_classes` dictionary.
+    """
+    count = 0
+    for node in document.findall():
+        count += 1
+        if node_classes is not None:
+            name = node.__class__.__name__
+            node_classes[name] = node_classes.get(name, 0) + 1
+    return count
+
+
 default_usage = '%prog [options] [<source> [<destination>]]'
 default_description = ('Reads from <source> (default is stdin) and writes to '
                        '<destination> (default is stdout).  See '
@@ -520,6 +672,130 @@ def publish_from_doctree(document, destination_path=None,
     pub.set_destination(None, destination_path)
     return pub.publish(enable_exit_status=enable_exit_status)
 
+class Renderer:
+
+    """
+    Render many sources with the same components and runtime settings.
+
+    Instantiating a `Publisher` for every call of a ``publish_*`` convenience
+    function sets up the components and an `OptionParser` (reading config
+    files) every time.  A Renderer does this once, on instantiation, and
+    then renders any number of sources to document parts (like
+    `publish_parts`), with optional per-call settings overrides.
+
+    A Renderer must not be used by several threads at once; use a
+    `RendererPool` instead.
+
+    Parameters: see `publish_programmatically`.
+    """
+
+    def __init__(self, reader=None, reader_name='standalone',
+                 parser=None, parser_name='restructuredtext',
+                 writer=None, writer_name='pseudoxml',
+                 settings=None, settings_spec=None,
+                 settings_overrides=None, config_section=None):
+        pub = Publisher(reader, parser, writer, settings=settings)
+        pub.set_components(reader_name, parser_name, writer_name)
+        pub.process_programmatic_settings(
+            settings_spec, settings_overrides, config_section)
+        self.reader = pub.reader
+        self.parser = pub.parser
+        self.writer = pub.writer
+
+        self.settings = pub.settings
+        """Runtime settings used as a template for every call of
+        `self.render()`."""
+
+    def get_settings(self, settings_overrides=None):
+        """
+        Return a copy of `self.settings`, updated with `settings_overrides`
+        (a dictionary, used like the `settings_overrides` argument of the
+        ``publish_*`` functions).
+        """
+        settings = self.settings.copy()
+        if settings.record_dependencies.file is None:
+            # Don't accumulate the dependencies of all rendered sources.
+            settings.record_dependencies = utils.DependencyList()
+        if settings_overrides:
+            settings.__dict__.update(settings_overrides)
+        return settings
+
+    def render(self, source, source_path=None, destination_path=None,
+               settings_overrides=None):
+        """
+        Render `source` (a string) and return a dictionary of document parts
+        (see `publish_parts`).
+        """
+        pub = Publisher(self.reader, self.parser, self.writer,
+                        source_class=io.StringInput,
+                        destination_class=io.StringOutput,
+                        settings=self.get_settings(settings_overrides))
+        pub.set_source(source, source_path)
+        pub.set_destination(None, destination_path)
+        pub.publish()
+        # The writer (and its `parts` dictionary) is reused:
+        return self.writer.parts.copy()
+
+
+class RendererPool:
+
+    """
+    A thread-safe pool of `Renderer` instances with the same configuration.
+
+    Renderers are created on demand, up to `size` instances.  A call of
+    `self.render()` uses an idle Renderer or waits until one is available.
+
+    Parameters: `size`, the maximal number of Renderers; the keyword
+    arguments are passed to `Renderer`.
+    """
+
+    def __init__(self, size=4, **kwargs):
+        self.size = size
+        self.kwargs = kwargs
+        self.idle = Queue.Queue()
+        """Renderers available for use."""
+        self.count = 0
+        """Number of Renderers created."""
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Return an idle Renderer, create a new one, or wait for one."""
+        try:
+            return self.idle.get_nowait()
+        except Queue.Empty:
+            pass
+        self.lock.acquire()
+        try:
+            create = self.count < self.size
+            if create:
+                self.count += 1
+        finally:
+            self.lock.release()
+        if create:
+            try:
+                return Renderer(**self.kwargs)
+            except:
+                self.lock.acquire()
+                self.count -= 1
+                self.lock.release()
+                raise
+        return self.idle.get()
+
+    def release(self, renderer):
+        """Return `renderer` (from `self.acquire()`) to the pool."""
+        self.idle.put(renderer)
+
+    def render(self, source, source_path=None, destination_path=None,
+               settings_overrides=None):
+        """See `Renderer.render()`."""
+        renderer = self.acquire()
+        try:
+            return renderer.render(source, source_path, destination_path,
+                                   settings_overrides)
+        finally:
+            self.release(renderer)
+
+
 def publish_cmdline_to_binary(reader=None, reader_name='standalone',
                     parser=None, parser_name='restructuredtext',
                     writer=None, writer_name='pseudoxml',
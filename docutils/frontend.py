@@ -11,6 +11,7 @@ Exports the following classes:
 * `Option`: Customized version of `optparse.Option`; validation support.
 * `Values`: Runtime settings; objects are simple structs
   (``object.attribute``).  Supports cumulative list settings (attributes).
+* `FrozenDefaults`: Cached default settings for a set of components.
 * `ConfigParser`: Standard Docutils config file processing.
 
 Also exports the following functions:
@@ -23,7 +24,7 @@ Also exports the following functions:
   `validate_colon_separated_string_list`,
   `validate_comma_separated_string_list`,
   `validate_dependency_file`.
-* `make_paths_absolute`.
+* `make_paths_absolute`, `copy_lists`.
 * SettingSpec manipulation: `filter_settings_spec`.
 """
 
@@ -32,6 +33,7 @@ __docformat__ = 'reStructuredText'
 import os
 import os.path
 import sys
+import threading
 import warnings
 import ConfigParser as CP
 import codecs
@@ -491,6 +493,20 @@ class OptionParser(optparse.OptionParser, docutils.SettingsSpec):
           ['--debug'], {'action': 'store_true', 'validator': validate_boolean}),
          ('Disable debug output.  (default)',
           ['--no-debug'], {'action': 'store_false', 'dest': 'debug'}),
+         ('Report the time spent in each processing phase and in the '
+          'slowest transforms, node counts and peak memory use.',
+          ['--timings'], {'action': 'store_true',
+                          'validator': validate_boolean}),
+         ('Do not report timings.  (default)',
+          ['--no-timings'], {'action': 'store_false', 'dest': 'timings'}),
+         ('Index the document elements by node class while applying the '
+          'transforms.  Faster, but transforms must not modify the '
+          '"children" lists of elements directly.',
+          ['--class-index'], {'action': 'store_true',
+                              'validator': validate_boolean}),
+         ('Do not index the document elements.  (default)',
+          ['--no-class-index'], {'action': 'store_false',
+                                 'dest': 'class_index'}),
          ('Send the output of system messages to <file>.',
           ['--warnings'], {'dest': 'warning_stream', 'metavar': '<file>'}),
          ('Enable Python tracebacks when Docutils is halted.',
@@ -720,6 +736,21 @@ class OptionParser(optparse.OptionParser, docutils.SettingsSpec):
         defaults._config_files = self.config_files
         return defaults
 
+    def get_default_settings(cls, components=(), defaults=None,
+                             read_config_files=None):
+        """
+        Return default settings like ``cls(components, defaults,
+        read_config_files).get_default_values()``, without the cost of
+        constructing an option parser on every call (see `FrozenDefaults`).
+        """
+        frozen = FrozenDefaults.get(cls, components)
+        try:
+            return frozen.get_default_values(defaults, read_config_files)
+        except ValueError, error:
+            frozen.option_parser.error(SafeString(error))
+
+    get_default_settings = classmethod(get_default_settings)
+
     def get_option_by_dest(self, dest):
         """
         Get an option by its dest.
@@ -737,6 +768,175 @@ class OptionParser(optparse.OptionParser, docutils.SettingsSpec):
         raise KeyError('No option with dest == %r.' % dest)
 
 
+class FrozenDefaults:
+
+    """
+    Default settings of an `OptionParser` for one set of components,
+    computed once and shared by all callers.
+
+    Constructing an `OptionParser` (populating it from all component
+    setting specs) is by far the most expensive part of a programmatic
+    ``publish_*`` call.  A FrozenDefaults object instantiates the option
+    parser once and keeps the resulting defaults; configuration file
+    settings are memoized by path and modification time.  The frozen
+    data is never modified: `get_default_values()` returns fresh
+    `Values` objects.
+
+    Use `get()` to look up (or create) the instance for a component set.
+    The cache holds at most `cache_size` instances; the least recently
+    used one is dropped when a new one is created.
+    """
+
+    cache = {}
+    """FrozenDefaults instances by option parser class and component set."""
+
+    cache_size = 32
+    """Maximum number of cached instances.  Every instance keeps the
+    setting specs of its components alive (they are identified by `id()`)."""
+
+    clock = 0
+    """Counter of `get()` calls, for the `last_used` attribute."""
+
+    lock = threading.Lock()
+    """Serializes creation of instances and reading of config files."""
+
+    component_attributes = ('settings_spec', 'settings_defaults',
+                            'settings_default_overrides',
+                            'relative_path_settings', 'config_section',
+                            'config_section_dependencies')
+    """`docutils.SettingsSpec` attributes used by the option parser."""
+
+    def get(cls, option_parser_class, components):
+        """
+        Return the FrozenDefaults instance for `option_parser_class` and
+        `components` (see `OptionParser.__init__`).
+        """
+        key = [option_parser_class]
+        for component in components:
+            if component is None:
+                continue
+            # Setting specs and defaults are identified by object identity;
+            # the instance keeps references, so that ids are not reused.
+            key.append(tuple([id(getattr(component, name))
+                              for name in cls.component_attributes[:3]])
+                       + (tuple(component.relative_path_settings),
+                          component.config_section,
+                          tuple(component.config_section_dependencies
+                                or ())))
+        key = tuple(key)
+        cls.clock += 1
+        try:
+            instance = cls.cache[key]
+        except KeyError:
+            cls.lock.acquire()
+            try:
+                instance = cls.cache.get(key)
+                if instance is None:
+                    if len(cls.cache) >= cls.cache_size:
+                        cls.evict()
+                    instance = cls(option_parser_class, components)
+                    cls.cache[key] = instance
+            finally:
+                cls.lock.release()
+        instance.last_used = cls.clock
+        return instance
+
+    get = classmethod(get)
+
+    def evict(cls):
+        """Drop the least recently used instances from the cache."""
+        keys = cls.cache.keys()
+        keys.sort(key=lambda key: cls.cache[key].last_used)
+        for key in keys[:len(keys) - cls.cache_size + 1]:
+            del cls.cache[key]
+
+    evict = classmethod(evict)
+
+    def __init__(self, option_parser_class, components):
+        # Copy the setting spec attributes to stand-in objects: the
+        # components themselves may hold on to large data (documents).
+        stand_ins = []
+        for component in components:
+            if component is None:
+                continue
+            stand_in = docutils.SettingsSpec()
+            for name in self.component_attributes:
+                setattr(stand_in, name, getattr(component, name))
+            stand_ins.append(stand_in)
+
+        self.option_parser = option_parser_class(components=stand_ins)
+        """Option parser used to compute the defaults and to read and
+        validate configuration files."""
+
+        self.defaults = self.option_parser.defaults.copy()
+        """Component defaults (without defaults overrides and config file
+        settings).  Must not be modified."""
+
+        self.config_file_settings = {}
+        """Memoized config file settings: {path: (mtime, settings, files)}."""
+
+        self.last_used = 0
+        """Value of `FrozenDefaults.clock` at the last `get()` call."""
+
+    def get_config_file_settings(self, config_file):
+        """
+        Return the settings of `config_file` (see
+        `OptionParser.get_config_file_settings()`) and a list of the
+        files read.  The result is memoized until the file changes.
+        """
+        try:
+            mtime = os.stat(config_file).st_mtime
+        except OSError:
+            mtime = None
+        cached = self.config_file_settings.get(config_file)
+        if cached is None or cached[0] != mtime:
+            self.lock.acquire()
+            try:
+                option_parser = self.option_parser
+                option_parser.config_files = []
+                settings = option_parser.get_config_file_settings(config_file)
+                cached = (mtime, settings, option_parser.config_files)
+                self.config_file_settings[config_file] = cached
+            finally:
+                self.lock.release()
+        return copy_lists(cached[1]), list(cached[2])
+
+    def get_default_values(self, defaults=None, read_config_files=None):
+        """
+        Return a `Values` object, equivalent to ::
+
+            OptionParser(components, defaults,
+                         read_config_files).get_default_values()
+
+        Raise `ValueError` for invalid config file settings.
+        """
+        settings = copy_lists(self.defaults)
+        settings.update(defaults or {})
+        config_files = []
+        if read_config_files and not settings['_disable_config']:
+            config_settings = Values()
+            for filename in self.option_parser.get_standard_config_files():
+                file_settings, files = self.get_config_file_settings(filename)
+                config_settings.update(file_settings, self.option_parser)
+                config_files.extend(files)
+            settings.update(config_settings.__dict__)
+        values = Values(settings)
+        values._config_files = config_files
+        return values
+
+
+def copy_lists(settings):
+    """
+    Return a copy of the `settings` dictionary with copies of all list
+    values (`Values.update` extends list settings in place).
+    """
+    settings = settings.copy()
+    for name, value in settings.items():
+        if isinstance(value, list):
+            settings[name] = value[:]
+    return settings
+
+
 class ConfigParser(CP.RawConfigParser):
 
     old_settings = {
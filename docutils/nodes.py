@@ -37,6 +37,10 @@ class Node(object):
 
     """Abstract base class of nodes in a document tree."""
 
+    # The attributes are slots of the concrete node classes (if possible),
+    # the class attributes are defaults for other subclasses:
+    __slots__ = ()
+
     parent = None
     """Back-reference to the Node immediately containing this Node."""
 
@@ -49,6 +53,10 @@ class Node(object):
     line = None
     """The line number (1-based) of the beginning of this Node in `source`."""
 
+    _position = 0
+    """Cached index of this Node in the children of its parent (see
+    `Element.index()`)."""
+
     def __nonzero__(self):
         """
         Node instances are always true, even if they're empty.  A node is more
@@ -81,6 +89,20 @@ class Node(object):
         """
         raise NotImplementedError
 
+    def __getstate__(self):
+        """Return the instance state (slot values and `__dict__` items)."""
+        state = {}
+        for cls in self.__class__.__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                if hasattr(self, name):
+                    state[name] = getattr(self, name)
+        state.update(getattr(self, '__dict__', {}))
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def copy(self):
         """Return a copy of self."""
         raise NotImplementedError
@@ -90,6 +112,7 @@ class Node(object):
         raise NotImplementedError
 
     def setup_child(self, child):
+        document = self.document or child.document
         child.parent = self
         if self.document:
             child.document = self.document
@@ -97,6 +120,14 @@ class Node(object):
                 child.source = self.document.current_source
             if child.line is None:
                 child.line = self.document.current_line
+        if document is not None and document.class_index is not None:
+            document.class_index.child_added(self, child)
+
+    def _child_removed(self, child):
+        """Update the document's class index, if any (see `ClassIndex`)."""
+        document = self.document or child.document
+        if document is not None and document.class_index is not None:
+            document.class_index.child_removed(self, child)
 
     def walk(self, visitor):
         """
@@ -122,9 +153,10 @@ class Node(object):
         Return true if we should stop the traversal.
         """
         stop = False
-        visitor.document.reporter.debug(
-            'docutils.nodes.Node.walk calling dispatch_visit for %s'
-            % self.__class__.__name__)
+        if visitor.document.reporter.debug_flag:
+            visitor.document.reporter.trace(
+                'docutils.nodes.Node.walk calling dispatch_visit for %s',
+                self.__class__.__name__)
         try:
             try:
                 visitor.dispatch_visit(self)
@@ -158,9 +190,10 @@ class Node(object):
         """
         call_depart = True
         stop = False
-        visitor.document.reporter.debug(
-            'docutils.nodes.Node.walkabout calling dispatch_visit for %s'
-            % self.__class__.__name__)
+        if visitor.document.reporter.debug_flag:
+            visitor.document.reporter.trace(
+                'docutils.nodes.Node.walkabout calling dispatch_visit for %s',
+                self.__class__.__name__)
         try:
             try:
                 visitor.dispatch_visit(self)
@@ -181,33 +214,25 @@ class Node(object):
         except StopTraversal:
             stop = True
         if call_depart:
-            visitor.document.reporter.debug(
-                'docutils.nodes.Node.walkabout calling dispatch_departure '
-                'for %s' % self.__class__.__name__)
+            if visitor.document.reporter.debug_flag:
+                visitor.document.reporter.trace(
+                    'docutils.nodes.Node.walkabout calling dispatch_departure '
+                    'for %s', self.__class__.__name__)
             visitor.dispatch_departure(self)
         return stop
 
     def _fast_traverse(self, cls):
         """Specialized traverse() that only supports instance checks."""
-        result = []
-        if isinstance(self, cls):
-            result.append(self)
-        for child in self.children:
-            result.extend(child._fast_traverse(cls))
-        return result
+        return list(self.findall(cls))
 
     def _all_traverse(self):
         """Specialized traverse() that doesn't check for a condition."""
-        result = []
-        result.append(self)
-        for child in self.children:
-            result.extend(child._all_traverse())
-        return result
+        return list(self.findall())
 
     def traverse(self, condition=None, include_self=True, descend=True,
                  siblings=False, ascend=False):
         """
-        Return an iterable containing
+        Return a list containing
 
         * self (if include_self is true)
         * all descendants in tree traversal order (if descend is true)
@@ -216,7 +241,7 @@ class Node(object):
         * the siblings of the parent (if ascend is true) and their
           descendants (if also descend is true), and so on
 
-        If `condition` is not None, the iterable contains only nodes
+        If `condition` is not None, the list contains only nodes
         for which ``condition(node)`` is true.  If `condition` is a
         node class ``cls``, it is equivalent to a function consisting
         of ``return isinstance(node, cls)``.
@@ -233,51 +258,72 @@ class Node(object):
                 <reference name="Baz" refid="baz">
                     Baz
 
-        Then list(emphasis.traverse()) equals ::
+        Then emphasis.traverse() equals ::
 
             [<emphasis>, <strong>, <#text: Foo>, <#text: Bar>]
 
-        and list(strong.traverse(ascend=True)) equals ::
+        and strong.traverse(ascend=True) equals ::
 
             [<strong>, <#text: Foo>, <#text: Bar>, <reference>, <#text: Baz>]
+
+        The list is a snapshot of the tree: use it (rather than `findall()`)
+        if the tree is modified while iterating over the result.
+        """
+        return list(self.findall(condition, include_self, descend,
+                                 siblings, ascend))
+
+    def findall(self, condition=None, include_self=True, descend=True,
+                siblings=False, ascend=False):
+        """
+        Return an iterator yielding the nodes `traverse()` would return.
+
+        The nodes are found lazily, one at a time, using an explicit stack
+        instead of recursion (no intermediate lists, no recursion limit
+        for deeply nested trees).
+
+        The tree must not be modified while iterating, except for changes
+        of node attributes or of nodes that were already yielded and are
+        not ancestors of the nodes yet to come.  Use `traverse()` to get a
+        snapshot list otherwise.
         """
         if ascend:
-            siblings=True
-        # Check for special argument combinations that allow using an
-        # optimized version of traverse()
-        if include_self and descend and not siblings:
-            if condition is None:
-                return self._all_traverse()
-            elif isinstance(condition, (types.ClassType, type)):
-                return self._fast_traverse(condition)
+            siblings = True
         # Check if `condition` is a class (check for TypeType for Python
         # implementations that use only new-style classes, like PyPy).
         if isinstance(condition, (types.ClassType, type)):
             node_class = condition
-            def condition(node, node_class=node_class):
-                return isinstance(node, node_class)
-        r = []
-        if include_self and (condition is None or condition(self)):
-            r.append(self)
-        if descend and len(self.children):
-            for child in self:
-                r.extend(child.traverse(include_self=True, descend=True,
-                                        siblings=False, ascend=False,
-                                        condition=condition))
-        if siblings or ascend:
+            condition = None
+        else:
+            node_class = Node
+        if include_self and isinstance(self, node_class) and (
+            condition is None or condition(self)):
+            yield self
+        if descend and self.children:
+            stack = [iter(self.children)]
+            while stack:
+                for child in stack[-1]:
+                    if isinstance(child, node_class) and (
+                        condition is None or condition(child)):
+                        yield child
+                    if child.children:
+                        # descend first, continue with siblings later
+                        stack.append(iter(child.children))
+                        break
+                else:
+                    stack.pop()
+        if siblings:
+            if condition is None:
+                condition = node_class
             node = self
             while node.parent:
                 index = node.parent.index(node)
                 for sibling in node.parent[index+1:]:
-                    r.extend(sibling.traverse(include_self=True,
-                                              descend=descend,
-                                              siblings=False, ascend=False,
-                                              condition=condition))
+                    for found in sibling.findall(condition, descend=descend):
+                        yield found
                 if not ascend:
                     break
                 else:
                     node = node.parent
-        return r
 
     def next_node(self, condition=None, include_self=False, descend=True,
                   siblings=False, ascend=False):
@@ -288,13 +334,11 @@ class Node(object):
         Parameter list is the same as of traverse.  Note that
         include_self defaults to 0, though.
         """
-        iterable = self.traverse(condition=condition,
+        for node in self.findall(condition=condition,
                                  include_self=include_self, descend=descend,
-                                 siblings=siblings, ascend=ascend)
-        try:
-            return iterable[0]
-        except IndexError:
-            return None
+                                 siblings=siblings, ascend=ascend):
+            return node
+        return None
 
 if sys.version_info < (3,):
     class reprunicode(unicode):
@@ -332,6 +376,11 @@ class Text(Node, reprunicode):
     children = ()
     """Text nodes have no children, and cannot have children."""
 
+    if sys.version_info < (3,):
+        # Subclasses of `str` cannot have non-empty slots under Python 3.
+        __slots__ = ('rawsource', 'parent', 'document', 'source', 'line',
+                     '_position')
+
     if sys.version_info > (3,):
         def __new__(cls, data, rawsource=None):
             """Prevent the rawsource argument from propagating to str."""
@@ -348,6 +397,9 @@ class Text(Node, reprunicode):
         self.rawsource = rawsource
         """The raw text from which this element was constructed."""
 
+        self.parent = self.document = self.source = self.line = None
+        self._position = 0
+
     def shortrepr(self, maxlen=18):
         data = self
         if len(data) > maxlen:
@@ -395,6 +447,78 @@ class Text(Node, reprunicode):
     def lstrip(self, chars=None):
         return self.__class__(reprunicode.lstrip(self, chars))
 
+class ClassName(object):
+
+    """
+    Descriptor returning the name of the class it is looked up from
+    (default `Element.tagname`).
+    """
+
+    def __get__(self, instance, owner):
+        return owner.__name__
+
+
+class Attributes(dict):
+
+    """
+    Attribute dictionary of an `Element`.
+
+    Empty list attributes (`Element.list_attributes`) are not stored but
+    created on demand: ``attributes[key]``, `get()`, and `setdefault()`
+    store a new list, ``in`` reports them as present, and `pop()` returns
+    a new empty list.  `len()`, iteration, `items()` etc., and comparisons
+    only cover the stored attributes.
+    """
+
+    __slots__ = ('list_attributes',)
+
+    def __init__(self, list_attributes=()):
+        dict.__init__(self)
+        self.list_attributes = list_attributes
+
+    def __reduce__(self):
+        return (self.__class__, (self.list_attributes,), None, None,
+                iter(self.items()))
+
+    def __missing__(self, key):
+        if key in self.list_attributes:
+            value = self[key] = []
+            return value
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or key in self.list_attributes
+
+    has_key = __contains__
+
+    def __delitem__(self, key):
+        if dict.__contains__(self, key) or key not in self.list_attributes:
+            dict.__delitem__(self, key)
+
+    def get(self, key, failobj=None):
+        if dict.__contains__(self, key):
+            return dict.__getitem__(self, key)
+        if key in self.list_attributes:
+            value = self[key] = []
+            return value
+        return failobj
+
+    def pop(self, key, *args):
+        if not dict.__contains__(self, key) and key in self.list_attributes:
+            return []
+        return dict.pop(self, key, *args)
+
+    def setdefault(self, key, failobj=None):
+        if key in self.list_attributes:
+            return self[key]
+        return dict.setdefault(self, key, failobj)
+
+    def copy(self):
+        attributes = self.__class__(self.list_attributes)
+        attributes.update(self)
+        return attributes
+
+
 class Element(Node):
 
     """
@@ -450,14 +574,19 @@ class Element(Node):
     known_attributes = list_attributes + ('source',)
     """List attributes that are known to the Element base class."""
 
-    tagname = None
-    """The element generic identifier. If None, it is set as an instance
-    attribute to the name of the class."""
+    tagname = ClassName()
+    """The element generic identifier.  Defaults to the name of the class."""
 
     child_text_separator = '\n\n'
     """Separator for child nodes, used by `astext()` method."""
 
+    __slots__ = ('rawsource', 'children', 'attributes',
+                 'parent', 'document', 'source', 'line', '_position')
+
     def __init__(self, rawsource='', *children, **attributes):
+        self.parent = self.document = self.source = self.line = None
+        self._position = 0
+
         self.rawsource = rawsource
         """The raw text from which this element was constructed."""
 
@@ -466,23 +595,27 @@ class Element(Node):
 
         self.extend(children)           # maintain parent info
 
-        self.attributes = {}
+        self.attributes = Attributes(self.list_attributes)
         """Dictionary of attribute {name: value}."""
 
-        # Initialize list attributes.
-        for att in self.list_attributes:
-            self.attributes[att] = []
-
         for att, value in attributes.items():
             att = att.lower()
             if att in self.list_attributes:
-                # mutable list; make a copy for this node
-                self.attributes[att] = value[:]
+                if value:
+                    # mutable list; make a copy for this node
+                    self.attributes[att] = value[:]
             else:
                 self.attributes[att] = value
 
-        if self.tagname is None:
-            self.tagname = self.__class__.__name__
+    def __setstate__(self, state):
+        attributes = state.get('attributes', {})
+        if not isinstance(attributes, Attributes):
+            # pickled by an older Docutils version
+            state['attributes'] = Attributes(self.list_attributes)
+            state['attributes'].update(attributes)
+        if state.get('tagname') == self.tagname:
+            del state['tagname']
+        Node.__setstate__(self, state)
 
     def _dom_node(self, domroot):
         element = domroot.createElement(self.tagname)
@@ -578,10 +711,13 @@ class Element(Node):
         if isinstance(key, basestring):
             self.attributes[str(key)] = item
         elif isinstance(key, int):
+            self._child_removed(self.children[key])
             self.setup_child(item)
             self.children[key] = item
         elif isinstance(key, types.SliceType):
             assert key.step in (None, 1), 'cannot handle slice with stride'
+            for node in self.children[key.start:key.stop]:
+                self._child_removed(node)
             for node in item:
                 self.setup_child(node)
             self.children[key.start:key.stop] = item
@@ -593,9 +729,12 @@ class Element(Node):
         if isinstance(key, basestring):
             del self.attributes[key]
         elif isinstance(key, int):
+            self._child_removed(self.children[key])
             del self.children[key]
         elif isinstance(key, types.SliceType):
             assert key.step in (None, 1), 'cannot handle slice with stride'
+            for node in self.children[key.start:key.stop]:
+                self._child_removed(node)
             del self.children[key.start:key.stop]
         else:
             raise TypeError, ('element index must be an integer, a simple '
@@ -660,7 +799,7 @@ class Element(Node):
             if cls.startswith('language-'):
                 return cls[9:]
         try:
-            return self.parent.get_language(fallback)
+            return self.parent.get_language_code(fallback)
         except AttributeError:
             return fallback
 
@@ -680,13 +819,33 @@ class Element(Node):
             self[index:index] = item
 
     def pop(self, i=-1):
-        return self.children.pop(i)
+        child = self.children.pop(i)
+        self._child_removed(child)
+        return child
 
     def remove(self, item):
         self.children.remove(item)
+        self._child_removed(item)
 
     def index(self, item):
-        return self.children.index(item)
+        """
+        Return the index of the child `item`.
+
+        The index is cached on the child and checked before use, so
+        changes of `self.children` never give wrong results.  If the
+        cached index is stale, all children are renumbered; lookups are
+        fast again until children are inserted or removed.
+        """
+        children = self.children
+        position = getattr(item, '_position', 0)
+        if position < len(children) and children[position] is item:
+            return position
+        for position, child in enumerate(children):
+            child._position = position
+        position = getattr(item, '_position', 0)
+        if position < len(children) and children[position] is item:
+            return position
+        return children.index(item)
 
     def is_not_default(self, key):
         if self[key] == [] and key in self.list_attributes:
@@ -921,6 +1080,8 @@ class Element(Node):
                              and_source = and_source)
 
     def clear(self):
+        for child in self.children:
+            self._child_removed(child)
         self.children = []
 
     def replace(self, old, new):
@@ -932,6 +1093,52 @@ class Element(Node):
         elif new is not None:
             self[index:index+1] = new
 
+    def replace_children(self, replacements):
+        """
+        Replace several children in a single pass over `self.children`.
+
+        `replacements` is a sequence of ``(old, new)`` pairs: `old` is a
+        child node, `new` a node or a list of nodes (which may contain
+        `old`).  The result is the same as calling `replace()` for each
+        pair, but the time is linear in the number of children.  Each
+        child may be replaced only once.
+        """
+        new_nodes = {}
+        for old, new in replacements:
+            if isinstance(new, Node):
+                new = [new]
+            elif new is None:
+                continue
+            if id(old) in new_nodes:
+                raise ValueError('Element.replace_children(): '
+                                 'node replaced twice')
+            new_nodes[id(old)] = new
+        children = []
+        removed = []
+        added = []
+        for child in self.children:
+            new = new_nodes.pop(id(child), None)
+            if new is None:
+                children.append(child)
+                continue
+            kept = False
+            for node in new:
+                if node is child:
+                    kept = True
+                else:
+                    added.append(node)
+                children.append(node)
+            if not kept:
+                removed.append(child)
+        if new_nodes:
+            raise ValueError('Element.replace_children(): '
+                             'node is not a child')
+        for child in removed:
+            self._child_removed(child)
+        for node in added:
+            self.setup_child(node)
+        self.children[:] = children
+
     def replace_self(self, new):
         """
         Replace `self` node with `new`, where `new` is a node or a
@@ -1255,13 +1462,88 @@ class document(Root, Structural, Element):
 
         self.document = self
 
+    class_index = None
+    """`ClassIndex` of the elements in the document or None.
+    See `enable_class_index()`."""
+
+    def enable_class_index(self):
+        """
+        Set up an index of the elements in the document by node class.
+
+        The index is kept current by the `Element` methods that add or remove
+        children and speeds up class-filtered traversal of the whole document
+        (``document.findall(cls)`` and ``document.traverse(cls)``).
+        It is not kept current by direct manipulation of `Element.children`.
+        """
+        if self.class_index is None:
+            self.class_index = ClassIndex(self)
+
+    def disable_class_index(self):
+        """Drop the class index (see `enable_class_index()`)."""
+        self.class_index = None
+
+    def forget(self, node):
+        """
+        Remove references to `node` and its descendants from the document's
+        indices, e.g. after handing a completed part of the document tree to
+        another consumer.
+
+        Entries of `self.ids` (and `self.substitution_defs`) are replaced by
+        detached copies without children (with children), so that names,
+        ids, and substitutions remain known.  The nodes are removed from the
+        lists of references, footnotes, citations, indirect targets, and
+        system messages.
+        """
+        removed = set()
+        for descendant in node.findall():
+            removed.add(id(descendant))
+            if isinstance(descendant, Element):
+                for node_id in descendant['ids']:
+                    if self.ids.get(node_id) is descendant:
+                        self.ids[node_id] = descendant.copy()
+        for name, subdef in self.substitution_defs.items():
+            if id(subdef) in removed:
+                self.substitution_defs[name] = subdef.deepcopy()
+        for mapping in (self.refnames, self.refids, self.footnote_refs,
+                        self.citation_refs):
+            for key, referencing in mapping.items():
+                kept = [ref for ref in referencing if id(ref) not in removed]
+                if kept:
+                    mapping[key] = kept
+                else:
+                    del mapping[key]
+        for name in ('indirect_targets', 'autofootnotes', 'autofootnote_refs',
+                     'symbol_footnotes', 'symbol_footnote_refs', 'footnotes',
+                     'citations', 'parse_messages', 'transform_messages'):
+            setattr(self, name, [item for item in getattr(self, name)
+                                 if id(item) not in removed])
+
+    def findall(self, condition=None, include_self=True, descend=True,
+                siblings=False, ascend=False):
+        """
+        Return an iterator, see `Node.findall()`.
+
+        Use the class index (if enabled) to find instances of a node class.
+        """
+        if (self.class_index is not None and descend
+            and not (siblings or ascend)
+            and isinstance(condition, (types.ClassType, type))):
+            found = self.class_index.find(condition)
+            if found is not None:
+                if include_self and isinstance(self, condition):
+                    found.insert(0, self)
+                return iter(found)
+        return Element.findall(self, condition, include_self, descend,
+                               siblings, ascend)
+
     def __getstate__(self):
         """
         Return dict with unpicklable references removed.
         """
-        state = self.__dict__.copy()
+        state = Element.__getstate__(self)
         state['reporter'] = None
         state['transformer'] = None
+        state.pop('class_index', None)
         return state
 
     def asdom(self, dom=None):
@@ -1677,6 +1959,12 @@ class system_message(Special, BackLinkable, PreBibliographic, Element):
             print 'system_message: children=%r' % (children,)
             raise
 
+    def copy(self):
+        # the message text is in the children (not copied)
+        copy = self.__class__(**self.attributes)
+        copy.source, copy.line = self.source, self.line
+        return copy
+
     def astext(self):
         line = self.get('line', '')
         return u'%s:%s: (%s/%s) %s' % (self['source'], line, self['type'],
@@ -1826,6 +2114,110 @@ node_class_names = """
 """A list of names of all concrete Node subclasses."""
 
 
+class ClassIndex(object):
+
+    """
+    Index of the elements in a document by node class.
+
+    Maintained by the `Element` methods adding or removing children (via
+    `Node.setup_child()` and `Element._child_removed()`).  An element is
+    indexed while it is connected to the document through its `parent`
+    attributes.  `Text` nodes are not indexed.
+    """
+
+    sort_threshold = 8
+    """Use the index only if at most 1/`sort_threshold` of all indexed
+    elements match.  Otherwise, traversing the tree is faster than sorting
+    the matching elements into document order."""
+
+    def __init__(self, document):
+        self.document = document
+
+        self.elements = {}
+        """Mapping of ``id(element)`` to element."""
+
+        self.by_class = {}
+        """Mapping of node class to mappings of ``id(element)`` to element
+        instances of exactly this class."""
+
+        self._subclasses = {}
+        """Cache: mapping of node class to indexed subclasses."""
+
+        for child in document.children:
+            self.add(child)
+
+    def child_added(self, parent, child):
+        if not isinstance(child, Element):
+            return
+        if parent is self.document or id(parent) in self.elements:
+            self.add(child)
+        elif id(child) in self.elements:
+            # moved to a parent outside of the document
+            self.remove(child)
+
+    def child_removed(self, parent, child):
+        # Ignore `child` if it was moved to a different parent already.
+        if child.parent is parent and id(child) in self.elements:
+            self.remove(child)
+
+    def add(self, node):
+        """Add the element `node` and its descendants."""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if not isinstance(node, Element) or id(node) in self.elements:
+                continue
+            self.elements[id(node)] = node
+            node_class = node.__class__
+            if node_class not in self.by_class:
+                self.by_class[node_class] = {}
+                self._subclasses.clear()
+            self.by_class[node_class][id(node)] = node
+            node.document = self.document
+            stack.extend(node.children)
+
+    def remove(self, node):
+        """Remove the element `node` and its descendants."""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if self.elements.pop(id(node), None) is None:
+                continue
+            del self.by_class[node.__class__][id(node)]
+            stack.extend([child for child in node.children
+                          if child.parent is node])
+
+    def find(self, node_class):
+        """
+        Return a list of the indexed instances of `node_class` in document
+        order, or None if traversing the document is the better option.
+        """
+        if issubclass(Text, node_class):
+            return None
+        try:
+            classes = self._subclasses[node_class]
+        except KeyError:
+            classes = self._subclasses[node_class] = [
+                cls for cls in self.by_class if issubclass(cls, node_class)]
+        found = []
+        for cls in classes:
+            found.extend(self.by_class[cls].values())
+        if len(found) * self.sort_threshold > len(self.elements):
+            return None
+        found.sort(key=self.position)
+        return found
+
+    def position(self, node):
+        """Return the list of child indices from the document to `node`."""
+        position = []
+        while node is not self.document:
+            parent = node.parent
+            position.append(parent.index(node))
+            node = parent
+        position.reverse()
+        return position
+
+
 class NodeVisitor:
 
     """
@@ -1874,11 +2266,14 @@ class NodeVisitor:
         parameter.  If the ``visit_...`` method does not exist, call
         self.unknown_visit.
         """
-        node_name = node.__class__.__name__
-        method = getattr(self, 'visit_' + node_name, self.unknown_visit)
-        self.document.reporter.debug(
-            'docutils.nodes.NodeVisitor.dispatch_visit calling %s for %s'
-            % (method.__name__, node_name))
+        try:
+            method = self._dispatch_table[node.__class__][0]
+        except (AttributeError, KeyError):
+            method = self._dispatch_methods(node.__class__)[0]
+        if self.document.reporter.debug_flag:
+            self.document.reporter.trace(
+                'docutils.nodes.NodeVisitor.dispatch_visit calling %s for %s',
+                method.__name__, node.__class__.__name__)
         return method(node)
 
     def dispatch_departure(self, node):
@@ -1887,13 +2282,35 @@ class NodeVisitor:
         parameter.  If the ``depart_...`` method does not exist, call
         self.unknown_departure.
         """
-        node_name = node.__class__.__name__
-        method = getattr(self, 'depart_' + node_name, self.unknown_departure)
-        self.document.reporter.debug(
-            'docutils.nodes.NodeVisitor.dispatch_departure calling %s for %s'
-            % (method.__name__, node_name))
+        try:
+            method = self._dispatch_table[node.__class__][1]
+        except (AttributeError, KeyError):
+            method = self._dispatch_methods(node.__class__)[1]
+        if self.document.reporter.debug_flag:
+            self.document.reporter.trace(
+                'docutils.nodes.NodeVisitor.dispatch_departure calling %s '
+                'for %s', method.__name__, node.__class__.__name__)
         return method(node)
 
+    def _dispatch_methods(self, node_class):
+        """
+        Look up the (visit, depart) bound methods for `node_class` and
+        store them in the visitor's dispatch table.
+
+        The table is kept per visitor instance: methods may be attached
+        to visitor classes at run time (see `_add_node_class_names()`)
+        or set on the instance itself.
+        """
+        node_name = node_class.__name__
+        methods = (getattr(self, 'visit_' + node_name, self.unknown_visit),
+                   getattr(self, 'depart_' + node_name,
+                           self.unknown_departure))
+        try:
+            self._dispatch_table[node_class] = methods
+        except AttributeError:
+            self._dispatch_table = {node_class: methods}
+        return methods
+
     def unknown_visit(self, node):
         """
         Called when entering unknown `Node` types.
@@ -70,8 +70,10 @@ appropriate).
 __docformat__ = 'reStructuredText'
 
 
+import re
 import docutils.parsers
 import docutils.statemachine
+import docutils.utils
 from docutils.parsers.rst import states
 from docutils import frontend, nodes, Component
 from docutils.transforms import universal
@@ -133,6 +135,11 @@ class Parser(docutils.parsers.Parser):
          ('Enable the "raw" directive.  Enabled by default.',
           ['--raw-enabled'],
           {'action': 'store_true'}),
+         ('Maximal number of "literal" and "code" includes kept in the '
+          'include cache.  Use 0 to disable the cache.  Default: 100.',
+          ['--include-cache-size'],
+          {'default': 100, 'metavar': '<n>',
+           'validator': frontend.validate_nonnegative_int}),
          ('Token name set for parsing code with Pygments: one of '
           '"long", "short", or "none (no parsing)". Default is "long".',
           ['--syntax-highlight'],
@@ -191,6 +198,174 @@ class Parser(docutils.parsers.Parser):
         self.statemachine.run(inputlines, document, inliner=self.inliner)
         self.finish_parse()
 
+    def parse_stream(self, input_lines, document, section_handler=None,
+                     level=1):
+        """
+        Parse the text lines from the iterable `input_lines` (e.g. a file
+        object opened with the input encoding) and populate `document`.
+
+        The input is read and parsed in chunks starting at section titles
+        (see `chunk_input()`), so only the current chunk is kept in memory.
+        Completed sections at nesting depth `level` (1: sections that are
+        children of the document) are passed to `section_handler` (before
+        any transforms are applied), then removed from the document tree
+        and its indices (see `nodes.document.forget()`).
+
+        Without `section_handler`, the result is the same as with `parse()`
+        (unless the heuristics of `chunk_input()` fail).
+        """
+        self.setup_parse(u'', document)
+        self.statemachine = states.RSTStateMachine(
+              state_classes=self.state_classes,
+              initial_state=self.initial_state,
+              debug=document.reporter.debug_flag)
+        self.statemachine.start(document, inliner=self.inliner)
+        memo = self.statemachine.memo
+        source = document['source']
+        initial_state = None
+        for offset, chunk, style in self.chunk_input(
+            input_lines, document.settings.tab_width):
+            lines = docutils.statemachine.StringList(
+                chunk, items=[(source, offset + i)
+                              for i in range(len(chunk))])
+            open_sections = self.open_sections(document)
+            if style is None:
+                depth = len(open_sections) - 1
+            elif style in memo.title_styles:
+                depth = memo.title_styles.index(style)
+            else:
+                depth = len(memo.title_styles)
+            start = 0
+            while start < len(lines):
+                depth = min(depth, len(open_sections) - 1)
+                if section_handler is not None:
+                    self.hand_off_sections(document, section_handler, level,
+                                           depth)
+                    open_sections = self.open_sections(document)
+                parsed = self.statemachine.run_chunk(
+                    lines[start:], open_sections[depth], depth,
+                    offset + start, initial_state)
+                initial_state = 'Body'
+                if not parsed and depth:
+                    depth = 0           # no progress, don't loop
+                    continue
+                start += parsed
+                open_sections = self.open_sections(document)
+                depth = memo.section_level - 1
+        if section_handler is not None:
+            self.hand_off_sections(document, section_handler, level, 0)
+        self.statemachine.node = self.statemachine.memo = None
+        self.finish_parse()
+
+    def chunk_input(self, input_lines, tab_width=8):
+        """
+        Split the text lines from the iterable `input_lines` into chunks
+        that start at section titles.
+
+        Generate (line offset, list of lines, title style) tuples.  The
+        title style is None for the first chunk (if it does not start with
+        a title), a character (underline only), or an (overline, underline)
+        pair, like in `states.RSTState.check_subsection()`.
+
+        Titles are recognized by their adornment, after a blank line.
+        Lines that match other body element patterns (like enumerated list
+        items) are not considered title text.
+        """
+        chunk = []
+        offset = 0
+        style = None
+        for item in input_lines:
+            for line in docutils.statemachine.string2lines(
+                item, tab_width, convert_whitespace=True):
+                chunk.append(line)
+                title = self.title_start(chunk, at_input_start=not offset)
+                if title is None:
+                    continue
+                start, new_style = title
+                if start:
+                    yield offset, chunk[:start], style
+                    offset += start
+                    chunk = chunk[start:]
+                style = new_style
+        if chunk:
+            yield offset, chunk, style
+
+    title_adornment = re.compile(states.Body.patterns['line'])
+
+    non_title_patterns = [re.compile(pattern)
+                          for name, pattern in states.Body.patterns.items()
+                          if name != 'text']
+    """Patterns of lines that are no section title text."""
+
+    def title_start(self, lines, at_input_start=False):
+        """
+        Return (index, style) if `lines` end with a section title preceded
+        by a blank line (or the start of the input), else None.
+        """
+        size = len(lines)
+        if size >= 3 and lines[-2].strip():
+            overline, text, underline = lines[-3:]
+            if (self.is_adornment(overline, text.strip())
+                and self.is_adornment(underline, text.strip())
+                and overline[0] == underline[0]):
+                return self.check_title_start(
+                    lines, size - 3, (overline[0], underline[0]),
+                    at_input_start)
+        if size >= 2 and lines[-2][:1].strip():
+            text, underline = lines[-2:]
+            if self.is_adornment(underline, text):
+                for pattern in self.non_title_patterns:
+                    if pattern.match(text):
+                        return None
+                return self.check_title_start(lines, size - 2, underline[0],
+                                              at_input_start)
+        return None
+
+    def check_title_start(self, lines, start, style, at_input_start):
+        if start == 0:
+            if at_input_start:
+                return start, style
+        elif not lines[start-1].strip():
+            return start, style
+        return None
+
+    def is_adornment(self, line, text):
+        return (self.title_adornment.match(line)
+                and (len(line) >= 4
+                     or len(line) >= docutils.utils.column_width(text)))
+
+    def open_sections(self, document):
+        """
+        Return a list of the document and the sections that are open in the
+        parse: the last child of the document (if a section), its last child
+        (if a section), etc.
+        """
+        sections = [document]
+        node = document
+        while node.children and isinstance(node[-1], nodes.section):
+            node = node[-1]
+            sections.append(node)
+        return sections
+
+    def hand_off_sections(self, document, section_handler, level, depth):
+        """
+        Pass completed sections at nesting depth `level` to
+        `section_handler` and remove them from `document`.  Sections up to
+        nesting depth `depth` remain open.
+        """
+        open_sections = self.open_sections(document)
+        if len(open_sections) < level:
+            return
+        parent = open_sections[level-1]
+        sections = [child for child in parent.children
+                    if isinstance(child, nodes.section)]
+        if depth >= level and len(open_sections) > level:
+            sections.pop()              # still open
+        for section in sections:
+            section_handler(section)
+            parent.remove(section)
+            document.forget(section)
+
 
 class DirectiveError(Exception):
 
@@ -9,6 +9,7 @@ __docformat__ = 'reStructuredText'
 import sys
 import os.path
 import re
+import threading
 import time
 from docutils import io, nodes, statemachine, utils
 from docutils.utils.error_reporting import SafeString, ErrorString
@@ -50,6 +51,22 @@ class Include(Directive):
     standard_include_path = os.path.join(os.path.dirname(states.__file__),
                                          'include')
 
+    cache = {}
+    """Process-wide cache of the nodes of "literal" and "code" includes:
+    {key: [last use, file stamp, nodes]}, see `build_cached()`.  Holds at
+    most "include_cache_size" entries (a setting)."""
+
+    cache_clock = 0
+    """Counter of cache accesses (the "time" of the last use)."""
+
+    cache_lock = threading.Lock()
+    """Serializes changes of the cache."""
+
+    cache_options = ('start-line', 'end-line', 'start-after', 'end-before',
+                     'literal', 'code', 'number-lines')
+    """Options that select the included part of a file and its
+    conversion."""
+
     def run(self):
         """Include a file as part of the content of this reST file."""
         if not self.state.document.settings.file_insertion_enabled:
@@ -68,8 +85,74 @@ class Include(Directive):
         e_handler=self.state.document.settings.input_encoding_error_handler
         tab_width = self.options.get(
             'tab-width', self.state.document.settings.tab_width)
+        self.state.document.settings.record_dependencies.add(path)
+        if 'literal' in self.options or 'code' in self.options:
+            result = self.build_cached(path, encoding, e_handler, tab_width)
+            self.add_name(result[0])
+            return result
+        rawtext, include_lines = self.read(path, encoding, e_handler,
+                                           tab_width)
+        self.state_machine.insert_input(include_lines, path)
+        return []
+
+    def build_cached(self, path, encoding, e_handler, tab_width):
+        """
+        Return copies of the nodes of a "literal" or "code" include.
+
+        The nodes do not depend on the including document: they are
+        cached by path, encoding, `tab_width`, and the options, until the
+        modification time or size of the file changes.  The least recently
+        used entries are dropped when the cache holds more than
+        "include_cache_size" entries.
+        """
+        settings = self.state.document.settings
+        cache_size = getattr(settings, 'include_cache_size', 0)
+        try:
+            stat = os.stat(path)
+            stamp = (stat.st_mtime, stat.st_size)
+        except (OSError, UnicodeError):
+            stamp = None
+        key = ((path, encoding, e_handler, tab_width,
+                tuple(self.options.get('class', ())),
+                settings.syntax_highlight)
+               + tuple([self.options.get(name)
+                        for name in self.cache_options]))
+        Include.cache_clock += 1
+        cached = self.cache.get(key)
+        if stamp is None or cached is None or cached[1] != stamp:
+            rawtext, include_lines = self.read(path, encoding, e_handler,
+                                               tab_width)
+            cached = [Include.cache_clock, stamp,
+                      self.build_fragment(path, rawtext, include_lines,
+                                          tab_width)]
+            if stamp is not None and cache_size:
+                self.cache_lock.acquire()
+                try:
+                    self.cache[key] = cached
+                    if len(self.cache) > cache_size:
+                        keys = self.cache.keys()
+                        keys.sort(key=lambda k: self.cache[k][0])
+                        for k in keys[:len(keys) - cache_size]:
+                            del self.cache[k]
+                finally:
+                    self.cache_lock.release()
+            else:
+                # not cached: the nodes need not be copied
+                return cached[2]
+        cached[0] = Include.cache_clock
+        result = []
+        for node in cached[2]:
+            copy = node.deepcopy()
+            copy.line = node.line
+            result.append(copy)
+        return result
+
+    def read(self, path, encoding, e_handler, tab_width):
+        """
+        Read and decode the included file; return the included text and
+        its lines.
+        """
         try:
-            self.state.document.settings.record_dependencies.add(path)
             include_file = io.FileInput(source_path=path,
                                         encoding=encoding,
                                         error_handler=e_handler)
@@ -113,19 +196,27 @@ class Include(Directive):
 
         include_lines = statemachine.string2lines(rawtext, tab_width,
                                                   convert_whitespace=True)
-        if 'literal' in self.options:
+        return rawtext, include_lines
+
+    def build_fragment(self, path, rawtext, include_lines, tab_width):
+        """
+        Return a list of nodes for a literal or code include, without
+        registering the "name" option.
+        """
+        options = self.options.copy()
+        options.pop('name', None)
+        if 'literal' in options:
             # Convert tabs to spaces, if `tab_width` is positive.
             if tab_width >= 0:
                 text = rawtext.expandtabs(tab_width)
             else:
                 text = rawtext
             literal_block = nodes.literal_block(rawtext, source=path,
-                                    classes=self.options.get('class', []))
+                                    classes=options.get('class', []))
             literal_block.line = 1
-            self.add_name(literal_block)
-            if 'number-lines' in self.options:
+            if 'number-lines' in options:
                 try:
-                    startline = int(self.options['number-lines'] or 1)
+                    startline = int(options['number-lines'] or 1)
                 except ValueError:
                     raise self.error(':number-lines: with non-integer '
                                      'start value')
@@ -142,20 +233,17 @@ class Include(Directive):
             else:
                 literal_block += nodes.Text(text, text)
             return [literal_block]
-        if 'code' in self.options:
-            self.options['source'] = path
-            codeblock = CodeBlock(self.name,
-                                  [self.options.pop('code')], # arguments
-                                  self.options,
-                                  include_lines, # content
-                                  self.lineno,
-                                  self.content_offset,
-                                  self.block_text,
-                                  self.state,
-                                  self.state_machine)
-            return codeblock.run()
-        self.state_machine.insert_input(include_lines, path)
-        return []
+        options['source'] = path
+        codeblock = CodeBlock(self.name,
+                              [options.pop('code')], # arguments
+                              options,
+                              include_lines, # content
+                              self.lineno,
+                              self.content_offset,
+                              self.block_text,
+                              self.state,
+                              self.state_machine)
+        return codeblock.run()
 
 
 class Raw(Directive):
@@ -385,7 +473,7 @@ class Role(Directive):
         if base_role_name:
             base_role, messages = roles.role(
                 base_role_name, self.state_machine.language, self.lineno,
-                self.state.reporter)
+                self.state.reporter, self.state.memo.roles)
             if base_role is None:
                 error = self.state.reporter.error(
                     'Unknown interpreted text role "%s".' % base_role_name,
@@ -419,7 +507,7 @@ class Role(Directive):
                     self.block_text, self.block_text), line=self.lineno)
                 return messages + [error]
         role = roles.CustomRole(new_role_name, base_role, options, content)
-        roles.register_local_role(new_role_name, role)
+        roles.register_local_role(new_role_name, role, self.state.memo.roles)
         return messages
 
 
@@ -431,22 +519,23 @@ class DefaultRole(Directive):
     final_argument_whitespace = False
 
     def run(self):
+        local_roles = self.state.memo.roles
         if not self.arguments:
-            if '' in roles._roles:
-                # restore the "default" default role
-                del roles._roles['']
+            # restore the "default" default role
+            local_roles[''] = roles._role_registry[
+                roles.DEFAULT_INTERPRETED_ROLE]
             return []
         role_name = self.arguments[0]
         role, messages = roles.role(role_name, self.state_machine.language,
-                                    self.lineno, self.state.reporter)
+                                    self.lineno, self.state.reporter,
+                                    local_roles)
         if role is None:
             error = self.state.reporter.error(
                 'Unknown interpreted text role "%s".' % role_name,
                 nodes.literal_block(self.block_text, self.block_text),
                 line=self.lineno)
             return messages + [error]
-        roles._roles[''] = role
-        # @@@ should this be local to the document, not the parser?
+        local_roles[''] = role
         return messages
 
 
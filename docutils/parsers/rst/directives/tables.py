@@ -363,21 +363,20 @@ class CSVTable(Table):
     encode_for_csv = staticmethod(encode_for_csv)
 
     def parse_csv_data_into_rows(self, csv_data, dialect, source):
-        # csv.py doesn't do Unicode; encode temporarily as UTF-8
-        csv_reader = csv.reader([self.encode_for_csv(line + '\n')
-                                 for line in csv_data],
+        # csv.py doesn't do Unicode; encode temporarily as UTF-8 (one line
+        # at a time, the reader consumes an iterator)
+        encode = self.encode_for_csv
+        csv_reader = csv.reader((encode(line + '\n') for line in csv_data),
                                 dialect=dialect)
+        decode = self.decode_from_csv
+        StringList = statemachine.StringList
         rows = []
         max_cols = 0
         for row in csv_reader:
-            row_data = []
-            for cell in row:
-                # decode UTF-8 back to Unicode
-                cell_text = self.decode_from_csv(cell)
-                cell_data = (0, 0, 0, statemachine.StringList(
-                    cell_text.splitlines(), source=source))
-                row_data.append(cell_data)
-            rows.append(row_data)
+            # decode UTF-8 back to Unicode
+            rows.append([(0, 0, 0, StringList(decode(cell).splitlines(),
+                                              source=source))
+                         for cell in row])
             max_cols = max(max_cols, len(row))
         return rows, max_cols
 
@@ -91,17 +91,22 @@ _roles = {}
 """Mapping of local or language-dependent interpreted text role names to role
 functions."""
 
-def role(role_name, language_module, lineno, reporter):
+def role(role_name, language_module, lineno, reporter, local_roles=None):
     """
     Locate and return a role function from its language-dependent name, along
     with a list of system messages.  If the role is not found in the current
     language, check English.  Return a 2-tuple: role function (``None`` if the
     named role cannot be found) and a list of system messages.
+
+    `local_roles` is an optional mapping of the roles defined in the
+    current document (see `register_local_role()`); it is searched first.
     """
     normname = role_name.lower()
     messages = []
     msg_text = []
 
+    if local_roles and normname in local_roles:
+        return local_roles[normname], messages
     if normname in _roles:
         return _roles[normname], messages
 
@@ -154,16 +159,21 @@ def register_canonical_role(name, role_fn):
     set_implicit_options(role_fn)
     _role_registry[name] = role_fn
 
-def register_local_role(name, role_fn):
+def register_local_role(name, role_fn, local_roles=None):
     """
     Register an interpreted text role by its local or language-dependent name.
 
     :Parameters:
       - `name`: The local or language-dependent name of the interpreted role.
       - `role_fn`: The role function.  See the module docstring.
+      - `local_roles`: A mapping of the roles defined in one document (the
+        "roles" attribute of the reStructuredText parser's memo).  If
+        given, the role is registered there instead of for all documents.
     """
     set_implicit_options(role_fn)
-    _roles[name] = role_fn
+    if local_roles is None:
+        local_roles = _roles
+    local_roles[name] = role_fn
 
 def set_implicit_options(role_fn):
     """
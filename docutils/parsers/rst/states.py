@@ -150,6 +150,15 @@ class RSTStateMachine(StateMachineWS):
         Extend `StateMachineWS.run()`: set up parse-global data and
         run the StateMachine.
         """
+        self.start(document, match_titles, inliner)
+        self.attach_observer(document.note_source)
+        results = StateMachineWS.run(self, input_lines, input_offset,
+                                     input_source=document['source'])
+        assert results == [], 'RSTStateMachine.run() results should be empty!'
+        self.node = self.memo = None    # remove unneeded references
+
+    def start(self, document, match_titles=True, inliner=None):
+        """Set up parse-global data for parsing into `document`."""
         self.language = languages.get_language(
             document.settings.language_code)
         self.match_titles = match_titles
@@ -162,15 +171,31 @@ class RSTStateMachine(StateMachineWS):
                            title_styles=[],
                            section_level=0,
                            section_bubble_up_kludge=False,
-                           inliner=inliner)
+                           inliner=inliner,
+                           roles={})
         self.document = document
-        self.attach_observer(document.note_source)
         self.reporter = self.memo.reporter
         self.node = document
+
+    def run_chunk(self, input_lines, node, section_level, input_offset=0,
+                  initial_state=None):
+        """
+        Parse `input_lines` (a `StringList`) into `node`, the document or an
+        open section at nesting depth `section_level`, continuing a parse
+        set up with `start()`.  `initial_state` defaults to
+        `self.initial_state`.
+
+        Return the number of lines parsed.  The parse ends early at the
+        title of a section at depth `section_level` or above; its level is
+        left in ``self.memo.section_level``.
+        """
+        self.node = node
+        self.memo.section_level = section_level
+        self.attach_observer(self.document.note_source)
         results = StateMachineWS.run(self, input_lines, input_offset,
-                                     input_source=document['source'])
+                                     initial_state=initial_state)
         assert results == [], 'RSTStateMachine.run() results should be empty!'
-        self.node = self.memo = None    # remove unneeded references
+        return min(self.line_offset + 1, len(input_lines))
 
 
 class NestedStateMachine(StateMachineWS):
@@ -468,9 +493,50 @@ class Inliner:
         """List of (pattern, bound method) tuples, used by
         `self.implicit_inline`."""
 
+        self.local_roles = None
+        """Roles defined in the current document (from the parser's memo),
+        see `roles.role()`."""
+
+    patterns_cache = {}
+    """Compiled patterns, shared by all instances of an Inliner class.
+    Maps ``(class, character_level_inline_markup)`` to the values of
+    `start_string_prefix`, `end_string_suffix`, `parts`, and `patterns`."""
+
     def init_customizations(self, settings):
+        character_level_inline_markup = bool(
+            getattr(settings, 'character_level_inline_markup', False))
+        key = (self.__class__, character_level_inline_markup)
+        try:
+            cached = self.patterns_cache[key]
+        except KeyError:
+            self.compile_patterns(character_level_inline_markup)
+            # No lock required: in the worst case, concurrent threads
+            # compile the same patterns and one of the results is kept.
+            cached = self.patterns_cache[key] = (
+                self.start_string_prefix, self.end_string_suffix,
+                self.parts, self.patterns)
+        (self.start_string_prefix, self.end_string_suffix,
+         self.parts, self.patterns) = cached
+
+        self.implicit_dispatch.append((self.patterns.uri,
+                                       self.standalone_uri))
+        if settings.pep_references:
+            self.implicit_dispatch.append((self.patterns.pep,
+                                           self.pep_reference))
+        if settings.rfc_references:
+            self.implicit_dispatch.append((self.patterns.rfc,
+                                           self.rfc_reference))
+
+    def compile_patterns(self, character_level_inline_markup):
+        """
+        Build the inline markup patterns.
+
+        Called by `init_customizations()` once per Inliner class and value of
+        the "character_level_inline_markup" setting.  Subclasses changing the
+        pattern building blocks (class attributes) get their own patterns.
+        """
         # lookahead and look-behind expressions for inline markup rules
-        if getattr(settings, 'character_level_inline_markup', False):
+        if character_level_inline_markup:
             start_string_prefix = u'(^|(?<!\x00))'
             end_string_suffix = u''
         else:
@@ -600,15 +666,6 @@ class Inliner:
                 (RFC(-|\s+)?(?P<rfcnum>\d+))
                 %(end_string_suffix)s""" % args, re.VERBOSE | re.UNICODE))
 
-        self.implicit_dispatch.append((self.patterns.uri,
-                                       self.standalone_uri))
-        if settings.pep_references:
-            self.implicit_dispatch.append((self.patterns.pep,
-                                           self.pep_reference))
-        if settings.rfc_references:
-            self.implicit_dispatch.append((self.patterns.rfc,
-                                           self.rfc_reference))
-
     def parse(self, text, lineno, memo, parent):
         # Needs to be refactored for nested inline markup.
         # Add nested_parse() method?
@@ -628,6 +685,7 @@ class Inliner:
         self.reporter = memo.reporter
         self.document = memo.document
         self.language = memo.language
+        self.local_roles = getattr(memo, 'roles', None)
         self.parent = parent
         pattern_search = self.patterns.initial.search
         dispatch = self.dispatch
@@ -866,7 +924,7 @@ class Inliner:
 
     def interpreted(self, rawsource, text, role, lineno):
         role_fn, messages = roles.role(role, self.language, lineno,
-                                       self.reporter)
+                                       self.reporter, self.local_roles)
         if role_fn:
             nodes, messages2 = role_fn(role, rawsource, text, lineno, self)
             return nodes, messages + messages2
@@ -1808,10 +1866,51 @@ class Body(RSTState):
             entry = nodes.entry(**attributes)
             row += entry
             if ''.join(cellblock):
-                self.nested_parse(cellblock, input_offset=tableline+offset,
-                                  node=entry)
+                if not self.build_plain_cell(cellblock, tableline+offset,
+                                             entry):
+                    self.nested_parse(cellblock, input_offset=tableline+offset,
+                                      node=entry)
         return row
 
+    plain_cell_pattern = re.compile(
+        r'(?!\w+[.)](\s|$))[^\W_][^*`_|\[\]:\\<>@\t\x00]*$', re.UNICODE)
+    """Matches a line of text without inline markup characters, that
+    cannot start a body element other than a paragraph."""
+
+    def build_plain_cell(self, cellblock, input_offset, entry):
+        """
+        Shortcut for table cells with a single line of plain text (see
+        `plain_cell_pattern`): add the paragraph to `entry` without a nested
+        parse.  Return false if the cell needs a nested parse.
+        """
+        text = None
+        for i, line in enumerate(cellblock):
+            if line.strip():
+                if text is not None:
+                    return False
+                text, index = line.rstrip(), i
+        if text is None or not self.plain_cell_pattern.match(text):
+            return False
+        source, offset = cellblock.info(index)
+        if offset is None:
+            return False
+        if self.inliner.patterns.initial.search(text) or [
+            pattern for pattern, method in self.inliner.implicit_dispatch
+            if pattern.search(text)]:
+            textnodes, messages = self.inline_text(text,
+                                                   input_offset + index + 1)
+        else:
+            # what `Inliner.parse()` returns for text without inline markup
+            textnodes, messages = [nodes.Text(text, rawsource=text)], []
+        paragraph = nodes.paragraph(text, '', *textnodes)
+        paragraph.source, paragraph.line = source, offset + 1
+        entry += paragraph
+        entry += messages
+        # Leave the document's current source & line where a nested parse
+        # leaves them (at the end of the input):
+        self.document.note_source(*cellblock.info(len(cellblock)))
+        return True
+
 
     explicit = Struct()
     """Patterns and constants used for explicit markup recognition."""
@@ -2044,7 +2143,7 @@ class Body(RSTState):
                 del substitution_node[i]
             else:
                 i += 1
-        for node in substitution_node.traverse(nodes.Element):
+        for node in substitution_node.findall(nodes.Element):
             if self.disallowed_inside_substitution_definitions(node):
                 pformat = nodes.literal_block('', node.pformat().rstrip())
                 msg = self.reporter.error(
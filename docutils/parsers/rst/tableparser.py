@@ -20,10 +20,11 @@ and produce a well-formed data structure suitable for building a CALS table.
 __docformat__ = 'reStructuredText'
 
 
+import heapq
 import re
 import sys
 from docutils import DataError
-from docutils.utils import strip_combining_chars
+from docutils.utils import strip_combining_chars, find_combining_chars
 
 
 class TableMarkupError(DataError):
@@ -167,9 +168,11 @@ class GridTableParser(TableParser):
         We'll end up knowing all the row and column boundaries, cell positions
         and their dimensions.
         """
-        corners = [(0, 0)]
+        self.lines = self.block.data
+        self.combining_lines = self.find_combining_lines()
+        corners = [(0, 0)]              # a heap
         while corners:
-            top, left = corners.pop(0)
+            top, left = heapq.heappop(corners)
             if top == self.bottom or left == self.right \
                   or top <= self.done[left]:
                 continue
@@ -180,16 +183,51 @@ class GridTableParser(TableParser):
             update_dict_of_lists(self.rowseps, rowseps)
             update_dict_of_lists(self.colseps, colseps)
             self.mark_done(top, left, bottom, right)
-            cellblock = self.block.get_2D_block(top + 1, left + 1,
-                                                bottom, right)
-            cellblock.disconnect()      # lines in cell can't sync with parent
-            cellblock.replace(self.double_width_pad_char, '')
+            cellblock = self.get_cell_block(top, left, bottom, right)
             self.cells.append((top, left, bottom, right, cellblock))
-            corners.extend([(top, right), (bottom, left)])
-            corners.sort()
+            heapq.heappush(corners, (top, right))
+            heapq.heappush(corners, (bottom, left))
         if not self.check_parse_complete():
             raise TableMarkupError('Malformed table; parse incomplete.')
 
+    def find_combining_lines(self):
+        """Return the set of indices of lines with combining characters."""
+        combining_lines = set()
+        for i, line in enumerate(self.lines):
+            # Combining characters start at U+0300; skip the scan for
+            # lines without any characters in that range:
+            if (isinstance(line, unicode) and line and max(line) >= u'\u0300'
+                and find_combining_chars(line)):
+                combining_lines.add(i)
+        return combining_lines
+
+    def get_cell_block(self, top, left, bottom, right):
+        """
+        Return the contents of the cell with the given corners, a
+        disconnected `StringList` (like `StringList.get_2D_block()`).
+        """
+        cellblock = self.block[top + 1:bottom]
+        if (self.combining_lines
+            and self.combining_lines.intersection(range(top + 1, bottom))):
+            # get_2D_block() maps text columns to string indices:
+            cellblock = self.block.get_2D_block(top + 1, left + 1,
+                                                bottom, right)
+            cellblock.disconnect()
+            cellblock.replace(self.double_width_pad_char, '')
+            return cellblock
+        lines = [line[left + 1:right].rstrip()
+                 for line in self.lines[top + 1:bottom]]
+        indent = right
+        for line in lines:
+            if line:
+                indent = min(indent, len(line) - len(line.lstrip()))
+        if 0 < indent < right:
+            lines = [line[indent:] for line in lines]
+        pad_char = self.double_width_pad_char
+        cellblock.data = [line.replace(pad_char, '') for line in lines]
+        cellblock.disconnect()      # lines in cell can't sync with parent
+        return cellblock
+
     def mark_done(self, top, left, bottom, right):
         """For keeping track of how much of each text column has been seen."""
         before = top - 1
@@ -208,7 +246,7 @@ class GridTableParser(TableParser):
 
     def scan_cell(self, top, left):
         """Starting at the top-left corner, start tracing out a cell."""
-        assert self.block[top][left] == '+'
+        assert self.lines[top][left] == '+'
         result = self.scan_right(top, left)
         return result
 
@@ -218,17 +256,20 @@ class GridTableParser(TableParser):
         boundaries ('+').
         """
         colseps = {}
-        line = self.block[top]
-        for i in range(left + 1, self.right + 1):
-            if line[i] == '+':
-                colseps[i] = [top]
-                result = self.scan_down(top, left, i)
-                if result:
-                    bottom, rowseps, newcolseps = result
-                    update_dict_of_lists(colseps, newcolseps)
-                    return bottom, i, rowseps, colseps
-            elif line[i] != '-':
+        line = self.lines[top]
+        start = left + 1
+        end = self.right + 1
+        while start < end:
+            i = line.find('+', start, end)
+            if i < 0 or line.count('-', start, i) != i - start:
                 return None
+            colseps[i] = [top]
+            result = self.scan_down(top, left, i)
+            if result:
+                bottom, rowseps, newcolseps = result
+                update_dict_of_lists(colseps, newcolseps)
+                return bottom, i, rowseps, colseps
+            start = i + 1
         return None
 
     def scan_down(self, top, left, right):
@@ -237,15 +278,17 @@ class GridTableParser(TableParser):
         boundaries.
         """
         rowseps = {}
+        lines = self.lines
         for i in range(top + 1, self.bottom + 1):
-            if self.block[i][right] == '+':
+            char = lines[i][right]
+            if char == '+':
                 rowseps[i] = [right]
                 result = self.scan_left(top, left, i, right)
                 if result:
                     newrowseps, colseps = result
                     update_dict_of_lists(rowseps, newrowseps)
                     return i, rowseps, colseps
-            elif self.block[i][right] != '|':
+            elif char != '|':
                 return None
         return None
 
@@ -254,15 +297,16 @@ class GridTableParser(TableParser):
         Noting column boundaries, look for the bottom-left corner of the cell.
         It must line up with the starting point.
         """
-        colseps = {}
-        line = self.block[bottom]
-        for i in range(right - 1, left, -1):
-            if line[i] == '+':
-                colseps[i] = [bottom]
-            elif line[i] != '-':
-                return None
-        if line[left] != '+':
+        line = self.lines[bottom]
+        border = line[left + 1:right]
+        if (line[left] != '+'
+            or border.count('-') + border.count('+') != len(border)):
             return None
+        colseps = {}
+        i = line.find('+', left + 1, right)
+        while i >= 0:
+            colseps[i] = [bottom]
+            i = line.find('+', i + 1, right)
         result = self.scan_up(top, left, bottom, right)
         if result is not None:
             rowseps = result
@@ -274,10 +318,12 @@ class GridTableParser(TableParser):
         Noting row boundaries, see if we can return to the starting point.
         """
         rowseps = {}
+        lines = self.lines
         for i in range(bottom - 1, top, -1):
-            if self.block[i][left] == '+':
+            char = lines[i][left]
+            if char == '+':
                 rowseps[i] = [left]
-            elif self.block[i][left] != '|':
+            elif char != '|':
                 return None
         return rowseps
 
@@ -110,6 +110,7 @@ import sys
 import re
 import types
 import unicodedata
+from array import array
 from docutils import utils
 from docutils.utils.error_reporting import ErrorOutput
 
@@ -1067,7 +1068,37 @@ class SearchStateMachineWS(_SearchOverride, StateMachineWS):
     pass
 
 
-class ViewList:
+_no_offset = -2**31
+"""Stored instead of None in `ViewList` offset arrays."""
+
+def _store_offset(offset):
+    if offset is None:
+        return _no_offset
+    return offset
+
+
+class _SourceTable:
+
+    """
+    Append-only table of the sources of `ViewList` items.  Shared by lists
+    derived from each other; items refer to sources by table index.
+    """
+
+    def __init__(self):
+        self.sources = []
+        self.ids = {}
+
+    def id(self, source):
+        """Return the index of `source`, adding it if necessary."""
+        try:
+            return self.ids[source]
+        except KeyError:
+            self.ids[source] = index = len(self.sources)
+            self.sources.append(source)
+            return index
+
+
+class ViewList(object):
 
     """
     List with extended functionality: slices of ViewList objects are child
@@ -1085,17 +1116,43 @@ class ViewList:
     Also, ViewList objects keep track of the source & offset of each item.
     This information is accessible via the `source()`, `offset()`, and
     `info()` methods.
+
+    Slicing does not copy: a child list refers to a range of the parent's
+    storage, which is copied when either list is modified ("copy on
+    write").  Sources are stored once in a table shared by related lists,
+    offsets in an integer array.  The `data` and `items` attributes
+    provide the contents as lists.  The `data` list is the storage of the
+    items from then on: changes to it change this list, and slices of
+    this list copy their items.
     """
 
     def __init__(self, initlist=None, source=None, items=None,
                  parent=None, parent_offset=None):
-        self.data = []
-        """The actual list of data, flattened from various sources."""
+        self._lines_exported = False
+        """Was `self._lines` handed out as `self.data`?  Then it is never
+        shared, starts with the first item, and determines the length."""
 
-        self.items = []
-        """A list of (source, offset) pairs, same length as `self.data`: the
-        source of each line and the offset of each line from the beginning of
-        its source."""
+        self._lines = []
+        """Storage of the list items, from index `self._lines_start`."""
+
+        self._lines_start = 0
+
+        self._source_ids = array('i')
+        """Storage of the item sources (`self._sources` indices), from
+        index `self._items_start`."""
+
+        self._offsets = array('l')
+        """Storage of the item offsets (`_no_offset` for None), from index
+        `self._items_start`."""
+
+        self._items_start = 0
+
+        self._sources = _SourceTable()
+
+        self._length = 0
+
+        self._lines_shared = self._items_shared = False
+        """Is the storage shared with other lists (copy before changing)?"""
 
         self.parent = parent
         """The parent list."""
@@ -1104,39 +1161,170 @@ class ViewList:
         """Offset of this list from the beginning of the parent list."""
 
         if isinstance(initlist, ViewList):
-            self.data = initlist.data[:]
-            self.items = initlist.items[:]
+            initlist._share(self, 0, len(initlist))
         elif initlist is not None:
-            self.data = list(initlist)
+            self._lines = list(initlist)
+            self._length = len(self._lines)
             if items:
                 self.items = items
             else:
-                self.items = [(source, i) for i in range(len(initlist))]
-        assert len(self.data) == len(self.items), 'data mismatch'
+                self._source_ids = array('i', [self._sources.id(source)]
+                                         ) * self._length
+                self._offsets = array('l', range(self._length))
+        assert self._length == len(self._offsets), 'data mismatch'
+
+    def _share(self, other, start, stop):
+        """Make `other` a copy-on-write view of items `start:stop`."""
+        if self._lines_exported:
+            other._lines = self._lines[start:stop]
+            other._lines_start = 0
+        else:
+            other._lines = self._lines
+            other._lines_start = self._lines_start + start
+            self._lines_shared = True
+        other._source_ids = self._source_ids
+        other._offsets = self._offsets
+        other._items_start = self._items_start + start
+        other._sources = self._sources
+        other._length = stop - start
+        other._lines_shared = not self._lines_exported
+        other._items_shared = self._items_shared = True
+
+    def _own_lines(self):
+        """Make `self._lines` a private list of exactly the list items."""
+        start = self._lines_start
+        stop = start + self._length
+        if self._lines_shared:
+            self._lines = self._lines[start:stop]
+            self._lines_shared = False
+        elif start or stop != len(self._lines):
+            del self._lines[stop:]
+            del self._lines[:start]
+        self._lines_start = 0
+
+    def _own_items(self):
+        """Make the item storage private and exactly the list items."""
+        start = self._items_start
+        stop = start + self._length
+        if (self._items_shared or start
+            or stop != len(self._offsets)):
+            self._source_ids = self._source_ids[start:stop]
+            self._offsets = self._offsets[start:stop]
+            self._items_shared = False
+        self._items_start = 0
+
+    def _own(self):
+        self._own_lines()
+        self._own_items()
+
+    def _item_arrays(self, other):
+        """
+        Return the source id and offset arrays of ViewList `other`, with
+        source ids valid in `self._sources`.
+        """
+        start = other._items_start
+        stop = start + other._length
+        source_ids = other._source_ids[start:stop]
+        if other._sources is not self._sources:
+            id = self._sources.id
+            sources = other._sources.sources
+            source_ids = array('i', [id(sources[i]) for i in source_ids])
+        return source_ids, other._offsets[start:stop]
+
+    def _get_lines(self):
+        """Return a copy of the list items as a list."""
+        start = self._lines_start
+        return self._lines[start:start+self._length]
+
+    def _get_length(self):
+        if self._lines_exported:
+            return len(self._lines)
+        return self._stored_length
+
+    def _set_length(self, length):
+        self._stored_length = length
+
+    _length = property(_get_length, _set_length, doc="""
+        The number of list items.""")
+
+    def _get_data(self):
+        self._own_lines()
+        self._lines_exported = True
+        return self._lines
+
+    def _set_data(self, data):
+        self._lines = data
+        self._lines_start = 0
+        self._lines_shared = False
+        self._lines_exported = True
+
+    data = property(_get_data, _set_data, doc="""
+        The actual list of data, flattened from various sources.""")
+
+    def _get_items(self):
+        sources = self._sources.sources
+        start = self._items_start
+        stop = start + self._length
+        offsets = self._offsets[start:stop]
+        items = zip([sources[i] for i in self._source_ids[start:stop]],
+                    offsets)
+        if _no_offset in offsets:
+            for i, (source, offset) in enumerate(items):
+                if offset == _no_offset:
+                    items[i] = (source, None)
+        return items
+
+    def _set_items(self, items):
+        id = self._sources.id
+        self._source_ids = array('i', [id(source) for source, offset in items])
+        self._offsets = array('l', [_store_offset(offset)
+                                    for source, offset in items])
+        self._items_start = 0
+        self._items_shared = False
+
+    items = property(_get_items, _set_items, doc="""
+        A list of (source, offset) pairs, same length as `self.data`: the
+        source of each line and the offset of each line from the beginning of
+        its source.  Changing the returned list does not change this list.""")
 
     def __str__(self):
-        return str(self.data)
+        return str(self._get_lines())
 
     def __repr__(self):
         return '%s(%s, items=%s)' % (self.__class__.__name__,
-                                     self.data, self.items)
+                                     self._get_lines(), self.items)
 
-    def __lt__(self, other): return self.data <  self.__cast(other)
-    def __le__(self, other): return self.data <= self.__cast(other)
-    def __eq__(self, other): return self.data == self.__cast(other)
-    def __ne__(self, other): return self.data != self.__cast(other)
-    def __gt__(self, other): return self.data >  self.__cast(other)
-    def __ge__(self, other): return self.data >= self.__cast(other)
-    def __cmp__(self, other): return cmp(self.data, self.__cast(other))
+    def __lt__(self, other): return self._get_lines() <  self.__cast(other)
+    def __le__(self, other): return self._get_lines() <= self.__cast(other)
+    def __eq__(self, other): return self._get_lines() == self.__cast(other)
+    def __ne__(self, other): return self._get_lines() != self.__cast(other)
+    def __gt__(self, other): return self._get_lines() >  self.__cast(other)
+    def __ge__(self, other): return self._get_lines() >= self.__cast(other)
+    def __cmp__(self, other): return cmp(self._get_lines(), self.__cast(other))
+
+    __hash__ = None
 
     def __cast(self, other):
         if isinstance(other, ViewList):
-            return other.data
+            return other._get_lines()
         else:
             return other
 
-    def __contains__(self, item): return item in self.data
-    def __len__(self): return len(self.data)
+    def __contains__(self, item): return item in self._get_lines()
+    def __len__(self): return self._length
+
+    def __iter__(self):
+        lines = self._lines
+        for i in xrange(self._lines_start, self._lines_start + self._length):
+            yield lines[i]
+
+    def _index(self, i):
+        """Return the storage index for list index `i`."""
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError('list index out of range')
+        return i
 
     # The __getitem__()/__setitem__() methods check whether the index
     # is a slice first, since indexing a native list with a slice object
@@ -1145,126 +1333,184 @@ class ViewList:
     def __getitem__(self, i):
         if isinstance(i, types.SliceType):
             assert i.step in (None, 1),  'cannot handle slice with stride'
-            return self.__class__(self.data[i.start:i.stop],
-                                  items=self.items[i.start:i.stop],
-                                  parent=self, parent_offset=i.start or 0)
+            start, stop, step = i.indices(self._length)
+            stop = max(start, stop)
+            child = self.__class__(parent=self, parent_offset=start)
+            self._share(child, start, stop)
+            return child
         else:
-            return self.data[i]
+            return self._lines[self._lines_start + self._index(i)]
 
     def __setitem__(self, i, item):
         if isinstance(i, types.SliceType):
             assert i.step in (None, 1), 'cannot handle slice with stride'
             if not isinstance(item, ViewList):
                 raise TypeError('assigning non-ViewList to ViewList slice')
-            self.data[i.start:i.stop] = item.data
-            self.items[i.start:i.stop] = item.items
-            assert len(self.data) == len(self.items), 'data mismatch'
+            source_ids, offsets = self._item_arrays(item)
+            start, stop, step = i.indices(self._length)
+            stop = max(start, stop)
+            self._own()
+            self._lines[start:stop] = item._get_lines()
+            self._source_ids[start:stop] = source_ids
+            self._offsets[start:stop] = offsets
+            self._length = len(self._lines)
+            assert self._length == len(self._offsets), 'data mismatch'
             if self.parent:
-                self.parent[(i.start or 0) + self.parent_offset
-                            : (i.stop or len(self)) + self.parent_offset] = item
+                self.parent[start + self.parent_offset
+                            : stop + self.parent_offset] = item
         else:
-            self.data[i] = item
+            index = self._index(i)
+            self._own_lines()
+            self._lines[index] = item
             if self.parent:
-                self.parent[i + self.parent_offset] = item
+                self.parent[index + self.parent_offset] = item
 
     def __delitem__(self, i):
-        try:
-            del self.data[i]
-            del self.items[i]
-            if self.parent:
-                del self.parent[i + self.parent_offset]
-        except TypeError:
+        if isinstance(i, types.SliceType):
             assert i.step is None, 'cannot handle slice with stride'
-            del self.data[i.start:i.stop]
-            del self.items[i.start:i.stop]
-            if self.parent:
-                del self.parent[(i.start or 0) + self.parent_offset
-                                : (i.stop or len(self)) + self.parent_offset]
+            start, stop, step = i.indices(self._length)
+            stop = max(start, stop)
+        else:
+            start = self._index(i)
+            stop = start + 1
+        self._own()
+        del self._lines[start:stop]
+        del self._source_ids[start:stop]
+        del self._offsets[start:stop]
+        self._length = len(self._lines)
+        if self.parent:
+            if isinstance(i, types.SliceType):
+                del self.parent[start + self.parent_offset
+                                : stop + self.parent_offset]
+            else:
+                del self.parent[start + self.parent_offset]
+
+    def _concatenate(self, first, second):
+        result = self.__class__()
+        result._sources = self._sources
+        result._lines = first._get_lines() + second._get_lines()
+        result._length = len(result._lines)
+        for part in first, second:
+            source_ids, offsets = result._item_arrays(part)
+            result._source_ids.extend(source_ids)
+            result._offsets.extend(offsets)
+        return result
 
     def __add__(self, other):
         if isinstance(other, ViewList):
-            return self.__class__(self.data + other.data,
-                                  items=(self.items + other.items))
+            return self._concatenate(self, other)
         else:
             raise TypeError('adding non-ViewList to a ViewList')
 
     def __radd__(self, other):
         if isinstance(other, ViewList):
-            return self.__class__(other.data + self.data,
-                                  items=(other.items + self.items))
+            return self._concatenate(other, self)
         else:
             raise TypeError('adding ViewList to a non-ViewList')
 
     def __iadd__(self, other):
         if isinstance(other, ViewList):
-            self.data += other.data
+            source_ids, offsets = self._item_arrays(other)
+            self._own()
+            self._lines.extend(other._get_lines())
+            self._source_ids.extend(source_ids)
+            self._offsets.extend(offsets)
+            self._length = len(self._lines)
         else:
             raise TypeError('argument to += must be a ViewList')
         return self
 
     def __mul__(self, n):
-        return self.__class__(self.data * n, items=(self.items * n))
+        result = self.__class__()
+        self._share(result, 0, self._length)
+        result._own()
+        result *= n
+        return result
 
     __rmul__ = __mul__
 
     def __imul__(self, n):
-        self.data *= n
-        self.items *= n
+        self._own()
+        self._lines *= n
+        self._source_ids *= n
+        self._offsets *= n
+        self._length = len(self._lines)
         return self
 
     def extend(self, other):
         if not isinstance(other, ViewList):
             raise TypeError('extending a ViewList with a non-ViewList')
         if self.parent:
-            self.parent.insert(len(self.data) + self.parent_offset, other)
-        self.data.extend(other.data)
-        self.items.extend(other.items)
+            self.parent.insert(self._length + self.parent_offset, other)
+        source_ids, offsets = self._item_arrays(other)
+        self._own()
+        self._lines.extend(other._get_lines())
+        self._source_ids.extend(source_ids)
+        self._offsets.extend(offsets)
+        self._length = len(self._lines)
 
     def append(self, item, source=None, offset=0):
         if source is None:
             self.extend(item)
         else:
             if self.parent:
-                self.parent.insert(len(self.data) + self.parent_offset, item,
+                self.parent.insert(self._length + self.parent_offset, item,
                                    source, offset)
-            self.data.append(item)
-            self.items.append((source, offset))
+            self._own()
+            self._lines.append(item)
+            self._source_ids.append(self._sources.id(source))
+            self._offsets.append(_store_offset(offset))
+            self._length += 1
 
     def insert(self, i, item, source=None, offset=0):
         if source is None:
             if not isinstance(item, ViewList):
                 raise TypeError('inserting non-ViewList with no source given')
-            self.data[i:i] = item.data
-            self.items[i:i] = item.items
+            source_ids, offsets = self._item_arrays(item)
+            self._own()
+            self._lines[i:i] = item._get_lines()
+            self._source_ids[i:i] = source_ids
+            self._offsets[i:i] = offsets
+            self._length = len(self._lines)
             if self.parent:
-                index = (len(self.data) + i) % len(self.data)
+                index = (self._length + i) % self._length
                 self.parent.insert(index + self.parent_offset, item)
         else:
-            self.data.insert(i, item)
-            self.items.insert(i, (source, offset))
+            self._own()
+            self._lines.insert(i, item)
+            self._source_ids.insert(i, self._sources.id(source))
+            self._offsets.insert(i, _store_offset(offset))
+            self._length += 1
             if self.parent:
-                index = (len(self.data) + i) % len(self.data)
+                index = (self._length + i) % self._length
                 self.parent.insert(index + self.parent_offset, item,
                                    source, offset)
 
     def pop(self, i=-1):
         if self.parent:
-            index = (len(self.data) + i) % len(self.data)
+            index = (self._length + i) % self._length
             self.parent.pop(index + self.parent_offset)
-        self.items.pop(i)
-        return self.data.pop(i)
+        self._own()
+        self._source_ids.pop(i)
+        self._offsets.pop(i)
+        self._length -= 1
+        return self._lines.pop(i)
 
     def trim_start(self, n=1):
         """
         Remove items from the start of the list, without touching the parent.
         """
-        if n > len(self.data):
+        if n > self._length:
             raise IndexError("Size of trim too large; can't trim %s items "
-                             "from a list of size %s." % (n, len(self.data)))
+                             "from a list of size %s." % (n, self._length))
         elif n < 0:
             raise IndexError('Trim size must be >= 0.')
-        del self.data[:n]
-        del self.items[:n]
+        if self._lines_exported:
+            del self._lines[:n]
+        else:
+            self._lines_start += n
+            self._length -= n
+        self._items_start += n
         if self.parent:
             self.parent_offset += n
 
@@ -1272,28 +1518,32 @@ class ViewList:
         """
         Remove items from the end of the list, without touching the parent.
         """
-        if n > len(self.data):
+        if n > self._length:
             raise IndexError("Size of trim too large; can't trim %s items "
-                             "from a list of size %s." % (n, len(self.data)))
+                             "from a list of size %s." % (n, self._length))
         elif n < 0:
             raise IndexError('Trim size must be >= 0.')
-        del self.data[-n:]
-        del self.items[-n:]
+        if self._lines_exported:
+            del self._lines[len(self._lines) - n:]
+        else:
+            self._length -= n
 
     def remove(self, item):
         index = self.index(item)
         del self[index]
 
-    def count(self, item): return self.data.count(item)
-    def index(self, item): return self.data.index(item)
+    def count(self, item): return self._get_lines().count(item)
+    def index(self, item): return self._get_lines().index(item)
 
     def reverse(self):
-        self.data.reverse()
-        self.items.reverse()
+        self._own()
+        self._lines.reverse()
+        self._source_ids.reverse()
+        self._offsets.reverse()
         self.parent = None
 
     def sort(self, *args):
-        tmp = zip(self.data, self.items)
+        tmp = zip(self._get_lines(), self.items)
         tmp.sort(*args)
         self.data = [entry[0] for entry in tmp]
         self.items = [entry[1] for entry in tmp]
@@ -1302,12 +1552,16 @@ class ViewList:
     def info(self, i):
         """Return source & offset for index `i`."""
         try:
-            return self.items[i]
+            index = self._items_start + self._index(i)
         except IndexError:
-            if i == len(self.data):     # Just past the end
-                return self.items[i - 1][0], None
+            if i == self._length:       # Just past the end
+                return self.info(i - 1)[0], None
             else:
                 raise
+        offset = self._offsets[index]
+        if offset == _no_offset:
+            offset = None
+        return self._sources.sources[self._source_ids[index]], offset
 
     def source(self, i):
         """Return source for index `i`."""
@@ -1323,7 +1577,7 @@ class ViewList:
 
     def xitems(self):
         """Return iterator yielding (source, offset, value) tuples."""
-        for (value, (source, offset)) in zip(self.data, self.items):
+        for (value, (source, offset)) in zip(self._get_lines(), self.items):
             yield (source, offset, value)
 
     def pprint(self):
@@ -1342,8 +1596,9 @@ class StringList(ViewList):
         from index `start` to `end`.  No whitespace-checking is done on the
         trimmed text.  Does not affect slice parent.
         """
-        self.data[start:end] = [line[length:]
-                                for line in self.data[start:end]]
+        self._own_lines()
+        self._lines[start:end] = [line[length:]
+                                  for line in self._lines[start:end]]
 
     def get_text_block(self, start, flush_left=False):
         """
@@ -1353,10 +1608,12 @@ class StringList(ViewList):
         indented line is encountered before the text block ends (with a blank
         line).
         """
+        lines = self._lines
+        base = self._lines_start
         end = start
-        last = len(self.data)
+        last = self._length
         while end < last:
-            line = self.data[end]
+            line = lines[base + end]
             if not line.strip():
                 break
             if flush_left and (line[0] == ' '):
@@ -1388,22 +1645,24 @@ class StringList(ViewList):
           - the amount of the indent;
           - a boolean: did the indented block finish with a blank line or EOF?
         """
+        lines = self._lines
+        base = self._lines_start
         indent = block_indent           # start with None if unknown
         end = start
         if block_indent is not None and first_indent is None:
             first_indent = block_indent
         if first_indent is not None:
             end += 1
-        last = len(self.data)
+        last = self._length
         while end < last:
-            line = self.data[end]
+            line = lines[base + end]
             if line and (line[0] != ' '
                          or (block_indent is not None
                              and line[:block_indent].strip())):
                 # Line not indented or insufficiently indented.
                 # Block finished properly iff the last indented line blank:
                 blank_finish = ((end > start)
-                                and not self.data[end - 1].strip())
+                                and not lines[base + end - 1].strip())
                 break
             stripped = line.lstrip()
             if not stripped:            # blank line
@@ -1421,30 +1680,33 @@ class StringList(ViewList):
             blank_finish = 1            # block ends at end of lines
         block = self[start:end]
         if first_indent is not None and block:
-            block.data[0] = block.data[0][first_indent:]
+            block._own_lines()
+            block._lines[0] = block._lines[0][first_indent:]
         if indent and strip_indent:
             block.trim_left(indent, start=(first_indent is not None))
         return block, indent or 0, blank_finish
 
     def get_2D_block(self, top, left, bottom, right, strip_indent=True):
         block = self[top:bottom]
+        block._own_lines()
+        data = block._lines
         indent = right
-        for i in range(len(block.data)):
+        for i in range(len(data)):
             # get slice from line, care for combining characters
-            ci = utils.column_indices(block.data[i])
+            ci = utils.column_indices(data[i])
             try:
                 left = ci[left]
             except IndexError:
-                left += len(block.data[i]) - len(ci)
+                left += len(data[i]) - len(ci)
             try:
                 right = ci[right]
             except IndexError:
-                right += len(block.data[i]) - len(ci)
-            block.data[i] = line = block.data[i][left:right].rstrip()
+                right += len(data[i]) - len(ci)
+            data[i] = line = data[i][left:right].rstrip()
             if line:
                 indent = min(indent, len(line) - len(line.lstrip()))
         if strip_indent and 0 < indent < right:
-            block.data = [line[indent:] for line in block.data]
+            data[:] = [line[indent:] for line in data]
         return block
 
     def pad_double_width(self, pad_char):
@@ -1456,20 +1718,24 @@ class StringList(ViewList):
             east_asian_width = unicodedata.east_asian_width
         else:
             return                      # new in Python 2.4
-        for i in range(len(self.data)):
-            line = self.data[i]
+        self._own_lines()
+        data = self._lines
+        for i in range(len(data)):
+            line = data[i]
             if isinstance(line, unicode):
                 new = []
                 for char in line:
                     new.append(char)
                     if east_asian_width(char) in 'WF': # 'W'ide & 'F'ull-width
                         new.append(pad_char)
-                self.data[i] = ''.join(new)
+                data[i] = ''.join(new)
 
     def replace(self, old, new):
         """Replace all occurrences of substring `old` with `new`."""
-        for i in range(len(self.data)):
-            self.data[i] = self.data[i].replace(old, new)
+        self._own_lines()
+        data = self._lines
+        for i in range(len(data)):
+            data[i] = data[i].replace(old, new)
 
 
 class StateMachineError(Exception): pass
@@ -24,6 +24,8 @@ choose to perform on the parsed document.
 __docformat__ = 'reStructuredText'
 
 
+import time
+
 from docutils import languages, ApplicationError, TransformSpec
 
 
@@ -93,6 +95,11 @@ class Transformer(TransformSpec):
         """Internal serial number to keep track of the add order of
         transforms."""
 
+        self.timings = None
+        """If not None, a list receiving a ``(transform class name,
+        priority, seconds)`` tuple for each transform applied (see
+        `docutils.core.Publisher.publish_timed()`)."""
+
     def add_transform(self, transform_class, priority=None, **kwargs):
         """
         Store a single transform.  Use `priority` to override the default.
@@ -160,13 +167,31 @@ class Transformer(TransformSpec):
         """Apply all of the stored transforms, in priority order."""
         self.document.reporter.attach_observer(
             self.document.note_transform_message)
-        while self.transforms:
-            if not self.sorted:
-                # Unsorted initially, and whenever a transform is added.
-                self.transforms.sort()
-                self.transforms.reverse()
-                self.sorted = 1
-            priority, transform_class, pending, kwargs = self.transforms.pop()
-            transform = transform_class(self.document, startnode=pending)
-            transform.apply(**kwargs)
-            self.applied.append((priority, transform_class, pending, kwargs))
+        # Most transforms search the document for nodes of a given class:
+        class_index = getattr(self.document.settings, 'class_index', None)
+        if class_index:
+            self.document.enable_class_index()
+        try:
+            while self.transforms:
+                if not self.sorted:
+                    # Unsorted initially, and whenever a transform is added.
+                    self.transforms.sort()
+                    self.transforms.reverse()
+                    self.sorted = 1
+                (priority, transform_class, pending,
+                 kwargs) = self.transforms.pop()
+                transform = transform_class(self.document, startnode=pending)
+                if self.timings is None:
+                    transform.apply(**kwargs)
+                else:
+                    start = time.time()
+                    transform.apply(**kwargs)
+                    self.timings.append(
+                        ('%s.%s' % (transform_class.__module__,
+                                    transform_class.__name__),
+                         int(priority[:3]), time.time() - start))
+                self.applied.append((priority, transform_class, pending,
+                                     kwargs))
+        finally:
+            if class_index:
+                self.document.disable_class_index()
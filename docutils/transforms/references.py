@@ -40,7 +40,7 @@ class PropagateTargets(Transform):
     default_priority = 260
 
     def apply(self):
-        for target in self.document.traverse(nodes.target):
+        for target in self.document.findall(nodes.target):
             # Only block-level targets without reference (like ".. target:"):
             if (isinstance(target.parent, nodes.TextElement) or
                 (target.hasattr('refid') or target.hasattr('refuri') or
@@ -114,10 +114,10 @@ class AnonymousHyperlinks(Transform):
     def apply(self):
         anonymous_refs = []
         anonymous_targets = []
-        for node in self.document.traverse(nodes.reference):
+        for node in self.document.findall(nodes.reference):
             if node.get('anonymous'):
                 anonymous_refs.append(node)
-        for node in self.document.traverse(nodes.target):
+        for node in self.document.findall(nodes.target):
             if node.get('anonymous'):
                 anonymous_targets.append(node)
         if len(anonymous_refs) \
@@ -350,7 +350,7 @@ class ExternalTargets(Transform):
     default_priority = 640
 
     def apply(self):
-        for target in self.document.traverse(nodes.target):
+        for target in self.document.findall(nodes.target):
             if target.hasattr('refuri'):
                 refuri = target['refuri']
                 for name in target['names']:
@@ -370,7 +370,7 @@ class InternalTargets(Transform):
     default_priority = 660
 
     def apply(self):
-        for target in self.document.traverse(nodes.target):
+        for target in self.document.findall(nodes.target):
             if not target.hasattr('refuri') and not target.hasattr('refid'):
                 self.resolve_reference_ids(target)
 
@@ -703,7 +703,7 @@ class Substitutions(Transform):
                 subdef_copy = subdef.deepcopy()
                 try:
                     # Take care of nested substitution references:
-                    for nested_ref in subdef_copy.traverse(
+                    for nested_ref in subdef_copy.findall(
                           nodes.substitution_reference):
                         nested_name = normed[nested_ref['refname'].lower()]
                         if nested_name in nested.setdefault(nested_name, []):
@@ -764,6 +764,12 @@ class TargetNotes(Transform):
 
         self.classes = startnode.details.get('class', [])
 
+        self.insertions = {}
+        """Footnote references to insert, collected by
+        `make_target_footnote()` and inserted by `apply()` in a single pass
+        per parent: a mapping of parent node id to the parent and a
+        mapping of reference id to ``[reference] + new nodes``."""
+
     def apply(self):
         notes = {}
         nodelist = []
@@ -792,6 +798,10 @@ class TargetNotes(Transform):
                 if ref['refuri'] not in notes:
                     notes[ref['refuri']] = footnote
                     nodelist.append(footnote)
+        for parent, insertions in self.insertions.values():
+            parent.replace_children([(new[0], new)
+                                     for new in insertions.values()])
+        self.insertions = {}
         self.startnode.replace_self(nodelist)
 
     def make_target_footnote(self, refuri, refs, notes):
@@ -819,14 +829,16 @@ class TargetNotes(Transform):
             refnode['classes'] += self.classes
             self.document.note_autofootnote_ref(refnode)
             self.document.note_footnote_ref(refnode)
-            index = ref.parent.index(ref) + 1
             reflist = [refnode]
             if not utils.get_trim_footnote_ref_space(self.document.settings):
                 if self.classes:
                     reflist.insert(0, nodes.inline(text=' ', Classes=self.classes))
                 else:
                     reflist.insert(0, nodes.Text(' '))
-            ref.parent.insert(index, reflist)
+            # Insert `reflist` after `ref` (see `apply()`):
+            parent, insertions = self.insertions.setdefault(
+                id(ref.parent), (ref.parent, {}))
+            insertions.setdefault(id(ref), [ref])[1:1] = reflist
         return footnote
 
 
@@ -846,7 +858,7 @@ class DanglingReferences(Transform):
         self.document.walk(visitor)
         # *After* resolving all references, check for unreferenced
         # targets:
-        for target in self.document.traverse(nodes.target):
+        for target in self.document.findall(nodes.target):
             if not target.referenced:
                 if target.get('anonymous'):
                     # If we have unreferenced anonymous targets, there
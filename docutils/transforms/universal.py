@@ -98,7 +98,7 @@ class ExposeInternals(Transform):
 
     def apply(self):
         if self.document.settings.expose_internals:
-            for node in self.document.traverse(self.not_Text):
+            for node in self.document.findall(self.not_Text):
                 for att in self.document.settings.expose_internals:
                     value = getattr(node, att, None)
                     if value is not None:
@@ -249,6 +249,28 @@ class SmartQuotes(Transform):
             yield (nodetype, txtnode.astext())
 
 
+    def get_quotes_tag(self, lang, alternative, quotes, node):
+        """
+        Return the tag of the quotes to use for language `lang`.
+
+        Use the alternative form if `alternative` is true and drop
+        unsupported subtags.  Warn and return '' (ASCII quotes) if there
+        are no `quotes` for the language.
+        """
+        if alternative:
+            if '-x-altquot' in lang:
+                lang = lang.replace('-x-altquot', '')
+            else:
+                lang += '-x-altquot'
+        for tag in utils.normalize_language_tag(lang):
+            if tag in quotes:
+                return tag
+        if lang not in self.unsupported_languages:
+            self.document.reporter.warning('No smart quotes '
+                'defined for language "%s".'%lang, base_node=node)
+        self.unsupported_languages.add(lang)
+        return ''
+
     def apply(self):
         smart_quotes = self.document.settings.smart_quotes
         if not smart_quotes:
@@ -260,52 +282,62 @@ class SmartQuotes(Transform):
         # print repr(alternative)
 
         document_language = self.document.settings.language_code
+        # quote characters, with the document's "smartquotes_locales":
+        quotes = smartquotes.smartchars.quotes
         lc_smartquotes = self.document.settings.smartquotes_locales
         if lc_smartquotes:
-            smartquotes.smartchars.quotes.update(dict(lc_smartquotes))
+            quotes = quotes.copy()
+            quotes.update(dict(lc_smartquotes))
 
         # "Educate" quotes in normal text. Handle each block of text
-        # (TextElement node) as a unit to keep context around inline nodes:
-        for node in self.document.traverse(nodes.TextElement):
-            # skip preformatted text blocks and special elements:
-            if isinstance(node, self.nodes_to_skip):
+        # (TextElement node) as a unit to keep context around inline nodes.
+        # Walk the tree once, passing the language down to the blocks:
+        languages = {} # cache: language tag -> supported quotes tag
+        stack = [(self.document, document_language)]
+        while stack:
+            node, lang = stack.pop()
+            for cls in node['classes']:
+                if cls.startswith('language-'):
+                    lang = cls[9:]
+                    break
+            if not isinstance(node, nodes.TextElement):
+                stack.extend([(child, lang)
+                              for child in reversed(node.children)
+                              if isinstance(child, nodes.Element)])
                 continue
-            # nested TextElements are not "block-level" elements:
-            if isinstance(node.parent, nodes.TextElement):
+            # skip preformatted text blocks and special elements
+            # (nested TextElements are not "block-level" elements):
+            if isinstance(node, self.nodes_to_skip):
                 continue
 
             # list of text nodes in the "text block":
-            txtnodes = [txtnode for txtnode in node.traverse(nodes.Text)
+            txtnodes = [txtnode for txtnode in node.findall(nodes.Text)
                         if not isinstance(txtnode.parent,
                                           nodes.option_string)]
-
-            # language: use typographical quotes for language "lang"
-            lang = node.get_language_code(document_language)
-            # use alternative form if `smart-quotes` setting starts with "alt":
-            if alternative:
-                if '-x-altquot' in lang:
-                    lang = lang.replace('-x-altquot', '')
-                else:
-                    lang += '-x-altquot'
-            # drop unsupported subtags:
-            for tag in utils.normalize_language_tag(lang):
-                if tag in smartquotes.smartchars.quotes:
-                    lang = tag
+            # cheap prescan: skip blocks without characters to educate
+            tokens = list(self.get_tokens(txtnodes))
+            for texttype, text in tokens:
+                if (texttype == 'plain'
+                    and smartquotes.educatable.search(text)):
                     break
-            else: # language not supported: (keep ASCII quotes)
-                if lang not in self.unsupported_languages:
-                    self.document.reporter.warning('No smart quotes '
-                        'defined for language "%s".'%lang, base_node=node)
-                self.unsupported_languages.add(lang)
-                lang = ''
+            else:
+                continue
+
+            try:
+                tag = languages[lang]
+            except KeyError:
+                tag = languages[lang] = self.get_quotes_tag(lang, alternative,
+                                                            quotes, node)
 
             # Iterator educating quotes in plain text:
             # (see "utils/smartquotes.py" for the attribute setting)
-            teacher = smartquotes.educate_tokens(self.get_tokens(txtnodes),
-                                attr=self.smartquotes_action, language=lang)
+            teacher = smartquotes.educate_tokens(tokens,
+                                attr=self.smartquotes_action, language=tag,
+                                quotes=quotes)
 
             for txtnode, newtext in zip(txtnodes, teacher):
-                txtnode.parent.replace(txtnode, nodes.Text(newtext, 
-                                       rawsource=txtnode.rawsource))
+                if newtext != txtnode:
+                    txtnode.parent.replace(txtnode, nodes.Text(newtext,
+                                           rawsource=txtnode.rawsource))
 
         self.unsupported_languages = set() # reset
@@ -124,6 +124,11 @@ class Reporter:
         self.max_level = -1
         """The highest level system message generated so far."""
 
+        self.suppressed = 0
+        """The number of calls of `debug()` and `trace()` discarded because
+        `self.debug_flag` is false.  Calls skipped by the caller (see
+        `trace()`) are not counted."""
+
     def set_conditions(self, category, report_level, halt_level,
                        stream=None, debug=False):
         warnings.warn('docutils.utils.Reporter.set_conditions deprecated; '
@@ -205,6 +210,24 @@ class Reporter:
         """
         if self.debug_flag:
             return self.system_message(self.DEBUG_LEVEL, *args, **kwargs)
+        self.suppressed += 1
+
+    def trace(self, message, *args, **kwargs):
+        """
+        Level-0, "DEBUG" message with deferred formatting: `message` is
+        interpolated with `args` (``message % args``) only if debug
+        messages are enabled.  Keyword arguments are passed on to
+        `system_message()`.
+
+        Code running once per node should test `self.debug_flag` before
+        calling this method (e.g. `nodes.Node.walk()`); these messages are
+        not counted in `self.suppressed`.
+        """
+        if self.debug_flag:
+            if args:
+                message = message % args
+            return self.system_message(self.DEBUG_LEVEL, message, **kwargs)
+        self.suppressed += 1
 
     def info(self, *args, **kwargs):
         """
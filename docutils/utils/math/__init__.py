@@ -22,6 +22,13 @@ It contains various modules for conversion between different math formats
 :tex2mathml_extern: Wrapper for TeX -> MathML command line converters
 """
 
+import os
+import threading
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
 # helpers for Docutils math support
 # =================================
 
@@ -46,3 +53,133 @@ def pick_math_environment(code, numbered=False):
     if not numbered:
         env += '*'
     return env
+
+
+class MathCache(object):
+    """Bounded cache of converted math, optionally stored in a file.
+
+    Keys are tuples (output format, options, math environment, LaTeX code),
+    values the converted formula.  When the cache holds more than
+    `maxsize` entries, it is reduced to the 3/4 most recently used.
+    With a `path`, the entries are loaded from the file and `save()`
+    writes them back (the file is shared by all processes using it;
+    the last writer wins).
+    """
+
+    version = 1
+    """Format version of the cache file."""
+
+    def __init__(self, maxsize=1000, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self.entries = {}
+        """Cached values: {key: [last use, value]}."""
+        self.clock = 0
+        """Counter of cache accesses (the "time" of the last use)."""
+        self.hits = 0
+        self.misses = 0
+        self.changed = False
+        """Entries were added since loading or saving the cache file."""
+        self.lock = threading.Lock()
+        if path:
+            self.load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, default=None):
+        """Return the value for `key` (or `default`) and count hit/miss."""
+        self.lock.acquire()
+        try:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self.clock += 1
+            entry[0] = self.clock
+            return entry[1]
+        finally:
+            self.lock.release()
+
+    def __setitem__(self, key, value):
+        self.lock.acquire()
+        try:
+            self.clock += 1
+            self.entries[key] = [self.clock, value]
+            self.changed = True
+            if len(self.entries) > self.maxsize:
+                self.evict()
+        finally:
+            self.lock.release()
+
+    def evict(self):
+        """Keep the 3/4 `maxsize` most recently used entries."""
+        keep = max(self.maxsize - self.maxsize // 4, 0)
+        used = sorted([(entry[0], key)
+                       for key, entry in self.entries.items()])
+        for clock, key in used[:len(used) - keep]:
+            del self.entries[key]
+
+    def load(self):
+        """Read the entries from the cache file, if it exists and is valid."""
+        try:
+            cachefile = open(self.path, 'rb')
+        except IOError:
+            return
+        try:
+            try:
+                version, entries = pickle.load(cachefile)
+            except Exception:
+                return
+        finally:
+            cachefile.close()
+        if version != self.version:
+            return
+        self.entries = entries
+        self.clock = max([entry[0] for entry in entries.values()] + [0])
+        if len(self.entries) > self.maxsize:
+            self.evict()
+
+    def save(self):
+        """Write the entries to the cache file (if there are new ones)."""
+        if not (self.path and self.changed):
+            return
+        self.lock.acquire()
+        try:
+            # write to a temporary file first, readers never see a
+            # partially written cache:
+            tmppath = '%s.%d.tmp' % (self.path, os.getpid())
+            cachefile = open(tmppath, 'wb')
+            try:
+                pickle.dump((self.version, self.entries), cachefile,
+                            pickle.HIGHEST_PROTOCOL)
+            finally:
+                cachefile.close()
+            try:
+                os.rename(tmppath, self.path)
+            except OSError: # Windows: target exists
+                os.remove(self.path)
+                os.rename(tmppath, self.path)
+            self.changed = False
+        finally:
+            self.lock.release()
+
+
+_math_caches = {}
+
+def get_math_cache(maxsize=1000, path=None):
+    """Return the process-wide `MathCache` for `path`.
+
+    Documents converted in one process (e.g. by ``buildhtml.py``) share
+    the cache.  `maxsize` updates the size limit of an existing cache.
+    """
+    try:
+        cache = _math_caches[path]
+    except KeyError:
+        cache = _math_caches[path] = MathCache(maxsize, path)
+    cache.maxsize = maxsize
+    return cache
@@ -5346,13 +5346,24 @@ FormulaCommand.types += [
 
 
 
-def math2html(formula):
-  "Convert some TeX math to HTML."
-  factory = FormulaFactory()
-  whole = factory.parseformula(formula)
-  FormulaProcessor().process(whole)
-  whole.process()
-  return ''.join(whole.gethtml())
+import threading
+
+conversion_lock = threading.Lock()
+"The conversion uses global state (e.g. the display mode): one at a time."
+
+def math2html(formula, displaymode=None):
+  "Convert some TeX math to HTML, optionally setting the display mode."
+  conversion_lock.acquire()
+  try:
+    if displaymode is not None:
+      DocumentParameters.displaymode = displaymode
+    factory = FormulaFactory()
+    whole = factory.parseformula(formula)
+    FormulaProcessor().process(whole)
+    whole.process()
+    return ''.join(whole.gethtml())
+  finally:
+    conversion_lock.release()
 
 def main():
   "Main function, called if invoked from elyxer.the command line"
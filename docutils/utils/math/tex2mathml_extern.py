@@ -15,6 +15,7 @@
 # Wrappers for TeX->MathML conversion by external tools
 # =====================================================
 
+import re
 import subprocess
 
 document_template = r"""\documentclass{article}
@@ -24,34 +25,53 @@ document_template = r"""\documentclass{article}
 \end{document}
 """
 
+# Commands (can be replaced, e.g. with a stand-in for tests):
+latexml_command = ['latexml',
+                   '-', # read from stdin
+                   # '--preload=amsmath',
+                   '--inputencoding=utf8',
+                  ]
+latexmlpost_command = ['latexmlpost',
+                       '-',
+                       '--nonumbersections',
+                       '--format=xhtml',
+                       # '--linelength=78', # experimental
+                       '--'
+                      ]
+ttm_command = ['ttm',
+               # '-i', # italic font for equations. Default roman.
+               '-u', # unicode character encoding. (Default iso-8859-1).
+               '-r', # output raw MathML (no preamble or  postlude)
+              ]
+
 def latexml(math_code, reporter=None):
     """Convert LaTeX math code to MathML with LaTeXML_
     
     .. _LaTeXML: http://dlmf.nist.gov/LaTeXML/
     """
-    p = subprocess.Popen(['latexml',
-                             '-', # read from stdin
-                             # '--preload=amsmath',
-                             '--inputencoding=utf8',
-                            ],
+    result = latexml_document(document_template % math_code, reporter)
+    # extract MathML code:
+    start,end = result.find('<math'), result.find('</math>')+7
+    result = result[start:end]
+    if 'class="ltx_ERROR' in result:
+        raise SyntaxError(result)
+    return result
+
+def latexml_document(document, reporter=None):
+    """Convert the LaTeX `document` to XHTML with LaTeXML."""
+    p = subprocess.Popen(latexml_command,
                             stdin=subprocess.PIPE,
                             stdout=subprocess.PIPE,
                             stderr=subprocess.PIPE,
                             close_fds=True)
-    p.stdin.write((document_template % math_code).encode('utf8'))
+    p.stdin.write(document.encode('utf8'))
     p.stdin.close()
     latexml_code = p.stdout.read()
     latexml_err = p.stderr.read().decode('utf8')
-    if reporter and latexml_err.find('Error') >= 0 or not latexml_code:
+    if reporter and (latexml_err.find('Error') >= 0 or not latexml_code):
         reporter.error(latexml_err)
 
-    post_p = subprocess.Popen(['latexmlpost',
-                               '-',
-                               '--nonumbersections',
-                               '--format=xhtml',
-                               # '--linelength=78', # experimental
-                               '--'
-                              ],
+    post_p = subprocess.Popen(latexmlpost_command,
                               stdin=subprocess.PIPE,
                               stdout=subprocess.PIPE,
                               stderr=subprocess.PIPE,
@@ -60,14 +80,8 @@ def latexml(math_code, reporter=None):
     post_p.stdin.close()
     result = post_p.stdout.read().decode('utf8')
     post_p_err = post_p.stderr.read().decode('utf8')
-    if reporter and post_p_err.find('Error') >= 0 or not result:
+    if reporter and (post_p_err.find('Error') >= 0 or not result):
         reporter.error(post_p_err)
-    
-    # extract MathML code:
-    start,end = result.find('<math'), result.find('</math>')+7
-    result = result[start:end]
-    if 'class="ltx_ERROR' in result:
-        raise SyntaxError(result)
     return result
 
 def ttm(math_code, reporter=None):
@@ -75,27 +89,28 @@ def ttm(math_code, reporter=None):
     
     .. _TtM: http://hutchinson.belmont.ma.us/tth/mml/
     """
-    p = subprocess.Popen(['ttm',
-                          # '-i', # italic font for equations. Default roman.
-                          '-u', # unicode character encoding. (Default iso-8859-1).
-                          '-r', # output raw MathML (no preamble or  postlude)
-                         ],
+    result = ttm_document(document_template % math_code, reporter)
+    start,end = result.find('<math'), result.find('</math>')+7
+    result = result[start:end]
+    return result
+
+def ttm_document(document, reporter=None):
+    """Convert the LaTeX `document` to MathML with TtM."""
+    p = subprocess.Popen(ttm_command,
                          stdin=subprocess.PIPE,
                          stdout=subprocess.PIPE,
                          stderr=subprocess.PIPE,
                          close_fds=True)
-    p.stdin.write((document_template % math_code).encode('utf8'))
+    p.stdin.write(document.encode('utf8'))
     p.stdin.close()
-    result = p.stdout.read()
+    result = p.stdout.read().decode('utf8')
     err = p.stderr.read().decode('utf8')
     if err.find('**** Unknown') >= 0:
         msg = '\n'.join([line for line in err.splitlines()
                          if line.startswith('****')])
         raise SyntaxError('\nMessage from external converter TtM:\n'+ msg)
-    if reporter and err.find('**** Error') >= 0 or not result:
+    if reporter and (err.find('**** Error') >= 0 or not result):
         reporter.error(err)
-    start,end = result.find('<math'), result.find('</math>')+7
-    result = result[start:end]
     return result
 
 def blahtexml(math_code, inline=True, reporter=None):
@@ -138,6 +153,53 @@ def blahtexml(math_code, inline=True, reporter=None):
               '%s</math>\n') % (mathmode_arg, result[start:end])
     return result
 
+# Batch conversion
+# ----------------
+#
+# Converting all formulas of a document in one call saves starting the
+# external converter (LaTeXML: two processes) once per formula.
+
+def math_elements(result):
+    """Return the list of MathML <math> elements in `result`."""
+    return re.findall(r'<math\b.*?</math>', result, re.DOTALL)
+
+def convert_batch(convert_document, math_codes, error_marker=None):
+    """Convert the LaTeX math codes in `math_codes` in one document.
+
+    Return a list with the MathML code for every item of `math_codes`
+    (None for formulas with `error_marker` in the result), or None
+    if the conversion fails or the results cannot be matched to the
+    formulas (e.g. a formula converted to several <math> elements).
+    Formulas should then be converted one by one to get messages for
+    the individual formulas.
+    """
+    try:
+        result = convert_document(document_template
+                                  % '\n\n'.join(math_codes))
+    except (OSError, SyntaxError):
+        return None
+    results = math_elements(result)
+    if len(results) != len(math_codes):
+        return None
+    if error_marker:
+        results = [(result, None)[error_marker in result]
+                   for result in results]
+    return results
+
+def latexml_batch(math_codes):
+    """Convert a list of LaTeX math codes with one run of LaTeXML."""
+    return convert_batch(latexml_document, math_codes,
+                         error_marker='class="ltx_ERROR')
+
+def ttm_batch(math_codes):
+    """Convert a list of LaTeX math codes with one run of TtM."""
+    return convert_batch(ttm_document, math_codes)
+
+batch_converters = {'latexml': latexml_batch, 'ttm': ttm_batch}
+"""Batch conversion functions by converter name.
+
+blahtexml converts one formula per run and has no batch mode."""
+
 # self-test
 
 if __name__ == "__main__":
@@ -491,14 +491,136 @@ class smartchars(object):
               'zh-tw':        u'「」『』',
              }
 
-    def __init__(self, language='en'):
+    def __init__(self, language='en', quotes=None):
+        """
+        Look up the quote characters for `language` in `quotes`, a
+        mapping of language tags to quote characters (default:
+        `self.quotes`).
+        """
         self.language = language
+        if quotes is None:
+            quotes = self.quotes
         try:
             (self.opquote, self.cpquote,
-             self.osquote, self.csquote) = self.quotes[language.lower()]
+             self.osquote, self.csquote) = quotes[language.lower()]
         except KeyError:
             self.opquote, self.cpquote, self.osquote, self.csquote = u'""\'\''
 
+    _quote_rules = {}
+    # Compiled `educateQuotes()` rules, see `quote_rules()`.
+
+    def quote_rules(self):
+        """
+        Return the rules for `educateQuotes()`: a list of
+        ``(compiled regexp, replacement)`` pairs, applied in order.
+
+        The rules only depend on the quote characters (and on whether
+        the language is English), they are compiled once and cached.
+        """
+        english = self.language.startswith('en')
+        key = (self.opquote, self.cpquote, self.osquote, self.csquote,
+               english)
+        try:
+            return self._quote_rules[key]
+        except KeyError:
+            pass
+        rules = []
+        def rule(pattern, replacement, flags=0):
+            rules.append((re.compile(pattern, flags), replacement))
+
+        punct_class = r"""[!"#\$\%'()*+,-.\/:;<=>?\@\[\\\]\^_`{|}~]"""
+
+        # Special case if the very first character is a quote
+        # followed by punctuation at a non-word-break.
+        # Close the quotes by brute force:
+        rule(r"""^'(?=%s\\B)""" % (punct_class,), self.csquote)
+        rule(r"""^"(?=%s\\B)""" % (punct_class,), self.cpquote)
+
+        # Special case for double sets of quotes, e.g.:
+        #   <p>He said, "'Quoted' words in a larger quote."</p>
+        rule(r""""'(?=\w)""", self.opquote+self.osquote)
+        rule(r"""'"(?=\w)""", self.osquote+self.opquote)
+
+        # Special case for decade abbreviations (the '80s):
+        if english: # TODO similar cases in other languages?
+            rule(r"""'(?=\d{2}s)""", self.apostrophe, re.UNICODE)
+
+        close_class = r"""[^\ \t\r\n\[\{\(\-]"""
+        dec_dashes = r"""&#8211;|&#8212;"""
+
+        # Get most opening single quotes:
+        rule(r"""
+                (
+                        \s          |   # a whitespace char, or
+                        &nbsp;      |   # a non-breaking space entity, or
+                        --          |   # dashes, or
+                        &[mn]dash;  |   # named dash entities
+                        %s          |   # or decimal entities
+                        &\#x201[34];    # or hex
+                )
+                '                 # the quote
+                (?=\w)            # followed by a word character
+                """ % (dec_dashes,), r'\1'+self.osquote,
+             re.VERBOSE | re.UNICODE)
+
+        # In many locales, single closing quotes are different from apostrophe:
+        if self.csquote != self.apostrophe:
+            rule(r"(?<=(\w|\d))'(?=\w)", self.apostrophe, re.UNICODE)
+        # TODO: keep track of quoting level to recognize apostrophe in, e.g.,
+        # "Ich fass' es nicht."
+
+        rule(r"""
+                (%s)
+                '
+                (?!\s  |       # whitespace
+                   s\b |
+                    \d         # digits   ('80s)
+                )
+                """ % (close_class,), r'\1'+self.csquote,
+             re.VERBOSE | re.UNICODE)
+
+        rule(r"""
+                (%s)
+                '
+                (\s | s\b)
+                """ % (close_class,), r'\1%s\2' % self.csquote,
+             re.VERBOSE | re.UNICODE)
+
+        # Any remaining single quotes should be opening ones:
+        rule(r"""'""", self.osquote)
+
+        # Get most opening double quotes:
+        rule(r"""
+                (
+                        \s          |   # a whitespace char, or
+                        &nbsp;      |   # a non-breaking space entity, or
+                        --          |   # dashes, or
+                        &[mn]dash;  |   # named dash entities
+                        %s          |   # or decimal entities
+                        &\#x201[34];    # or hex
+                )
+                "                 # the quote
+                (?=\w)            # followed by a word character
+                """ % (dec_dashes,), r'\1'+self.opquote, re.VERBOSE)
+
+        # Double closing quotes:
+        rule(r"""
+                #(%s)?   # character that indicates the quote should be closing
+                "
+                (?=\s)
+                """ % (close_class,), self.cpquote, re.VERBOSE)
+
+        rule(r"""
+                (%s)   # character that indicates the quote should be closing
+                "
+                """ % (close_class,), r'\1'+self.cpquote, re.VERBOSE)
+
+        # Any remaining quotes should be opening ones.
+        rule(r'"', self.opquote)
+
+        self._quote_rules[key] = rules
+        return rules
+
 
 def smartyPants(text, attr=default_smartypants_attr, language='en'):
     """Main function for "traditional" use."""
@@ -507,8 +629,18 @@ def smartyPants(text, attr=default_smartypants_attr, language='en'):
                                               attr, language)])
 
 
-def educate_tokens(text_tokens, attr=default_smartypants_attr, language='en'):
+educatable = re.compile(r"""[\\"'`&]|--|\.\.\.|\. \. \.""")
+"""Matches text that `educate_tokens()` may change (except in "stupefy"
+mode): quotes, backticks, dashes, ellipses, backslash escapes and
+character entities."""
+
+
+def educate_tokens(text_tokens, attr=default_smartypants_attr, language='en',
+                   quotes=None):
     """Return iterator that "educates" the items of `text_tokens`.
+
+    `quotes` is an optional mapping of language tags to quote characters
+    replacing `smartchars.quotes` (see `smartchars.__init__()`).
     """
 
     # Parse attributes:
@@ -581,6 +713,12 @@ def educate_tokens(text_tokens, attr=default_smartypants_attr, language='en'):
             yield text
             continue
 
+        # skip text without characters to educate (cheap prescan):
+        if not do_stupefy and not educatable.search(text):
+            prev_token_last_char = text[-1:]
+            yield text
+            continue
+
         last_char = text[-1:] # Remember last char before processing.
 
         text = processEscapes(text)
@@ -600,19 +738,19 @@ def educate_tokens(text_tokens, attr=default_smartypants_attr, language='en'):
 
         # Note: backticks need to be processed before quotes.
         if do_backticks:
-            text = educateBackticks(text, language)
+            text = educateBackticks(text, language, quotes)
 
         if do_backticks == 2:
-            text = educateSingleBackticks(text, language)
+            text = educateSingleBackticks(text, language, quotes)
 
         if do_quotes:
             # Replace plain quotes in context to prevent converstion to
             # 2-character sequence in French.
             context = prev_token_last_char.replace('"',';').replace("'",';')
-            text = educateQuotes(context+text, language)[1:]
+            text = educateQuotes(context+text, language, quotes)[1:]
 
         if do_stupefy:
-            text = stupefyEntities(text, language)
+            text = stupefyEntities(text, language, quotes)
 
         # Remember last char as context for the next token
         prev_token_last_char = last_char
@@ -623,117 +761,25 @@ def educate_tokens(text_tokens, attr=default_smartypants_attr, language='en'):
 
 
 
-def educateQuotes(text, language='en'):
+def educateQuotes(text, language='en', quotes=None):
     """
     Parameter:  - text string (unicode or bytes).
                 - language (`BCP 47` language tag.)
+                - quotes (optional mapping of language tags to quote
+                  characters, see `smartchars.__init__()`.)
     Returns:    The `text`, with "educated" curly quote characters.
 
     Example input:  "Isn't this fun?"
     Example output: “Isn’t this fun?“;
     """
 
-    smart = smartchars(language)
-
-    # oldtext = text
-    punct_class = r"""[!"#\$\%'()*+,-.\/:;<=>?\@\[\\\]\^_`{|}~]"""
-
-    # Special case if the very first character is a quote
-    # followed by punctuation at a non-word-break.
-    # Close the quotes by brute force:
-    text = re.sub(r"""^'(?=%s\\B)""" % (punct_class,), smart.csquote, text)
-    text = re.sub(r"""^"(?=%s\\B)""" % (punct_class,), smart.cpquote, text)
-
-    # Special case for double sets of quotes, e.g.:
-    #   <p>He said, "'Quoted' words in a larger quote."</p>
-    text = re.sub(r""""'(?=\w)""", smart.opquote+smart.osquote, text)
-    text = re.sub(r"""'"(?=\w)""", smart.osquote+smart.opquote, text)
-
-    # Special case for decade abbreviations (the '80s):
-    if language.startswith('en'): # TODO similar cases in other languages?
-        text = re.sub(r"""'(?=\d{2}s)""", smart.apostrophe, text, re.UNICODE)
-
-    close_class = r"""[^\ \t\r\n\[\{\(\-]"""
-    dec_dashes = r"""&#8211;|&#8212;"""
-
-    # Get most opening single quotes:
-    opening_single_quotes_regex = re.compile(r"""
-                    (
-                            \s          |   # a whitespace char, or
-                            &nbsp;      |   # a non-breaking space entity, or
-                            --          |   # dashes, or
-                            &[mn]dash;  |   # named dash entities
-                            %s          |   # or decimal entities
-                            &\#x201[34];    # or hex
-                    )
-                    '                 # the quote
-                    (?=\w)            # followed by a word character
-                    """ % (dec_dashes,), re.VERBOSE | re.UNICODE)
-    text = opening_single_quotes_regex.sub(r'\1'+smart.osquote, text)
-
-    # In many locales, single closing quotes are different from apostrophe:
-    if smart.csquote != smart.apostrophe:
-        apostrophe_regex = re.compile(r"(?<=(\w|\d))'(?=\w)", re.UNICODE)
-        text = apostrophe_regex.sub(smart.apostrophe, text)
-    # TODO: keep track of quoting level to recognize apostrophe in, e.g.,
-    # "Ich fass' es nicht."
-
-    closing_single_quotes_regex = re.compile(r"""
-                    (%s)
-                    '
-                    (?!\s  |       # whitespace
-                       s\b |
-                        \d         # digits   ('80s)
-                    )
-                    """ % (close_class,), re.VERBOSE | re.UNICODE)
-    text = closing_single_quotes_regex.sub(r'\1'+smart.csquote, text)
-
-    closing_single_quotes_regex = re.compile(r"""
-                    (%s)
-                    '
-                    (\s | s\b)
-                    """ % (close_class,), re.VERBOSE | re.UNICODE)
-    text = closing_single_quotes_regex.sub(r'\1%s\2' % smart.csquote, text)
-
-    # Any remaining single quotes should be opening ones:
-    text = re.sub(r"""'""", smart.osquote, text)
-
-    # Get most opening double quotes:
-    opening_double_quotes_regex = re.compile(r"""
-                    (
-                            \s          |   # a whitespace char, or
-                            &nbsp;      |   # a non-breaking space entity, or
-                            --          |   # dashes, or
-                            &[mn]dash;  |   # named dash entities
-                            %s          |   # or decimal entities
-                            &\#x201[34];    # or hex
-                    )
-                    "                 # the quote
-                    (?=\w)            # followed by a word character
-                    """ % (dec_dashes,), re.VERBOSE)
-    text = opening_double_quotes_regex.sub(r'\1'+smart.opquote, text)
-
-    # Double closing quotes:
-    closing_double_quotes_regex = re.compile(r"""
-                    #(%s)?   # character that indicates the quote should be closing
-                    "
-                    (?=\s)
-                    """ % (close_class,), re.VERBOSE)
-    text = closing_double_quotes_regex.sub(smart.cpquote, text)
-
-    closing_double_quotes_regex = re.compile(r"""
-                    (%s)   # character that indicates the quote should be closing
-                    "
-                    """ % (close_class,), re.VERBOSE)
-    text = closing_double_quotes_regex.sub(r'\1'+smart.cpquote, text)
-
-    # Any remaining quotes should be opening ones.
-    text = re.sub(r'"', smart.opquote, text)
-
+    smart = smartchars(language, quotes)
+    for regexp, replacement in smart.quote_rules():
+        text = regexp.sub(replacement, text)
     return text
 
 
-def educateBackticks(text, language='en'):
+def educateBackticks(text, language='en', quotes=None):
     """
     Parameter:  String (unicode or bytes).
     Returns:    The `text`, with ``backticks'' -style double quotes
@@ -741,14 +787,14 @@ def educateBackticks(text, language='en'):
     Example input:  ``Isn't this fun?''
     Example output: “Isn't this fun?“;
     """
-    smart = smartchars(language)
+    smart = smartchars(language, quotes)
 
-    text = re.sub(r"""``""", smart.opquote, text)
-    text = re.sub(r"""''""", smart.cpquote, text)
+    text = text.replace("``", smart.opquote)
+    text = text.replace("''", smart.cpquote)
     return text
 
 
-def educateSingleBackticks(text, language='en'):
+def educateSingleBackticks(text, language='en', quotes=None):
     """
     Parameter:  String (unicode or bytes).
     Returns:    The `text`, with `backticks' -style single quotes
@@ -757,10 +803,10 @@ def educateSingleBackticks(text, language='en'):
     Example input:  `Isn't this fun?'
     Example output: ‘Isn’t this fun?’
     """
-    smart = smartchars(language)
+    smart = smartchars(language, quotes)
 
-    text = re.sub(r"""`""", smart.osquote, text)
-    text = re.sub(r"""'""", smart.csquote, text)
+    text = text.replace("`", smart.osquote)
+    text = text.replace("'", smart.csquote)
     return text
 
 
@@ -771,8 +817,8 @@ def educateDashes(text):
                 an em-dash character.
     """
 
-    text = re.sub(r"""---""", smartchars.endash, text) # en  (yes, backwards)
-    text = re.sub(r"""--""", smartchars.emdash, text) # em (yes, backwards)
+    text = text.replace("---", smartchars.endash) # en  (yes, backwards)
+    text = text.replace("--", smartchars.emdash) # em (yes, backwards)
     return text
 
 
@@ -784,8 +830,8 @@ def educateDashesOldSchool(text):
                 an em-dash character.
     """
 
-    text = re.sub(r"""---""", smartchars.emdash, text)
-    text = re.sub(r"""--""", smartchars.endash, text)
+    text = text.replace("---", smartchars.emdash)
+    text = text.replace("--", smartchars.endash)
     return text
 
 
@@ -803,8 +849,8 @@ def educateDashesOldSchoolInverted(text):
                 the shortcut should be shorter to type. (Thanks to Aaron
                 Swartz for the idea.)
     """
-    text = re.sub(r"""---""", smartchars.endash, text)    # em
-    text = re.sub(r"""--""", smartchars.emdash, text)    # en
+    text = text.replace("---", smartchars.endash)    # em
+    text = text.replace("--", smartchars.emdash)    # en
     return text
 
 
@@ -819,12 +865,12 @@ def educateEllipses(text):
     Example output: Huh&#8230;?
     """
 
-    text = re.sub(r"""\.\.\.""", smartchars.ellipsis, text)
-    text = re.sub(r"""\. \. \.""", smartchars.ellipsis, text)
+    text = text.replace("...", smartchars.ellipsis)
+    text = text.replace(". . .", smartchars.ellipsis)
     return text
 
 
-def stupefyEntities(text, language='en'):
+def stupefyEntities(text, language='en', quotes=None):
     """
     Parameter:  String (unicode or bytes).
     Returns:    The `text`, with each SmartyPants character translated to
@@ -833,7 +879,7 @@ def stupefyEntities(text, language='en'):
     Example input:  “Hello — world.”
     Example output: "Hello -- world."
     """
-    smart = smartchars(language)
+    smart = smartchars(language, quotes)
 
     text = re.sub(smart.endash, "-", text)  # en-dash
     text = re.sub(smart.emdash, "--", text) # em-dash
@@ -21,6 +21,8 @@ import sys
 import os.path
 import re
 import urllib
+import codecs
+import tempfile
 
 try: # check for the Python Imaging Library
     import PIL.Image
@@ -37,7 +39,8 @@ from docutils import nodes, utils, writers, languages, io
 from docutils.utils.error_reporting import SafeString
 from docutils.transforms import writer_aux
 from docutils.utils.math import (unichar2tex, pick_math_environment,
-                                 math2html, latex2mathml, tex2mathml_extern)
+                                 math2html, latex2mathml, tex2mathml_extern,
+                                 get_math_cache)
 
 
 class Writer(writers.Writer):
@@ -66,12 +69,81 @@ class Writer(writers.Writer):
     def get_transforms(self):
         return writers.Writer.get_transforms(self) + [writer_aux.Admonitions]
 
+    body_stream = None
+    """Temporary file receiving the completed parts of the document body
+    in streaming mode (see `write()`)."""
+
+    def write(self, document, destination):
+        """
+        Translate `document` and write it to `destination`.
+
+        With the "stream_output" setting and a file destination, the
+        translator writes the document body to `self.body_stream` as
+        sections are completed.  The output is then written piecewise;
+        `self.output` and the parts containing the body ("whole", "body",
+        "fragment", "html_body") are not available.
+        """
+        if not (getattr(document.settings, 'stream_output', None)
+                and isinstance(destination, io.FileOutput)
+                and self.can_stream(destination.encoding)):
+            return writers.Writer.write(self, document, destination)
+        self.document = document
+        self.language = languages.get_language(
+            document.settings.language_code, document.reporter)
+        self.destination = destination
+        self.output = None
+        self.body_stream = tempfile.TemporaryFile()
+        try:
+            self.translate()
+            self.write_streamed_output()
+        finally:
+            self.body_stream.close()
+            self.body_stream = None
+        return None
+
+    def can_stream(self, encoding):
+        """Return False for encodings that write a BOM on every call."""
+        try:
+            name = codecs.lookup(encoding or 'utf-8').name
+        except LookupError:
+            return False
+        return name not in ('utf-16', 'utf-32')
+
     def translate(self):
         self.visitor = visitor = self.translator_class(self.document)
+        visitor.body_stream = self.body_stream
         self.document.walkabout(visitor)
+        visitor.save_math_cache()
         for attr in self.visitor_attributes:
             setattr(self, attr, getattr(visitor, attr))
-        self.output = self.apply_template()
+        if self.body_stream is None:
+            self.output = self.apply_template()
+
+    def write_streamed_output(self, blocksize=2**16):
+        """
+        Write the templated output to `self.destination`, replacing the
+        placeholders for the streamed body with the content of
+        `self.body_stream`.
+        """
+        pieces = self.apply_template().split(self.visitor.stream_marker)
+        destination = self.destination
+        autoclose = destination.autoclose
+        destination.autoclose = False
+        try:
+            destination.write(pieces[0])
+            for piece in pieces[1:]:
+                self.body_stream.seek(0)
+                reader = codecs.getreader('utf-8')(self.body_stream)
+                while True:
+                    data = reader.read(blocksize)
+                    if not data:
+                        break
+                    destination.write(data)
+                destination.write(piece)
+        finally:
+            destination.autoclose = autoclose
+            if autoclose:
+                destination.close()
 
     def apply_template(self):
         template_file = open(self.document.settings.template, 'rb')
@@ -93,6 +165,12 @@ class Writer(writers.Writer):
         writers.Writer.assemble_parts(self)
         for part in self.visitor_attributes:
             self.parts[part] = ''.join(getattr(self, part))
+        if self.output is None:
+            # Parts with a streamed body are not available:
+            del self.parts['whole']
+            for part in self.visitor_attributes:
+                if self.visitor.stream_marker in self.parts[part]:
+                    del self.parts[part]
 
 
 class HTMLTranslator(nodes.NodeVisitor):
@@ -197,6 +275,13 @@ class HTMLTranslator(nodes.NodeVisitor):
     """Character references for characters with a special meaning in HTML."""
 
 
+    stream_marker = u'\x00body_stream\x00'
+    """Placeholder for the streamed part of the body (see `flush_body()`)."""
+
+    body_stream = None
+    """File object receiving the completed parts of the document body
+    (UTF-8 encoded), set by the writer in streaming mode."""
+
     def __init__(self, document):
         nodes.NodeVisitor.__init__(self, document)
         self.settings = settings = document.settings
@@ -228,6 +313,14 @@ class HTMLTranslator(nodes.NodeVisitor):
         self.math_output = settings.math_output.split()
         self.math_output_options = self.math_output[1:]
         self.math_output = self.math_output[0].lower()
+        self.math_cache = None
+        """Cache of converted math (see `convert_math()`)."""
+        self.math_batch = {}
+        """Formulas converted in advance (see `convert_math_batch()`)."""
+        math_cache_size = getattr(settings, 'math_cache_size', 0)
+        if math_cache_size:
+            self.math_cache = get_math_cache(math_cache_size,
+                                getattr(settings, 'math_cache', None))
 
         self.context = []
         """Heterogeneous stack.
@@ -262,6 +355,23 @@ class HTMLTranslator(nodes.NodeVisitor):
                        + self.body_pre_docinfo + self.docinfo
                        + self.body + self.body_suffix)
 
+    def flush_body(self):
+        """
+        In streaming mode, write `self.body` to `self.body_stream`.
+
+        The body is replaced by `self.stream_marker` and any trailing
+        newlines (kept back, as the writer strips them at the end of the
+        body).  Only call where no index into `self.body` is pending.
+        """
+        if self.body_stream is None:
+            return
+        text = ''.join(self.body)
+        if text.startswith(self.stream_marker):
+            text = text[len(self.stream_marker):]
+        content = text.rstrip('\n')
+        self.body_stream.write(content.encode('utf-8'))
+        self.body[:] = [self.stream_marker, text[len(content):]]
+
     def encode(self, text):
         """Encode special characters in `text` & return."""
         # Use only named entities known in both XML and HTML
@@ -712,6 +822,7 @@ class HTMLTranslator(nodes.NodeVisitor):
         title = (node.get('title', '') or os.path.basename(node['source'])
                  or 'docutils document without title')
         self.head.append('<title>%s</title>\n' % self.encode(title))
+        self.convert_math_batch(node)
 
     def depart_document(self, node):
         self.head_prefix.extend([self.doctype,
@@ -1083,16 +1194,76 @@ class HTMLTranslator(nodes.NodeVisitor):
                  'latex':       ('pre', 'tt',   'math'),
                 }
 
-    def visit_math(self, node, math_env=''):
-        # If the method is called from visit_math_block(), math_env != ''.
+    def convert_math(self, math_env, converter, math_code, *args, **kwargs):
+        """
+        Return ``converter(math_code, *args, **kwargs)``.
 
-        if self.math_output not in self.math_tags:
-            self.document.reporter.error(
-                'math-output format "%s" not supported '
-                'falling back to "latex"'% self.math_output)
-            self.math_output = 'latex'
-        tag = self.math_tags[self.math_output][math_env == '']
-        clsarg = self.math_tags[self.math_output][2]
+        The result is looked up in `self.math_batch` and in (and stored
+        to) `self.math_cache` (if enabled) with the math output format and
+        options, `math_env`, and `math_code` as key.  Messages reported by
+        the converter are not repeated for cached formulas.
+        """
+        key = (self.math_output, tuple(self.math_output_options),
+               math_env, math_code)
+        result = self.math_batch.get(key)
+        if result is None and self.math_cache is not None:
+            result = self.math_cache.get(key)
+            if result is not None:
+                return result
+        if result is None:
+            result = converter(math_code, *args, **kwargs)
+        if self.math_cache is not None:
+            self.math_cache[key] = result
+        return result
+
+    def convert_math_batch(self, document):
+        """
+        Convert the formulas in `document` in one run of the MathML
+        converter, if it supports this (see
+        `tex2mathml_extern.batch_converters`).
+
+        The results are stored in `self.math_batch` for `convert_math()`.
+        Formulas that fail (result None) are left to `convert_math()`,
+        which reports the errors.
+        """
+        if self.math_output != 'mathml':
+            return
+        converter = ' '.join(self.math_output_options).lower()
+        batch_converter = tex2mathml_extern.batch_converters.get(converter)
+        if batch_converter is None:
+            return
+        keys = []
+        for node in document.traverse(lambda node: isinstance(node,
+                                          (nodes.math, nodes.math_block))):
+            math_env = ''
+            if isinstance(node, nodes.math_block):
+                math_env = pick_math_environment(node.astext())
+            key = (self.math_output, tuple(self.math_output_options),
+                   math_env, self.get_math_code(node, math_env))
+            if key in self.math_batch or (self.math_cache is not None
+                                          and key in self.math_cache):
+                continue
+            self.math_batch[key] = None
+            keys.append(key)
+        if not keys:
+            return
+        results = batch_converter([key[3] for key in keys])
+        if results:
+            self.math_batch.update(zip(keys, results))
+
+    def save_math_cache(self):
+        """Write new entries of `self.math_cache` to the cache file."""
+        if self.math_cache is None:
+            return
+        try:
+            self.math_cache.save()
+        except (IOError, OSError), err:
+            self.document.reporter.warning(
+                u'Cannot write math cache file "%s": %s.'
+                % (self.math_cache.path, SafeString(err.strerror)))
+
+    def get_math_code(self, node, math_env=''):
+        """Return the LaTeX code of `node`, wrapped for the math output."""
         # LaTeX container
         wrappers = {# math_mode: (inline, block)
                     'mathml':  ('$%s$',   u'\\begin{%s}\n%s\n\\end{%s}'),
@@ -1111,6 +1282,19 @@ class HTMLTranslator(nodes.NodeVisitor):
                 math_code = wrapper % (math_env, math_code, math_env)
             except TypeError: # wrapper with one "%s"
                 math_code = wrapper % math_code
+        return math_code
+
+    def visit_math(self, node, math_env=''):
+        # If the method is called from visit_math_block(), math_env != ''.
+
+        if self.math_output not in self.math_tags:
+            self.document.reporter.error(
+                'math-output format "%s" not supported '
+                'falling back to "latex"'% self.math_output)
+            self.math_output = 'latex'
+        tag = self.math_tags[self.math_output][math_env == '']
+        clsarg = self.math_tags[self.math_output][2]
+        math_code = self.get_math_code(node, math_env)
         # settings and conversion
         if self.math_output in ('latex', 'mathjax'):
             math_code = self.encode(math_code)
@@ -1131,8 +1315,9 @@ class HTMLTranslator(nodes.NodeVisitor):
                     utils.find_file_in_dirs(s, self.settings.stylesheet_dirs))
                     for s in self.math_output_options[0].split(',')]
             # TODO: fix display mode in matrices and fractions
-            math2html.DocumentParameters.displaymode = (math_env != '')
-            math_code = math2html.math2html(math_code)
+            math_code = self.convert_math(math_env, math2html.math2html,
+                                          math_code,
+                                          displaymode=(math_env != ''))
         elif self.math_output == 'mathml':
             if  'XHTML 1' in self.doctype:
                 self.doctype = self.doctype_mathml
@@ -1140,18 +1325,22 @@ class HTMLTranslator(nodes.NodeVisitor):
             converter = ' '.join(self.math_output_options).lower()
             try:
                 if converter == 'latexml':
-                    math_code = tex2mathml_extern.latexml(math_code,
-                                                    self.document.reporter)
+                    math_code = self.convert_math(math_env,
+                        tex2mathml_extern.latexml, math_code,
+                        self.document.reporter)
                 elif converter == 'ttm':
-                    math_code = tex2mathml_extern.ttm(math_code,
-                                                    self.document.reporter)
+                    math_code = self.convert_math(math_env,
+                        tex2mathml_extern.ttm, math_code,
+                        self.document.reporter)
                 elif converter == 'blahtexml':
-                    math_code = tex2mathml_extern.blahtexml(math_code,
+                    math_code = self.convert_math(math_env,
+                        tex2mathml_extern.blahtexml, math_code,
                         inline=not(math_env),
                         reporter=self.document.reporter)
                 elif not converter:
-                    math_code = latex2mathml.tex2mathml(math_code,
-                                                        inline=not(math_env))
+                    math_code = self.convert_math(math_env,
+                        latex2mathml.tex2mathml, math_code,
+                        inline=not(math_env))
                 else:
                     self.document.reporter.error('option "%s" not supported '
                     'with math-output "MathML"')
@@ -1356,6 +1545,7 @@ class HTMLTranslator(nodes.NodeVisitor):
     def depart_section(self, node):
         self.section_level -= 1
         self.body.append('</div>\n')
+        self.flush_body()
 
     # TODO: use the new HTML5 element <aside>? (Also for footnote text)
     def visit_sidebar(self, node):
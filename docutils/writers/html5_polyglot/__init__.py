@@ -125,6 +125,16 @@ class Writer(writers._html_base.Writer):
           'Default: "HTML math.css"',
           ['--math-output'],
           {'default': 'HTML math.css'}),
+         ('Maximal number of converted formulas kept in the math cache '
+          '(for math output "HTML" and "MathML"). Use 0 to disable '
+          'the cache. Default: 1000.',
+          ['--math-cache-size'],
+          {'default': 1000, 'metavar': '<n>',
+           'validator': frontend.validate_nonnegative_int}),
+         ('Store the math cache in <file> to reuse converted formulas in '
+          'later runs. Default: None (keep the cache in memory).',
+          ['--math-cache'],
+          {'metavar': '<file>'}),
          ('Prepend an XML declaration. (Thwarts HTML5 conformance.) '
           'Default: False',
           ['--xml-declaration'],
@@ -136,7 +146,15 @@ class Writer(writers._html_base.Writer):
          ('Obfuscate email addresses to confuse harvesters while still '
           'keeping email links usable with standards-compliant browsers.',
           ['--cloak-email-addresses'],
-          {'action': 'store_true', 'validator': frontend.validate_boolean}),))
+          {'action': 'store_true', 'validator': frontend.validate_boolean}),
+         ('Stream the document body to the output file: write completed '
+          'sections to a temporary file instead of keeping them in memory. '
+          'Reduces the memory use for large documents.  Default: disabled.',
+          ['--stream-output'],
+          {'action': 'store_true', 'validator': frontend.validate_boolean}),
+         ('Assemble the complete output in memory (default).',
+          ['--no-stream-output'],
+          {'dest': 'stream_output', 'action': 'store_false'}),))
 
     config_section = 'html5 writer'
 
@@ -196,10 +196,9 @@ class CustomTestCase(StandardTestCase):
         return "<%s %s>" % (self.id, unittest.TestCase.__repr__(self))
 
     def clear_roles(self):
-        # Language-specific roles and roles added by the
-        # "default-role" and "role" directives are currently stored
-        # globally in the roles._roles dictionary.  This workaround
-        # empties that dictionary.
+        # Language-specific roles are cached globally in the
+        # roles._roles dictionary.  This workaround empties that
+        # dictionary.
         roles._roles = {}
 
     def setUp(self):
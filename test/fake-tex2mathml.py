@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# $Id$
+# Copyright: This module is put into the public domain.
+
+"""
+Stand-in for the external TeX -> MathML converters in tests (see
+`docutils.utils.math.tex2mathml_extern`).
+
+Usage: fake-tex2mathml.py [--copy] <log file>
+
+Reads a LaTeX document from stdin and writes a MathML <math> element for
+every formula (``$...$`` or an environment).  A formula containing
+``\\unknown`` is reported like TtM reports unknown commands.  With
+``--copy`` (stand-in for "latexmlpost"), the input is written unchanged.
+Every run appends a line to <log file>.
+"""
+
+import re
+import sys
+
+args = sys.argv[1:]
+log = open(args[-1], 'a')
+log.write(' '.join(args[:-1]) + '\n')
+log.close()
+
+document = sys.stdin.read()
+if '--copy' in args:
+    sys.stdout.write(document)
+    sys.exit()
+if '\\unknown' in document:
+    sys.stderr.write('**** Unknown command \\unknown\n')
+body = document.split('\\begin{document}')[1].split('\\end{document}')[0]
+formulas = re.findall(r'\$(.*?)\$|\\begin\{(.*?)\}(.*?)\\end\{\2\}',
+                      body, re.DOTALL)
+for inline, environment, content in formulas:
+    if environment:
+        sys.stdout.write('<math display="block"><mtext>%s</mtext></math>\n'
+                         % content.strip().replace('<', '&lt;'))
+    else:
+        sys.stdout.write('<math><mtext>%s</mtext></math>\n'
+                         % inline.replace('<', '&lt;'))
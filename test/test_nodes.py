@@ -157,6 +157,40 @@ class ElementTests(unittest.TestCase):
                           {'ids': ['someid']})
         self.assertTrue(element.is_not_default('ids'))
 
+    def test_lazy_list_attributes(self):
+        element = nodes.paragraph(classes=[])
+        # Empty list attributes are not stored ...
+        self.assertEqual(len(element.attributes), 0)
+        self.assertTrue('classes' in element)
+        self.assertTrue('classes' in element.attributes)
+        self.assertEqual(element.get('names'), [])
+        self.assertEqual(element.attributes.pop('names'), [])
+        self.assertEqual(element.attributes.keys(), [])
+        # ... but created on demand:
+        element['classes'].append('spam')
+        self.assertEqual(element.attributes, {'classes': ['spam']})
+        element.get('dupnames').append('ham')
+        self.assertEqual(element['dupnames'], ['ham'])
+        del element['dupnames']
+        element.setdefault('ids').append('eggs')
+        self.assertEqual(element.attlist(),
+                         [('classes', ['spam']), ('ids', ['eggs'])])
+        del element['backrefs']
+        self.assertEqual(element['backrefs'], [])
+
+    def test_slots(self):
+        element = nodes.Element()
+        self.assertFalse(hasattr(element, '__dict__'))
+        self.assertEqual(element.tagname, 'Element')
+        self.assertEqual(element.parent, None)
+        self.assertEqual(element.line, None)
+        self.assertEqual(nodes.paragraph.tagname, 'paragraph')
+        # Subclasses of the standard element classes may set attributes:
+        node = nodes.paragraph()
+        node.tagname = 'p'
+        node.referenced = 1
+        self.assertEqual(node.starttag(), '<p>')
+
     def test_update_basic_atts(self):
         element1 = nodes.Element(ids=['foo', 'bar'], test=['test1'])
         element2 = nodes.Element(ids=['baz', 'qux'], test=['test2'])
@@ -320,6 +354,66 @@ class ElementTests(unittest.TestCase):
         self.assertEqual(child4['ids'], ['child4'])
         self.assertEqual(len(parent), 5)
 
+    def test_index(self):
+        parent = nodes.Element()
+        children = [nodes.Text('same'), nodes.Element(), nodes.Text('same')]
+        parent += children
+        for i, child in enumerate(children):
+            self.assertEqual(parent.index(child), i)
+        # direct changes of the children list invalidate cached indices:
+        other = nodes.Element()
+        parent.children.insert(0, other)
+        self.assertEqual(parent.index(children[2]), 3)
+        self.assertEqual(parent.index(other), 0)
+        del parent.children[:2]
+        self.assertEqual(parent.index(children[1]), 0)
+        self.assertRaises(ValueError, parent.index, nodes.Element())
+        # equal text, but not a child:
+        self.assertEqual(parent.index(nodes.Text('same')), 1)
+
+    def test_replace_children(self):
+        parent = nodes.Element()
+        children = [nodes.Element(ids=['child%d' % i]) for i in range(4)]
+        parent += children
+        new = nodes.Element(ids=['new'])
+        parent.replace_children([(children[3], [new, children[3]]),
+                                 (children[0], nodes.Text('text')),
+                                 (children[1], []),
+                                 (children[2], None)])
+        self.assertEqual(parent.pformat(), """\
+<Element>
+    text
+    <Element ids="child2">
+    <Element ids="new">
+    <Element ids="child3">
+""")
+        self.assertTrue(new.parent is parent)
+        self.assertEqual(parent.index(children[3]), 3)
+        self.assertRaises(ValueError, parent.replace_children,
+                          [(children[1], new)])
+        self.assertRaises(ValueError, parent.replace_children,
+                          [(new, children[0]), (new, children[1])])
+        self.assertEqual(len(parent), 4)
+
+    def test_system_message_copy(self):
+        message = nodes.system_message('Message.', nodes.literal_block('', 'x'),
+                                       type='WARNING', level=2, ids=['id1'])
+        message.source, message.line = 'test.txt', 3
+        copy = message.copy()
+        self.assertEqual(copy.attributes, message.attributes)
+        self.assertEqual((copy.source, copy.line), ('test.txt', 3))
+        self.assertEqual(len(copy), 0)
+        self.assertEqual(message.deepcopy().pformat(), message.pformat())
+
+    def test_get_language_code(self):
+        section = nodes.section(classes=['special', 'language-de'])
+        paragraph = nodes.paragraph()
+        section += paragraph
+        self.assertEqual(paragraph.get_language_code('en'), 'de')
+        paragraph['classes'].append('language-fr-ch')
+        self.assertEqual(paragraph.get_language_code('en'), 'fr-ch')
+        self.assertEqual(nodes.paragraph().get_language_code('en'), 'en')
+
     def test_unicode(self):
         node = nodes.Element(u'Möhren', nodes.Text(u'Möhren', u'Möhren'))
         self.assertEqual(unicode(node), u'<Element>Möhren</Element>')
@@ -572,6 +666,50 @@ class MiscTests(unittest.TestCase):
                                [e[0]])
         self.assertEqual(list(e.traverse(nodes.TextElement)), [e[0][1]])
 
+    def test_findall(self):
+        e = nodes.Element()
+        e += nodes.Element()
+        e[0] += nodes.Element()
+        e[0] += nodes.TextElement()
+        e[0][1] += nodes.Text('some text')
+        e += nodes.Element()
+        # findall() returns an iterator, traverse() a list:
+        self.assertFalse(isinstance(e.findall(), list))
+        self.assertTrue(isinstance(e.traverse(), list))
+        self.assertEqual(e.traverse(), list(e.findall()))
+        text = e[0][1][0]
+        for node, kwargs, expected in (
+            (e, {}, [e, e[0], e[0][0], e[0][1], text, e[1]]),
+            (e, {'include_self': False}, [e[0], e[0][0], e[0][1], text, e[1]]),
+            (e, {'descend': False}, [e]),
+            (e, {'siblings': True}, [e, e[0], e[0][0], e[0][1], text, e[1]]),
+            (e, {'condition': nodes.TextElement}, [e[0][1]]),
+            (e, {'condition': nodes.Text, 'ascend': True}, [text]),
+            (e[0][0], {}, [e[0][0]]),
+            (e[0][0], {'include_self': False}, []),
+            (e[0][0], {'siblings': True}, [e[0][0], e[0][1], text]),
+            (e[0][0], {'siblings': True, 'descend': False},
+             [e[0][0], e[0][1]]),
+            (e[0][0], {'ascend': True}, [e[0][0], e[0][1], text, e[1]]),
+            (e[0][0], {'ascend': True, 'include_self': False},
+             [e[0][1], text, e[1]]),
+            (e[0][0], {'condition': nodes.TextElement}, []),
+            (e[0][0], {'condition': nodes.Text, 'ascend': True}, [text]),
+            (text, {'ascend': True}, [text, e[1]]),
+            ):
+            result = list(node.findall(**kwargs))
+            self.assertEqual([id(n) for n in result],
+                             [id(n) for n in expected], kwargs)
+        # no recursion limit:
+        node = root = nodes.Element()
+        for i in range(sys.getrecursionlimit() + 10):
+            node += nodes.Element()
+            node = node[0]
+        node += nodes.Text('deep')
+        self.assertEqual(root.next_node(nodes.Text), node[0])
+        self.assertEqual(len(root.traverse()),
+                         sys.getrecursionlimit() + 12)
+
     def test_next_node(self):
         e = nodes.Element()
         e += nodes.Element()
@@ -649,6 +787,126 @@ class TreeCopyVisitorTests(unittest.TestCase):
         self.compare_trees(self.document, newtree)
 
 
+class NodeVisitorDispatchTests(unittest.TestCase):
+
+    class Visitor(nodes.SparseNodeVisitor):
+
+        def __init__(self, document):
+            nodes.SparseNodeVisitor.__init__(self, document)
+            self.visited = []
+
+        def visit_paragraph(self, node):
+            self.visited.append(node.astext())
+
+    def setUp(self):
+        self.document = utils.new_document('test data')
+        self.document += nodes.paragraph('', 'one')
+        self.document += nodes.paragraph('', 'two')
+
+    def test_dispatch_table(self):
+        visitor = self.Visitor(self.document)
+        self.document.walkabout(visitor)
+        self.assertEqual(visitor.visited, ['one', 'two'])
+        self.assertEqual(sorted([cls.__name__
+                                 for cls in visitor._dispatch_table]),
+                         ['Text', 'document', 'paragraph'])
+
+    def test_instance_override(self):
+        visitor = self.Visitor(self.document)
+        visitor.visit_paragraph = lambda node: visitor.visited.append(None)
+        self.document.walk(visitor)
+        self.assertEqual(visitor.visited, [None, None])
+
+    def test_debug_messages(self):
+        self.document.reporter.stream = None
+        self.document.reporter.debug_flag = True
+        messages = []
+        self.document.reporter.attach_observer(messages.append)
+        self.document.walkabout(self.Visitor(self.document))
+        self.assertTrue(messages)
+        self.document.reporter.debug_flag = False
+        del messages[:]
+        self.document.walkabout(self.Visitor(self.document))
+        self.assertEqual(messages, [])
+
+
+class ClassIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        document = utils.new_document('test data')
+        document += nodes.paragraph('', 'Paragraph 1.')
+        blist = nodes.bullet_list()
+        for i in range(1, 6):
+            item = nodes.list_item()
+            for j in range(1, 4):
+                item += nodes.paragraph('', 'Item %s, paragraph %s.' % (i, j))
+            blist += item
+        document += blist
+        document.enable_class_index()
+        # always use the index:
+        document.class_index.sort_threshold = 0
+        self.document = document
+
+    def check(self, *classes):
+        for cls in classes:
+            self.assertEqual(list(self.document.findall(cls)),
+                list(nodes.Element.findall(self.document, cls)))
+
+    def test_find(self):
+        self.assertEqual(len(self.document.traverse(nodes.paragraph)), 16)
+        self.assertEqual(len(self.document.traverse(nodes.Body)), 17)
+        self.assertEqual(self.document.traverse(nodes.section), [])
+        self.check(nodes.paragraph, nodes.list_item, nodes.Element)
+
+    def test_modify(self):
+        blist = self.document[1]
+        # move a list item out of the document and back in:
+        item = blist.pop(0)
+        container = nodes.container('', item)
+        self.assertEqual(len(self.document.traverse(nodes.paragraph)), 13)
+        self.document.insert(0, container)
+        self.assertEqual(len(self.document.traverse(nodes.paragraph)), 16)
+        # move children to a new node, replace the old node:
+        admonition = nodes.admonition('', *blist[1].children)
+        blist[1].replace_self(admonition)
+        self.check(nodes.paragraph, nodes.list_item, nodes.admonition)
+        del blist[2:]
+        blist.remove(blist[0])
+        blist[0][0].replace_self([nodes.section(), nodes.section()])
+        self.check(nodes.paragraph, nodes.list_item, nodes.section)
+        blist.clear()
+        self.check(nodes.paragraph, nodes.list_item, nodes.Element)
+        self.document.disable_class_index()
+        self.assertEqual(self.document.class_index, None)
+
+
+class DocumentForgetTests(unittest.TestCase):
+
+    def test_forget(self):
+        document = utils.new_document('test data')
+        section = nodes.section()
+        document += section
+        target = nodes.target('', ids=['target'], names=['target'])
+        document.note_explicit_target(target)
+        reference = nodes.reference('', 'target', refname='target')
+        document.note_refname(reference)
+        footnote = nodes.footnote('', auto=1)
+        document.note_autofootnote(footnote)
+        message = nodes.system_message('message', level=1, type='INFO')
+        document.note_parse_message(message)
+        section += [target, reference, footnote, message]
+        kept = nodes.reference('', 'target', refname='target')
+        document.note_refname(kept)
+        document += nodes.paragraph('', '', kept)
+        document.remove(section)
+        document.forget(section)
+        self.assertFalse(document.ids['target'] is target)
+        self.assertEqual(document.ids['target']['names'], ['target'])
+        self.assertEqual(document.refnames, {'target': [kept]})
+        self.assertEqual(document.autofootnotes, [])
+        self.assertEqual(document.parse_messages, [])
+
+
 class MiscFunctionTests(unittest.TestCase):
 
     names = [('a', 'a'), ('A', 'a'), ('A a A', 'a a a'),
@@ -12,7 +12,8 @@ import sys
 import unittest
 import DocutilsTestSupport              # must be imported before docutils
 import docutils
-from docutils import parsers, utils, frontend
+import docutils.parsers.rst
+from docutils import parsers, utils, frontend, nodes
 from docutils._compat import b
 
 
@@ -32,6 +33,112 @@ class RstParserTests(unittest.TestCase):
             # input must be unicode at all times
             self.assertRaises(TypeError, parser.parse, b('hol'), document)
 
+    def test_inliner_patterns_cache(self):
+        from docutils.parsers.rst import states
+        settings = frontend.OptionParser(
+            components=(parsers.rst.Parser,)).get_default_values()
+        one, two = states.Inliner(), states.Inliner()
+        one.init_customizations(settings)
+        two.init_customizations(settings)
+        # compiled once, shared by all instances:
+        self.assertTrue(one.patterns is two.patterns)
+        settings.character_level_inline_markup = True
+        three = states.Inliner()
+        three.init_customizations(settings)
+        self.assertFalse(one.patterns is three.patterns)
+        self.assertEqual(three.end_string_suffix, u'')
+
+
+class StreamingParserTests(unittest.TestCase):
+
+    input = u"""\
+Introduction.
+
+Section 1
+=========
+
+Text [#]_ and reference_.
+
+.. [#] Note.
+
+Section 1.1
+-----------
+
+1. An enumerated list
+2. item.
+
+Section 2
+=========
+
+.. _reference: http://example.org
+"""
+
+    def setUp(self):
+        self.parser = parsers.rst.Parser()
+        self.settings = frontend.OptionParser(
+            components=(parsers.rst.Parser,)).get_default_values()
+
+    def new_document(self):
+        return utils.new_document('test data', self.settings)
+
+    def test_chunk_input(self):
+        chunks = list(self.parser.chunk_input(self.input.splitlines(True)))
+        self.assertEqual([(offset, style) for offset, lines, style in chunks],
+                         [(0, None), (2, '='), (9, '-'), (15, '=')])
+        self.assertEqual(chunks[1][1][:2], [u'Section 1', u'========='])
+
+    def test_parse_stream(self):
+        document = self.new_document()
+        self.parser.parse(self.input, document)
+        streamed = self.new_document()
+        self.parser.parse_stream(self.input.splitlines(True), streamed)
+        self.assertEqual(streamed.pformat(), document.pformat())
+
+    def test_section_handler(self):
+        sections = []
+        document = self.new_document()
+        self.parser.parse_stream(self.input.splitlines(True), document,
+                                 sections.append)
+        self.assertEqual([section['names'] for section in sections],
+                         [['section 1'], ['section 2']])
+        self.assertEqual(len(sections[0].traverse(nodes.section)), 2)
+        self.assertEqual(len(document), 1)
+        self.assertEqual(document.autofootnotes, [])
+        self.assertEqual(sorted(document.ids),
+                         ['id1', 'id2', 'reference', 'section-1',
+                          'section-1-1', 'section-2'])
+
+    def test_section_handler_level_2(self):
+        sections = []
+        document = self.new_document()
+        self.parser.parse_stream(self.input.splitlines(True), document,
+                                 sections.append, level=2)
+        self.assertEqual([section['names'] for section in sections],
+                         [['section 1.1']])
+        self.assertEqual(len(document.traverse(nodes.section)), 2)
+
+    def test_section_handler_warning(self):
+        # handed-off sections may contain system messages:
+        sections = []
+        self.settings.report_level = 5
+        document = self.new_document()
+        self.parser.parse_stream([u'Title\n', u'=====\n', u'\n',
+                                  u'Some *unclosed emphasis.\n', u'\n',
+                                  u'Two\n', u'===\n'],
+                                 document, sections.append)
+        self.assertEqual(len(sections), 2)
+        messages = sections[0].traverse(nodes.system_message)
+        self.assertEqual(len(messages), 1)
+        # the document keeps a detached copy for the message id:
+        message = document.ids[messages[0]['ids'][0]]
+        self.assertFalse(message is messages[0])
+        self.assertEqual(message['type'], 'WARNING')
+        self.assertEqual(message['line'], 4)
+        self.assertTrue(message.line)
+        self.assertEqual((message.source, message.line),
+                         (messages[0].source, messages[0].line))
+        self.assertEqual(document.parse_messages, [])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -9,9 +9,14 @@ Tests for misc.py "include" directive.
 """
 
 import os.path
+import shutil
 import sys
+import tempfile
+import unittest
 from __init__ import DocutilsTestSupport
+from docutils import core
 from docutils.parsers.rst import states
+from docutils.parsers.rst.directives import misc
 from docutils._compat import b
 from docutils.utils.code_analyzer import with_pygments
 
@@ -20,8 +25,66 @@ def suite():
     if not with_pygments:
         del(totest['include-code'])
     s.generateTests(totest)
+    s.addTest(unittest.makeSuite(IncludeCacheTests))
     return s
 
+
+class IncludeCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tempdir, 'snippet.txt')
+        self.write(u'Snippet text.\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def write(self, text):
+        snippet = open(self.path, 'wb')
+        snippet.write(text.encode('ascii'))
+        snippet.close()
+
+    def publish(self, options=u'', **settings):
+        source = (u'.. include:: %s\n%s\n' % (self.path, options)
+                  + u'.. include:: %s\n%s\n' % (self.path, options))
+        settings.update({'_disable_config': True, 'report_level': 5})
+        return core.publish_doctree(source, settings_overrides=settings)
+
+    def cached(self):
+        return [entry for key, entry in misc.Include.cache.items()
+                if key[0] == self.path]
+
+    def test_parsed(self):
+        document = self.publish()
+        self.assertEqual(document.astext(), u'Snippet text.\n\nSnippet text.')
+        # parsed includes are not cached:
+        self.assertEqual(self.cached(), [])
+
+    def test_literal(self):
+        document = self.publish(u'   :literal:\n   :name: snippet\n')
+        blocks = document.traverse(DocutilsTestSupport.nodes.literal_block)
+        self.assertEqual(len(blocks), 2)
+        self.assertFalse(blocks[0] is blocks[1])
+        self.assertEqual(blocks[0]['dupnames'], [u'snippet'])
+        self.assertEqual(blocks[1]['dupnames'], [u'snippet'])
+        self.assertEqual(len(self.cached()), 1)
+        self.assertEqual(self.cached()[0][2][0]['names'], [])
+        self.write(u'Changed snippet.\n')
+        document = self.publish(u'   :literal:\n')
+        self.assertEqual(document.astext(),
+                         u'Changed snippet.\n\n\nChanged snippet.\n')
+        self.assertEqual(len(self.cached()), 1)
+
+    def test_cache_size(self):
+        self.publish(u'   :literal:\n', include_cache_size=0)
+        self.assertEqual(self.cached(), [])
+        self.publish(u'   :literal:\n', include_cache_size=1)
+        self.assertEqual(len(misc.Include.cache), 1)
+        self.publish(u'   :literal:\n   :number-lines:\n',
+                     include_cache_size=1)
+        self.assertEqual(len(misc.Include.cache), 1)
+        self.assertEqual(self.cached()[0][2][0].astext(), u'1 Snippet text.')
+
 # prepend this directory (relative to the test root):
 def mydir(path):
     return os.path.join('test_parsers/test_rst/test_directives/', path)
@@ -473,6 +473,50 @@ totest['csv-table'] = [
                             On a stick!
 """],
 ["""\
+.. csv-table:: body elements and implicit markup
+
+   "1. one", A) two, *emphasis*
+   http://example.org, mail@example.org, plain text
+""",
+"""\
+<document source="test data">
+    <table>
+        <title>
+            body elements and implicit markup
+        <tgroup cols="3">
+            <colspec colwidth="33">
+            <colspec colwidth="33">
+            <colspec colwidth="33">
+            <tbody>
+                <row>
+                    <entry>
+                        <enumerated_list enumtype="arabic" prefix="" suffix=".">
+                            <list_item>
+                                <paragraph>
+                                    one
+                    <entry>
+                        <enumerated_list enumtype="upperalpha" prefix="" suffix=")">
+                            <list_item>
+                                <paragraph>
+                                    two
+                    <entry>
+                        <paragraph>
+                            <emphasis>
+                                emphasis
+                <row>
+                    <entry>
+                        <paragraph>
+                            <reference refuri="http://example.org">
+                                http://example.org
+                    <entry>
+                        <paragraph>
+                            <reference refuri="mailto:mail@example.org">
+                                mail@example.org
+                    <entry>
+                        <paragraph>
+                            plain text
+"""],
+["""\
 .. csv-table:: short rows
 
    one, 2, three
@@ -627,6 +627,34 @@ And more.
     <paragraph>
         And more.
 """],
+[u"""\
++--------+--------+
+| \u3042\u3044   | Wide   |
++--------+ text   |
+| \u3046     | \u3048\u304a   |
++--------+--------+
+""",
+u"""\
+<document source="test data">
+    <table>
+        <tgroup cols="2">
+            <colspec colwidth="8">
+            <colspec colwidth="8">
+            <tbody>
+                <row>
+                    <entry>
+                        <paragraph>
+                            \u3042\u3044
+                    <entry morerows="1">
+                        <paragraph>
+                            Wide
+                            text
+                            \u3048\u304a
+                <row>
+                    <entry>
+                        <paragraph>
+                            \u3046
+"""],
 ]
 
 totest['simple_tables'] = [
@@ -10,6 +10,7 @@ Tests of document tree pickling.
 import unittest
 import DocutilsTestSupport              # must be imported before docutils
 import pickle
+import copy
 from docutils import core
 
 
@@ -23,6 +24,32 @@ class PickleTests(unittest.TestCase):
         reconstituted = pickle.loads(dill)
         self.assertEqual(doctree.pformat(), reconstituted.pformat())
 
+    def test_pickle_protocols(self):
+        doctree = core.publish_doctree(
+            source='Title\n=====\n\n.. _target:\n\nparagraph target_\n',
+            settings_overrides={'_disable_config': True})
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            reconstituted = pickle.loads(pickle.dumps(doctree, protocol))
+            self.assertEqual(doctree.pformat(), reconstituted.pformat())
+            paragraph = reconstituted[-1]
+            self.assertTrue(paragraph.parent is reconstituted)
+            self.assertTrue(paragraph[0].parent is paragraph)
+            self.assertEqual(paragraph[0].rawsource, 'paragraph ')
+
+    def test_copy(self):
+        doctree = core.publish_doctree(
+            source='Title\n=====\n\nparagraph *emphasis*\n',
+            settings_overrides={'_disable_config': True})
+        paragraph = doctree[-1]
+        duplicate = copy.copy(paragraph)
+        self.assertEqual(duplicate.pformat(), paragraph.pformat())
+        self.assertTrue(duplicate.children is paragraph.children)
+        duplicate = copy.deepcopy(paragraph)
+        self.assertEqual(duplicate.pformat(), paragraph.pformat())
+        self.assertFalse(duplicate[1] is paragraph[1])
+        duplicate[1]['classes'].append('spam')
+        self.assertEqual(paragraph[1]['classes'], [])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -13,6 +13,11 @@ import DocutilsTestSupport              # must be imported before docutils
 import docutils
 from docutils import core, nodes, io
 from docutils._compat import b, bytes, u_prefix
+from docutils.utils.error_reporting import ErrorOutput
+try:
+    from io import StringIO
+except ImportError:    # io is new in Python 2.6
+    from StringIO import StringIO
 
 
 test_document = """\
@@ -75,6 +80,37 @@ class PublisherTests(DocutilsTestSupport.StandardTestCase):
         except IOError, e:
             self.assertTrue(isinstance(e, io.OutputError))
 
+    def test_timings(self):
+        pub = core.Publisher(source_class=io.StringInput,
+                             destination_class=io.StringOutput)
+        pub.set_components('standalone', 'restructuredtext', 'pseudoxml')
+        pub.process_programmatic_settings(
+            None, {'timings': True, '_disable_config': True,
+                   'warning_stream': ''}, None)
+        pub.set_source(test_document)
+        pub.set_destination()
+        stderr = StringIO()
+        pub._stderr = ErrorOutput(stderr)
+        output = pub.publish()
+        self.assertEqual(output, pseudoxml_output)
+        timings = pub.timings
+        for phase in pub.timing_phases:
+            self.assertTrue(timings[phase] >= 0)
+        self.assertTrue(timings['total'] >= timings['parse'])
+        self.assertEqual(timings['nodes_parsed'], 8)
+        self.assertEqual(timings['nodes'], 13)
+        self.assertEqual(timings['node_classes']['paragraph'], 2)
+        transforms = [name for name, priority, seconds
+                      in timings['transform_timings']]
+        self.assertTrue('docutils.transforms.references.DanglingReferences'
+                        in transforms)
+        self.assertEqual(
+            len(transforms), len(pub.document.transformer.applied))
+        self.assertTrue('::: Timings:' in stderr.getvalue())
+        # the IO objects are restored:
+        self.assertFalse('read' in pub.source.__dict__)
+        self.assertFalse('write' in pub.destination.__dict__)
+
 
 class PublishDoctreeTestCase(DocutilsTestSupport.StandardTestCase, docutils.SettingsSpec):
 
@@ -159,6 +195,127 @@ class PublishDoctreeTestCase(DocutilsTestSupport.StandardTestCase, docutils.Sett
         self.assertEqual(output, pseudoxml_output)
 
 
+class RendererTestCase(DocutilsTestSupport.StandardTestCase):
+
+    sources = [test_document,
+               'Another *document*\n\n* with a list [#]_\n\n.. [#] note\n',
+               '']
+
+    # no config files, no warnings on stderr:
+    overrides = {'_disable_config': 1, 'warning_stream': ''}
+
+    def test_render(self):
+        for writer_name in ('html', 'latex', 'pseudoxml'):
+            renderer = core.Renderer(writer_name=writer_name,
+                                     settings_overrides=self.overrides)
+            for source in self.sources * 2:
+                self.assertEqual(
+                    renderer.render(source),
+                    core.publish_parts(source, writer_name=writer_name,
+                        settings_overrides=self.overrides))
+
+    def test_settings_overrides(self):
+        overrides = self.overrides.copy()
+        overrides['report_level'] = 5
+        renderer = core.Renderer(writer_name='html',
+                                 settings_overrides=overrides)
+        parts = renderer.render(test_document,
+                                settings_overrides={'report_level': 1})
+        self.assertTrue('Unknown target name' in parts['body'])
+        parts = renderer.render(test_document)
+        self.assertFalse('Unknown target name' in parts['body'])
+        self.assertEqual(renderer.settings.report_level, 5)
+
+    def test_pool(self):
+        import threading
+        pool = core.RendererPool(2, writer_name='html',
+                                 settings_overrides=self.overrides)
+        expected = [core.publish_parts(source, writer_name='html',
+                        settings_overrides=self.overrides)['body']
+                    for source in self.sources]
+        results = []
+        def render():
+            for source in self.sources:
+                results.append(pool.render(source)['body'])
+        threads = [threading.Thread(target=render) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(results), sorted(expected * 4))
+        self.assertTrue(pool.count <= 2)
+
+
+class ConcurrentPublishingTests(DocutilsTestSupport.StandardTestCase):
+
+    """Publish documents with per-document state from several threads."""
+
+    custom_roles = u"""\
+.. default-role:: emphasis
+.. role:: custom
+
+`default role` and :custom:`custom role`, "quoted" 'text'.
+
+.. math:: \\sum_{i=0}^{n} x_i
+
+Inline :math:`\\sum_{i=0}^{n} x_i`.
+"""
+    plain = u"""\
+`default role`, "quoted" 'text'.
+
+Inline :math:`\\sum_{i=0}^{n} x_i`.
+
+.. math:: \\sum_{i=0}^{n} x_i
+"""
+    documents = [(custom_roles, {'smartquotes_locales': [('en', u'<>()')]}),
+                 (plain, {}),
+                 (plain, {'language_code': 'de'})]
+
+    overrides = {'_disable_config': True, 'warning_stream': '',
+                 'smart_quotes': True, 'math_output': 'HTML',
+                 'embed_stylesheet': False}
+
+    def publish(self, index):
+        source, overrides = self.documents[index]
+        settings_overrides = self.overrides.copy()
+        settings_overrides.update(overrides)
+        return core.publish_string(source, writer_name='html5',
+                                   settings_overrides=settings_overrides)
+
+    def test_threads(self):
+        import threading
+        import Queue
+        # reversed, so that no document sees state left by the others:
+        expected = [self.publish(index)
+                    for index in reversed(range(len(self.documents)))]
+        expected.reverse()
+        tasks = Queue.Queue()
+        for i in range(20):
+            for index in range(len(self.documents)):
+                tasks.put(index)
+        results = []
+        def work():
+            while True:
+                try:
+                    index = tasks.get_nowait()
+                except Queue.Empty:
+                    return
+                results.append((index, self.publish(index)))
+        threads = [threading.Thread(target=work) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results), 20 * len(self.documents))
+        for index, output in results:
+            self.assertEqual(output, expected[index])
+        # the documents really differ in the tested features:
+        self.assertTrue(b('<em>default role</em>') in expected[0])
+        self.assertTrue(b('<cite>default role</cite>') in expected[1])
+        self.assertTrue(b('&lt;quoted&gt;') in expected[0])
+        self.assertTrue(b('\xe2\x80\x9equoted') in expected[2])
+
+
 if __name__ == '__main__':
     import unittest
     unittest.main()
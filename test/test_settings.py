@@ -172,6 +172,115 @@ class ConfigEnvVarFileTests(ConfigFileTests):
         os.environ = self.orig_environ
 
 
+class FrozenDefaultsConfigFileTests(ConfigFileTests):
+
+    """
+    Repeats the tests of `ConfigFileTests` with memoized config file
+    settings (`frontend.FrozenDefaults`).
+    """
+
+    def setUp(self):
+        self.frozen = frontend.FrozenDefaults(
+            frontend.OptionParser, (pep_html.Writer, rst.Parser))
+        self.option_parser = self.frozen.option_parser
+
+    def files_settings(self, *names):
+        settings = frontend.Values()
+        for name in names:
+            for i in range(2):          # second call is memoized
+                file_settings, files = self.frozen.get_config_file_settings(
+                    self.config_files[name])
+            settings.update(file_settings, self.option_parser)
+        return settings.__dict__
+
+
+class FrozenDefaultsTests(unittest.TestCase):
+
+    components = (pep_html.Writer, rst.Parser)
+
+    def setUp(self):
+        self.orig_environ = os.environ
+        os.environ = os.environ.copy()
+        os.environ['DOCUTILSCONFIG'] = os.pathsep.join(
+            [fixpath('data/config_1.txt'), fixpath('data/config_list.txt')])
+
+    def tearDown(self):
+        os.environ = self.orig_environ
+
+    def settings_dict(self, settings):
+        settings = settings.__dict__.copy()
+        del settings['record_dependencies']
+        return settings
+
+    def test_get_default_settings(self):
+        defaults = {'report_level': 4, 'stylesheet_path': ['a.css']}
+        for read_config_files in (None, True):
+            expected = frontend.OptionParser(
+                self.components, defaults, read_config_files
+                ).get_default_values()
+            for i in range(2):
+                settings = frontend.OptionParser.get_default_settings(
+                    self.components, defaults, read_config_files)
+                self.assertEqual(self.settings_dict(settings),
+                                 self.settings_dict(expected))
+                self.assertEqual(settings._config_files,
+                                 expected._config_files)
+
+    def test_cached(self):
+        frozen = frontend.FrozenDefaults.get(frontend.OptionParser,
+                                             self.components)
+        self.assertTrue(frozen is frontend.FrozenDefaults.get(
+            frontend.OptionParser, (pep_html.Writer(), rst.Parser())))
+        self.assertFalse(frozen is frontend.FrozenDefaults.get(
+            frontend.OptionParser, (rst.Parser,)))
+
+    def test_cache_size(self):
+        FrozenDefaults = frontend.FrozenDefaults
+        cache_size = FrozenDefaults.cache_size
+        FrozenDefaults.cache_size = 2
+        try:
+            first = FrozenDefaults.get(frontend.OptionParser, self.components)
+            second = FrozenDefaults.get(frontend.OptionParser, (rst.Parser,))
+            self.assertTrue(FrozenDefaults.get(frontend.OptionParser,
+                                               self.components) is first)
+            # the least recently used instance is dropped:
+            FrozenDefaults.get(frontend.OptionParser, (pep_html.Writer,))
+            self.assertTrue(len(FrozenDefaults.cache) <= 2)
+            self.assertTrue(FrozenDefaults.get(frontend.OptionParser,
+                                               self.components) is first)
+            self.assertFalse(FrozenDefaults.get(frontend.OptionParser,
+                                                (rst.Parser,)) is second)
+        finally:
+            FrozenDefaults.cache_size = cache_size
+
+    def test_lists_not_shared(self):
+        get_default_settings = frontend.OptionParser.get_default_settings
+        settings = get_default_settings(self.components,
+                                        read_config_files=True)
+        settings.update({'strip_classes': ['ham']},
+                        frontend.OptionParser(self.components))
+        settings.expose_internals.append('spam')
+        settings = get_default_settings(self.components,
+                                        read_config_files=True)
+        self.assertEqual(settings.strip_classes,
+                         [u'spam', u'pan', u'fun', u'parrot'])
+        self.assertEqual(settings.expose_internals,
+                         [u'a', u'b', u'c', u'd', u'e'])
+
+    def test_config_file_changed(self):
+        frozen = frontend.FrozenDefaults(frontend.OptionParser,
+                                         self.components)
+        config_file = fixpath('data/config_1.txt')
+        frozen.get_config_file_settings(config_file)
+        mtime, settings, files = frozen.config_file_settings[config_file]
+        # Fake an outdated entry:
+        frozen.config_file_settings[config_file] = (mtime - 1,
+                                                    {'tab_width': 4}, files)
+        settings, files = frozen.get_config_file_settings(config_file)
+        self.assertEqual(settings['tab_width'], 8)
+        self.assertEqual(files, [config_file])
+
+
 class HelperFunctionsTests(unittest.TestCase):
 
     pathdict = {'foo': 'hallo', 'ham': u'h\xE4m', 'spam': u'spam'}
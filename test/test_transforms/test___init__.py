@@ -9,7 +9,7 @@ Test module for transforms/__init__.py.
 """
 
 from __init__ import DocutilsTestSupport # must be imported before docutils
-from docutils import transforms, utils
+from docutils import nodes, transforms, utils
 import unittest
 
 
@@ -37,5 +37,39 @@ class KwargsTestCase(unittest.TestCase):
         self.assertEqual(transform_record[3], {'foo': 42})
 
 
+class FindEmphasis(transforms.Transform):
+
+    default_priority = 100
+
+    def apply(self):
+        # Direct modification of the children list (not indexed):
+        self.document[0].children.append(nodes.emphasis('', 'new'))
+        self.document.found = self.document.traverse(nodes.emphasis)
+        self.document.indexed = self.document.class_index is not None
+
+
+class ClassIndexTestCase(unittest.TestCase):
+
+    def apply(self, **settings):
+        document = utils.new_document('test data')
+        for name, value in settings.items():
+            setattr(document.settings, name, value)
+        document += nodes.paragraph('', 'text')
+        transformer = transforms.Transformer(document)
+        transformer.add_transform(FindEmphasis)
+        transformer.apply_transforms()
+        self.assertEqual(document.class_index, None)
+        return document
+
+    def test_default(self):
+        document = self.apply()
+        self.assertFalse(document.indexed)
+        self.assertEqual(len(document.found), 1)
+
+    def test_class_index(self):
+        document = self.apply(class_index=True)
+        self.assertTrue(document.indexed)
+
+
 if __name__ == '__main__':
     unittest.main()
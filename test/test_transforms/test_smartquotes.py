@@ -272,6 +272,32 @@ u"""\
     <paragraph classes="language-en">
         English “smart quotes” and ‘secondary smart quotes’.
 """],
+["""\
+.. class:: language-en
+
+.. container::
+
+   English "smart quotes" in a container,
+
+   * a list item with "nested" quotes,
+
+     .. class:: language-de
+
+   * and German "quotes" in a nested list.
+""",
+u"""\
+<document source="test data">
+    <container classes="language-en">
+        <paragraph>
+            English “smart quotes” in a container,
+        <bullet_list bullet="*">
+            <list_item>
+                <paragraph>
+                    a list item with “nested” quotes,
+            <list_item classes="language-de">
+                <paragraph>
+                    and German „quotes“ in a nested list.
+"""],
 ])
 
 totest_de_alt['transitions'] = ((SmartQuotes,), [
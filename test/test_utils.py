@@ -12,7 +12,9 @@ Test module for utils/__init__.py.
 import unittest
 import sys
 import os
+import tempfile
 from DocutilsTestSupport import docutils, utils, nodes
+from docutils.utils import math
 try:
     from io import StringIO
 except ImportError:    # io is new in Python 2.6
@@ -96,6 +98,16 @@ class ReporterTests(unittest.TestCase):
         mesidʒ
 """)
 
+    def test_trace(self):
+        sw = self.reporter.trace('%s output for %s', 'debug', 'trace')
+        self.assertEqual(sw.pformat(), """\
+<system_message level="0" source="test data" type="DEBUG">
+    <paragraph>
+        debug output for trace
+""")
+        self.assertEqual(self.stream.getvalue(),
+                          'test data:: (DEBUG/0) debug output for trace\n')
+
 class QuietReporterTests(unittest.TestCase):
 
     stream = StringIO()
@@ -111,6 +123,18 @@ class QuietReporterTests(unittest.TestCase):
         self.assertEqual(sw, None)
         self.assertEqual(self.stream.getvalue(), '')
 
+    def test_trace(self):
+        class Unformattable:
+            def __str__(self):
+                raise AssertionError('formatted a suppressed message')
+        suppressed = self.reporter.suppressed
+        sw = self.reporter.trace('a debug message for %s', Unformattable())
+        self.assertEqual(sw, None)
+        self.assertEqual(self.reporter.suppressed, suppressed + 1)
+        self.reporter.debug('a debug message')
+        self.assertEqual(self.reporter.suppressed, suppressed + 2)
+        self.assertEqual(self.stream.getvalue(), '')
+
     def test_info(self):
         sw = self.reporter.info('an informational message')
         self.assertEqual(sw.pformat(), """\
@@ -235,6 +259,36 @@ class ExtensionOptionTests(unittest.TestCase):
                           field_list, self.optionspec)
 
 
+class MathCacheTests(unittest.TestCase):
+
+    def test_lru(self):
+        cache = math.MathCache(maxsize=4)
+        for i in range(4):
+            cache[i] = str(i)
+        self.assertEqual(cache.get(0), '0')
+        self.assertEqual(cache.get(9, 'default'), 'default')
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        # overflow: keep the 3/4 most recently used entries:
+        cache[4] = '4'
+        self.assertEqual(sorted(cache.entries.keys()), [0, 3, 4])
+
+    def test_save(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            cache = math.MathCache(path=path)
+            cache[('html', (), '', u'x')] = u'<i>x</i>'
+            cache.save()
+            self.assertFalse(cache.changed)
+            cache = math.MathCache(path=path)
+            self.assertEqual(cache.get(('html', (), '', u'x')), u'<i>x</i>')
+        finally:
+            os.remove(path)
+        # invalid cache files are ignored:
+        cache = math.MathCache(path=__file__)
+        self.assertEqual(len(cache), 0)
+
+
 class HelperFunctionsTests(unittest.TestCase):
 
     def test_version_identifier(self):
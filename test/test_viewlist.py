@@ -157,6 +157,60 @@ class ViewListTests(unittest.TestCase):
         self.assertEqual(a, self.a)
         self.assertEqual(s, a[2:-2])
 
+    def test_copy_on_write(self):
+        a = statemachine.ViewList(self.a_list, 'a')
+        s = a[2:5]
+        # changes to the parent do not affect existing child lists
+        a.insert(0, 'Q', 'runtime')
+        a[4] = 'R'
+        self.assertEqual(s, self.a_list[2:5])
+        self.assertEqual(s.info(0), ('a', 2))
+        # changes to a child list's `data` do not affect the parent
+        s.data[0] = 'S'
+        self.assertEqual(a, ['Q'] + self.a_list[:3] + ['R'] + self.a_list[4:])
+        self.assertEqual(self.a, self.a_list)
+
+    def test_set_data(self):
+        a = statemachine.ViewList(self.a_list, 'a')
+        a.data = list('xyz')
+        self.assertEqual(len(a), 3)
+        self.assertEqual(list(a), ['x', 'y', 'z'])
+        self.assertEqual(a[1:], ['y', 'z'])
+        a.items = [('x', 0), ('x', 1), ('x', 2)]
+        self.assertEqual(a.info(2), ('x', 2))
+
+    def test_change_data(self):
+        a = statemachine.ViewList(self.a_list, 'a')
+        s = a[1:4]
+        data = s.data
+        data.append('X')
+        self.assertEqual(len(s), 4)
+        self.assertEqual(list(s), ['b', 'c', 'd', 'X'])
+        self.assertTrue(s.data is data)
+        s.trim_start(1)
+        self.assertEqual(data, ['c', 'd', 'X'])
+        self.assertEqual(a, self.a_list)
+
+    def test_data_copy_on_write(self):
+        a = statemachine.ViewList(self.a_list, 'a')
+        data = a.data
+        s = a[0:2]
+        data[0] = 'X'
+        self.assertEqual(s, ['a', 'b'])
+        s[1] = 'Y'
+        self.assertEqual(data, ['X', 'Y'] + self.a_list[2:])
+        self.assertTrue(a.data is data)
+
+    def test_items_with_none_offset(self):
+        a = statemachine.ViewList(['x', 'y'], items=[('s', None), ('t', 3)])
+        self.assertEqual(a.items, [('s', None), ('t', 3)])
+        a.insert(0, 'z', 'padding', offset=-1)
+        self.assertEqual(a.info(0), ('padding', -1))
+        del a[0]
+        self.assertEqual(a[1:].info(0), ('t', 3))
+        self.assertEqual((a + self.c).items,
+                         [('s', None), ('t', 3)] + self.c.items)
+
     def test_info(self):
         ab = self.a + self.b
         self.assertEqual(ab.info(0), ('a', 0))
@@ -11,9 +11,11 @@ Miscellaneous HTML writer tests.
 """
 
 from __init__ import DocutilsTestSupport
-from docutils import core
+from docutils import core, io
+from docutils.utils import math
 from docutils._compat import b
 import os
+import tempfile
 
 class EncodingTestCase(DocutilsTestSupport.StandardTestCase):
 
@@ -200,6 +202,97 @@ class MathTestCase(DocutilsTestSupport.StandardTestCase):
         head = core.publish_parts('No math.', writer_name='html4css1')['head']
         self.assertNotIn('MathJax', head)
 
+    def test_math_cache(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        mysettings = {'_disable_config': True,
+                      'math_output': 'HTML',
+                      'math_cache': path}
+        data = ':math:`a^2` and :math:`a^2`\n\n.. math:: a^2\n'
+        try:
+            body = core.publish_parts(data, writer_name='html4css1',
+                                      settings_overrides=mysettings)['body']
+            cache = math.get_math_cache(path=path)
+            # inline formula converted once, math block separately:
+            self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 2, 2))
+            self.assertTrue(os.path.getsize(path))
+            # the cache file is read by a new cache instance:
+            self.assertEqual(len(math.MathCache(path=path)), 2)
+            # with the cache disabled, the output is the same:
+            mysettings['math_cache_size'] = 0
+            self.assertEqual(body, core.publish_parts(data,
+                writer_name='html4css1', settings_overrides=mysettings)['body'])
+            self.assertEqual(cache.hits, 1)
+        finally:
+            del math._math_caches[path]
+            os.remove(path)
+
+
+class StreamOutputTestCase(DocutilsTestSupport.StandardTestCase):
+
+    data = u"""\
+Title
+=====
+
+Intro with a footnote [#]_ and math :math:`x^2`.
+
+Section 1
+---------
+
+Caf\u00e9 text.
+
+Section 2
+---------
+
+.. [#] Footnote text.
+
+"""
+
+    settings_overrides = {'_disable_config': True,
+                          'embed_stylesheet': False,
+                          'output_encoding': 'utf-8'}
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def publish(self, stream_output):
+        overrides = dict(self.settings_overrides,
+                         stream_output=stream_output)
+        output, pub = core.publish_programmatically(
+            source_class=io.StringInput,
+            source=self.data, source_path=None,
+            destination_class=io.FileOutput,
+            destination=None, destination_path=self.path,
+            reader=None, reader_name='standalone',
+            parser=None, parser_name='restructuredtext',
+            writer=None, writer_name='html4css1',
+            settings=None, settings_spec=None,
+            settings_overrides=overrides, config_section=None,
+            enable_exit_status=False)
+        result = open(self.path, 'rb').read()
+        return result, pub.writer.parts
+
+    def test_stream_output(self):
+        expected, parts = self.publish(stream_output=False)
+        result, streamed_parts = self.publish(stream_output=True)
+        self.assertEqual(result, expected)
+        self.assertIn(b('Caf\xc3\xa9 text.'), result)
+        self.assertEqual(streamed_parts['head'], parts['head'])
+        self.assertEqual(streamed_parts['title'], parts['title'])
+        for part in ('whole', 'body', 'fragment', 'html_body'):
+            self.assertTrue(part not in streamed_parts)
+
+    def test_stream_output_string_destination(self):
+        # Streaming needs a file destination:
+        overrides = dict(self.settings_overrides, stream_output=True)
+        parts = core.publish_parts(self.data, writer_name='html4css1',
+                                   settings_overrides=overrides)
+        self.assertIn(u'Caf\u00e9 text.', parts['body'])
+
 
 if __name__ == '__main__':
     import unittest
@@ -13,7 +13,10 @@ Miscellaneous HTML writer tests.
 from __init__ import DocutilsTestSupport
 from docutils import core
 from docutils._compat import b
+from docutils.utils.math import tex2mathml_extern
 import os
+import sys
+import tempfile
 
 class EncodingTestCase(DocutilsTestSupport.StandardTestCase):
 
@@ -202,6 +205,79 @@ class MathTestCase(DocutilsTestSupport.StandardTestCase):
         self.assertNotIn('MathJax', head)
 
 
+
+class ExternalMathTestCase(DocutilsTestSupport.StandardTestCase):
+
+    """Test the batch conversion with external MathML converters.
+
+    The converters are replaced by the stand-in "fake-tex2mathml.py".
+    """
+
+    data = u"""\
+Formulas :math:`a^2`, :math:`b < c`, and :math:`a^2`.
+
+.. math:: x_1 + x_2
+"""
+    fake_converter = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  os.pardir, 'fake-tex2mathml.py')
+    commands = ('latexml_command', 'latexmlpost_command', 'ttm_command')
+
+    def setUp(self):
+        fd, self.log = tempfile.mkstemp()
+        os.close(fd)
+        self.saved_commands = [getattr(tex2mathml_extern, name)
+                               for name in self.commands]
+        fake = [sys.executable, self.fake_converter]
+        tex2mathml_extern.latexml_command = fake + [self.log]
+        tex2mathml_extern.latexmlpost_command = fake + ['--copy', self.log]
+        tex2mathml_extern.ttm_command = fake + [self.log]
+
+    def tearDown(self):
+        for name, command in zip(self.commands, self.saved_commands):
+            setattr(tex2mathml_extern, name, command)
+        os.remove(self.log)
+
+    def publish(self, converter, data=None):
+        mysettings = {'_disable_config': True,
+                      'math_output': 'MathML %s' % converter,
+                      'math_cache_size': 0,
+                      'report_level': 5}
+        return core.publish_parts(data or self.data,
+                                  writer_name='html5_polyglot',
+                                  settings_overrides=mysettings)['body']
+
+    def runs(self):
+        logfile = open(self.log)
+        runs = len(logfile.readlines())
+        logfile.close()
+        return runs
+
+    def test_ttm_batch(self):
+        body = self.publish('ttm')
+        self.assertEqual(self.runs(), 1)
+        self.assertIn(u'<math><mtext>b &lt; c</mtext></math>', body)
+        self.assertIn(u'<math display="block"><mtext>x_1 + x_2</mtext>', body)
+        # the same output with one run per formula:
+        batch_converter = tex2mathml_extern.batch_converters.pop('ttm')
+        try:
+            self.assertEqual(self.publish('ttm'), body)
+        finally:
+            tex2mathml_extern.batch_converters['ttm'] = batch_converter
+        self.assertEqual(self.runs(), 1 + 4)
+
+    def test_latexml_batch(self):
+        body = self.publish('latexml')
+        self.assertEqual(self.runs(), 2) # latexml and latexmlpost
+        self.assertIn(u'<math><mtext>a^2</mtext></math>', body)
+
+    def test_batch_error(self):
+        # TtM fails for the document, the formulas are converted one by one:
+        body = self.publish('ttm', self.data + u'\n:math:`\\unknown`\n')
+        self.assertEqual(self.runs(), 1 + 5)
+        self.assertIn(u'<math><mtext>b &lt; c</mtext></math>', body)
+        self.assertIn(u'Unknown command', body)
+
+
 if __name__ == '__main__':
     import unittest
     unittest.main()
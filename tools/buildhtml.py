@@ -25,10 +25,18 @@ import sys
 import os
 import os.path
 import copy
+import time
+import pickle
+from hashlib import md5
 from fnmatch import fnmatch
+from StringIO import StringIO
+try:
+    import multiprocessing
+except ImportError:                     # Python < 2.6
+    multiprocessing = None
 import docutils
 from docutils import ApplicationError
-from docutils import core, frontend, utils
+from docutils import core, frontend, io, utils
 from docutils.utils.error_reporting import ErrorOutput, ErrorString
 from docutils.parsers import rst
 from docutils.readers import standalone, pep
@@ -80,9 +88,22 @@ class SettingsSpec(docutils.SettingsSpec):
           {'action': 'store_true', 'validator': frontend.validate_boolean}),
          ('Do not process files, show files that would be processed.',
           ['--dry-run'],
-          {'action': 'store_true', 'validator': frontend.validate_boolean}),))
-
-    relative_path_settings = ('prune',)
+          {'action': 'store_true', 'validator': frontend.validate_boolean}),
+         ('Process files in parallel, using <n> worker processes '
+          '(0: one per CPU).  Progress and system messages are reported '
+          'in the same order as in sequential processing, together with '
+          'the processing time of each file.  Default: 1 (no worker '
+          'processes).',
+          ['--jobs'],
+          {'metavar': '<n>', 'type': 'int', 'default': 1,
+           'validator': frontend.validate_nonnegative_int}),
+         ('Skip files whose output is up to date: keep a record of the '
+          'processed files, their settings, and the files they depend on '
+          '(included files, images, stylesheets, ...) in <file>.  '
+          'Default: None (process all files).',
+          ['--build-cache'], {'metavar': '<file>'}),))
+
+    relative_path_settings = ('prune', 'build_cache')
     config_section = 'buildhtml application'
     config_section_dependencies = ('applications',)
 
@@ -115,6 +136,173 @@ class Struct:
         self.__dict__.update(keywordargs)
 
 
+def publish_file(settings, reader_name, writer_name):
+    """
+    Convert the file `settings._source` to `settings._destination`.
+    Return the highest level of the system messages generated.
+    """
+    output, pub = core.publish_programmatically(
+        source_class=io.FileInput, source=None,
+        source_path=settings._source,
+        destination_class=io.FileOutput, destination=None,
+        destination_path=settings._destination,
+        reader=None, reader_name=reader_name,
+        parser=None, parser_name='restructuredtext',
+        writer=None, writer_name=writer_name,
+        settings=settings, settings_spec=None, settings_overrides=None,
+        config_section=None, enable_exit_status=False)
+    return pub.document.reporter.max_level
+
+
+def publish_job(job):
+    """
+    Process one file in a worker process (see `Builder.run_jobs()`).
+
+    `job` is a ``(settings, reader_name, writer_name)`` tuple.
+    Return a tuple ``(elapsed, messages, dependencies, max_level, error,
+    exit_status)``.  System messages and recorded dependencies are
+    collected and passed back to the main process, which reports them in
+    order.
+    """
+    settings, reader_name, writer_name = job
+    warning_stream = StringIO()
+    settings.warning_stream = warning_stream
+    settings.record_dependencies = utils.DependencyList()
+    max_level = error = exit_status = None
+    start = time.time()
+    try:
+        max_level = publish_file(settings, reader_name, writer_name)
+    except ApplicationError:
+        error = ErrorString(sys.exc_info()[1])
+    except SystemExit:
+        # Raised by the publisher after reporting a fatal error.
+        # Don't kill the worker; let the main process exit instead.
+        exit_status = sys.exc_info()[1].code
+    return (time.time() - start, warning_stream.getvalue(),
+            settings.record_dependencies.list, max_level, error, exit_status)
+
+
+class BuildCache:
+
+    """
+    Persistent record of processed files, used to skip up-to-date files.
+
+    For every processed source file, the cache stores a fingerprint of the
+    runtime settings and a stamp of the source and every recorded dependency
+    (see `docutils.utils.DependencyList`).  A file is up to date, if its
+    output file exists, the settings did not change, and neither the source
+    nor any dependency was modified.
+    """
+
+    version = 1
+    """Version of the cache file format."""
+
+    ignored_settings = ('record_dependencies', 'warning_stream', '_source',
+                        '_directories', 'recurse', 'prune', 'ignore',
+                        'silent', 'dry_run', 'jobs', 'build_cache')
+    """Settings without influence on the output."""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        """Maps source paths to ``(settings_key, stamps)`` tuples.
+        `stamps` maps absolute paths to ``(mtime, size, digest)`` tuples."""
+
+        self.pending = {}
+        """Settings keys of files being processed.  (The settings are
+        fingerprinted before processing, as the publisher modifies them.)"""
+
+        self.load()
+
+    def load(self):
+        """Read the cache file.  Ignore missing, corrupt or outdated files."""
+        try:
+            cache_file = open(self.path, 'rb')
+        except IOError:
+            return
+        try:
+            try:
+                version, entries = pickle.load(cache_file)
+            except Exception:
+                return
+        finally:
+            cache_file.close()
+        if version == (self.version, docutils.__version__):
+            self.entries = entries
+
+    def save(self):
+        cache_file = open(self.path, 'wb')
+        try:
+            pickle.dump(((self.version, docutils.__version__), self.entries),
+                        cache_file, pickle.HIGHEST_PROTOCOL)
+        finally:
+            cache_file.close()
+
+    def settings_key(self, settings):
+        """Return a fingerprint of the `settings` relevant for the output."""
+        items = [(key, value) for key, value in settings.__dict__.items()
+                 if key not in self.ignored_settings]
+        items.sort()
+        return md5(repr(items).encode('utf-8')).hexdigest()
+
+    def is_current(self, settings):
+        """Return True if the output for `settings._source` is up to date."""
+        key = self.pending[settings._source] = self.settings_key(settings)
+        entry = self.entries.get(settings._source)
+        if (entry is None or entry[0] != key
+            or not os.path.exists(settings._destination)):
+            return False
+        for path, stamp in entry[1].items():
+            if self.get_stamp(path, stamp) != stamp:
+                return False
+        return True
+
+    def update(self, settings, dependencies):
+        """Record a successful run for `settings._source`."""
+        key = self.pending.pop(settings._source)
+        stamps = {}
+        for path in [settings._source] + list(dependencies):
+            path = os.path.abspath(path)
+            stamp = self.get_stamp(path)
+            if stamp is None:
+                # Cannot check the dependency later: always rebuild.
+                self.discard(settings)
+                return
+            stamps[path] = stamp
+        self.entries[settings._source] = (key, stamps)
+
+    def discard(self, settings):
+        """Forget `settings._source` (e.g. after a failed run)."""
+        self.pending.pop(settings._source, None)
+        self.entries.pop(settings._source, None)
+
+    def get_stamp(self, path, old_stamp=None):
+        """
+        Return a ``(mtime, size, digest)`` tuple for `path` or None.
+
+        The (costly) content digest is only computed if the modification
+        time or size differ from `old_stamp`: return `old_stamp` if only the
+        modification time changed but the content did not.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if old_stamp and old_stamp[:2] == (stat.st_mtime, stat.st_size):
+            return old_stamp
+        try:
+            data_file = open(path, 'rb')
+        except IOError:
+            return None
+        try:
+            digest = md5(data_file.read()).hexdigest()
+        finally:
+            data_file.close()
+        if old_stamp and old_stamp[2] == digest:
+            return old_stamp
+        return (stat.st_mtime, stat.st_size, digest)
+
+
 class Builder:
 
     def __init__(self):
@@ -135,6 +323,16 @@ class Builder:
 
         self.setup_publishers()
 
+        self.queue = None
+        """Output messages and jobs deferred for parallel processing:
+        a list of ``(errout, message, job)`` tuples, where `job` is `None`
+        or a ``(settings, reader_name, writer_name, recorder)`` tuple
+        (see `self.write()` and `self.process_txt()`).
+        `None` in sequential mode."""
+
+        self.cache = None
+        """`BuildCache` instance, if the "build_cache" setting is used."""
+
     def setup_publishers(self):
         """
         Manage configurations for individual publishers.
@@ -188,26 +386,108 @@ class Builder:
             self.directories = self.settings_spec._directories
         else:
             self.directories = [os.getcwd()]
-        for directory in self.directories:
-            for root, dirs, files in os.walk(directory):
-                # os.walk by default this recurses down the tree,
-                # influence by modifying dirs.
-                if not recurse:
-                    del dirs[:]
-                self.visit(root, files, dirs)
+        jobs = self.initial_settings.jobs
+        if jobs != 1 and multiprocessing and not self.initial_settings.dry_run:
+            self.queue = []
+        if self.initial_settings.build_cache:
+            self.cache = BuildCache(self.initial_settings.build_cache)
+        try:
+            for directory in self.directories:
+                for root, dirs, files in os.walk(directory):
+                    # os.walk by default this recurses down the tree,
+                    # influence by modifying dirs.
+                    if not recurse:
+                        del dirs[:]
+                    self.visit(root, files, dirs)
+            if self.queue is not None:
+                self.run_jobs(jobs or None)
+        finally:
+            if self.cache is not None and not self.initial_settings.dry_run:
+                self.cache.save()
+
+    def run_jobs(self, processes):
+        """
+        Process the queued jobs in a pool of `processes` worker processes.
+
+        Messages are written in queue order, messages of a job as soon as
+        it and all jobs before it are done.
+        """
+        queue, self.queue = self.queue, None
+        jobs = [job[:3] for errout, message, job in queue if job is not None]
+        warning_outputs = {}
+        pool = multiprocessing.Pool(processes)
+        try:
+            results = pool.imap(publish_job, jobs)
+            for errout, message, job in queue:
+                if job is None:
+                    self.write(errout, message)
+                    continue
+                settings, recorder = job[0], job[3]
+                (elapsed, messages, dependencies, max_level, error,
+                 exit_status) = results.next()
+                if message:
+                    self.write(errout, message % elapsed)
+                if error is None and exit_status is None:
+                    self.file_done(settings, recorder, dependencies,
+                                   max_level)
+                elif self.cache is not None:
+                    self.cache.discard(settings)
+                if messages:
+                    # Open a warnings file only once (ErrorOutput truncates).
+                    if settings.warning_stream not in warning_outputs:
+                        warning_outputs[settings.warning_stream] = (
+                            ErrorOutput(settings.warning_stream,
+                                        settings.error_encoding))
+                    self.write(warning_outputs[settings.warning_stream],
+                               messages)
+                if error is not None:
+                    self.write(errout, '        %s\n' % error)
+                if exit_status is not None:
+                    pool.terminate()
+                    sys.exit(exit_status)
+            pool.close()
+        finally:
+            pool.join()
+
+    def write(self, errout, message):
+        """
+        Write `message` to `errout`.
+
+        In parallel mode, the message is queued instead and written by
+        `self.run_jobs()` after all files queued before it are processed.
+        """
+        if self.queue is not None:
+            self.queue.append((errout, message, None))
+            return
+        errout.write(message)
+        sys.stderr.flush()
+
+    def file_done(self, settings, recorder, dependencies, max_level):
+        """
+        Pass the `dependencies` of a processed file on to the dependency
+        `recorder` and the build cache.
+
+        Files with error messages (`max_level`) are not recorded as up to
+        date: the failing include or stylesheet is missing from the
+        dependencies, and the errors shall be reported again.
+        """
+        recorder.add(*dependencies)
+        if self.cache is not None:
+            if max_level < utils.Reporter.ERROR_LEVEL:
+                self.cache.update(settings, dependencies)
+            else:
+                self.cache.discard(settings)
 
     def visit(self, directory, names, subdirectories):
         settings = self.get_settings('', directory)
         errout = ErrorOutput(encoding=settings.error_encoding)
         if settings.prune and (os.path.abspath(directory) in settings.prune):
-            errout.write('/// ...Skipping directory (pruned): %s\n' %
-                         directory)
-            sys.stderr.flush()
+            self.write(errout, '/// ...Skipping directory (pruned): %s\n' %
+                       directory)
             del subdirectories[:]
             return
         if not self.initial_settings.silent:
-            errout.write('/// Processing directory: %s\n' % directory)
-            sys.stderr.flush()
+            self.write(errout, '/// Processing directory: %s\n' % directory)
         # settings.ignore grows many duplicate entries as we recurse
         # if we add patterns in config files or on the command line.
         for pattern in utils.uniq(settings.ignore):
@@ -229,20 +509,41 @@ class Builder:
         pub_struct = self.publishers[publisher]
         settings._source = os.path.normpath(os.path.join(directory, name))
         settings._destination = settings._source[:-4]+'.html'
+        if self.cache is not None and self.cache.is_current(settings):
+            if not self.initial_settings.silent:
+                self.write(errout, '    ::: Up to date: %s\n' % name)
+            return
+        if self.queue is not None:
+            if self.initial_settings.silent:
+                message = ''
+            else:
+                message = ('    ::: Processing: %s (%%.2f s)\n'
+                           % name.replace('%', '%%'))
+            # The dependency recorder may hold an open file; keep it here
+            # and let the worker collect the dependencies.
+            recorder = settings.record_dependencies
+            settings.record_dependencies = None
+            self.queue.append((errout, message,
+                               (settings, pub_struct.reader_name,
+                                pub_struct.writer_name, recorder)))
+            return
         if not self.initial_settings.silent:
             errout.write('    ::: Processing: %s\n' % name)
             sys.stderr.flush()
+        # Record the dependencies of this file separately:
+        recorder = settings.record_dependencies
+        settings.record_dependencies = utils.DependencyList()
         try:
             if not settings.dry_run:
-                core.publish_file(source_path=settings._source,
-                              destination_path=settings._destination,
-                              reader_name=pub_struct.reader_name,
-                              parser_name='restructuredtext',
-                              writer_name=pub_struct.writer_name,
-                              settings=settings)
+                max_level = publish_file(settings, pub_struct.reader_name,
+                                         pub_struct.writer_name)
+                self.file_done(settings, recorder,
+                               settings.record_dependencies.list, max_level)
         except ApplicationError:
             error = sys.exc_info()[1] # get exception in Python <2.6 and 3.x
             errout.write('        %s\n' % ErrorString(error))
+            if self.cache is not None:
+                self.cache.discard(settings)
 
 
 if __name__ == "__main__":
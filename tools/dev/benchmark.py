@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+
+# $Id$
+# Copyright: This script has been placed in the public domain.
+
+"""
+Time parsing, transforms and writers on synthetic reStructuredText
+documents.
+
+Usage: benchmark.py [options] [case ...]
+
+Each case is a generated document stressing one feature (see `cases`).
+For every case, the script times
+
+* parse: the reStructuredText parser alone,
+* transforms: ``Transformer.apply_transforms()`` on the parsed document
+  (reader and parser transforms, as in ``publish_doctree()``),
+* publish_doctree: ``core.publish_doctree()`` (parse and transforms),
+* one entry per writer: ``core.publish_from_doctree()`` on a copy of the
+  document tree.
+
+The best time of ``--repeat`` runs is reported.  ``--json`` saves the
+results for regression tracking; ``--compare`` prints the ratio to a
+saved result file.  Requires Python 2.6 or later (json module).
+"""
+
+import copy
+import json
+import optparse
+import platform
+import sys
+import time
+
+import docutils
+from docutils import core, frontend, utils
+from docutils.parsers import rst
+from docutils.readers import standalone
+
+from benchmark_tables import grid_table
+
+
+def nesting(scale):
+    """Sections nested 5 levels deep, lists and block quotes nested 20 deep."""
+    lines = []
+    adornments = '=-~^"'
+    for i in range(10 * scale):
+        for level in range(len(adornments)):
+            title = 'Section %d.%d' % (i, level)
+            lines.extend([title, adornments[level] * len(title), ''])
+        for level in range(20):
+            lines.extend(['  ' * level + '- item %d.%d' % (i, level), ''])
+        for level in range(20):
+            lines.extend(['    ' * level + 'Quote %d.%d' % (i, level), ''])
+    return lines
+
+def tables(scale):
+    """Grid tables with a column span and simple tables."""
+    lines = []
+    for i in range(scale):
+        lines.extend(grid_table(100, 10) + [''])
+        border = ' '.join(['=' * 8] * 10)
+        lines.append(border)
+        for row in range(100):
+            lines.append(' '.join(['r%03dc%03d' % (row, column)
+                                   for column in range(10)]))
+            if row == 0:
+                lines.append(border)
+        lines.extend([border, ''])
+    return lines
+
+def references(scale):
+    """Footnotes, citations, hyperlink targets and references."""
+    lines = []
+    count = 200 * scale
+    for i in range(count):
+        lines.extend(['Paragraph %d with a footnote [#]_, a numbered '
+                      'footnote [%d]_, a citation [CIT%d]_,' % (i, i + 1, i),
+                      'a reference to target%d_, an `anonymous reference`__ '
+                      'and a symbol footnote [*]_.' % i, '',
+                      '__ http://example.org/anonymous/%d' % i, ''])
+    for i in range(count):
+        lines.extend(['.. [#] Auto-numbered footnote %d.' % i,
+                      '.. [%d] Numbered footnote.' % (i + 1),
+                      '.. [*] Symbol footnote %d.' % i,
+                      '.. [CIT%d] Citation.' % i,
+                      '.. _target%d: http://example.org/%d' % (i, i), ''])
+    return lines
+
+def inline(scale):
+    """Paragraphs with a lot of inline markup."""
+    lines = []
+    for i in range(300 * scale):
+        lines.extend(['Some *emphasis*, **strong emphasis**, ``inline '
+                      'literals``, `interpreted text`,',
+                      ':sub:`subscripts`, :sup:`superscripts`, an '
+                      '`embedded <http://example.org/%d>`_ link,' % i,
+                      'a |substitution|, a standalone URI '
+                      'http://example.org/%d, an address' % i,
+                      'me%d@example.org and an escaped \\*asterisk\\*.'
+                      % i, ''])
+    lines.append('.. |substitution| replace:: *replacement text*')
+    return lines
+
+def math(scale):
+    """Inline math roles and math directives."""
+    lines = []
+    for i in range(50 * scale):
+        lines.extend(['The inline formula :math:`\\alpha_{%d} = '
+                      '\\frac{a^2}{b_{%d}} + \\sqrt{x}`.' % (i, i), '',
+                      '.. math::', '',
+                      '   \\sum_{i=0}^{%d} \\frac{\\partial f}{\\partial x_i}'
+                      ' = \\int_0^\\infty e^{-x^2} \\, dx' % i, ''])
+    return lines
+
+def code(scale):
+    """Code directives and literal blocks."""
+    lines = []
+    for i in range(100 * scale):
+        lines.extend(['.. code:: python', '',
+                      '   def function_%d(argument, *args, **kwargs):' % i,
+                      '       """Docstring."""',
+                      '       for item in range(%d):' % i,
+                      "           print('%s' % (item, argument))", '',
+                      'Literal block::', '',
+                      '    literal text %d' % i,
+                      '        indented line', ''])
+    return lines
+
+cases = [('nesting', nesting), ('tables', tables),
+         ('references', references), ('inline', inline),
+         ('math', math), ('code', code)]
+"""Benchmark cases in output order: (name, document generator)."""
+
+writers = ['pseudoxml', 'xml', 'html4', 'html5', 'latex', 'xetex',
+           'manpage', 'odf_odt']
+"""Writers timed by default."""
+
+settings_overrides = {'_disable_config': True, 'report_level': 5,
+                      'halt_level': 5, 'warning_stream': '',
+                      # time the math conversion of every writer:
+                      'math_cache_size': 0}
+
+
+def best_time(function, repeat, setup=None):
+    """Return the best time of `repeat` calls of `function`."""
+    best = None
+    for i in range(repeat):
+        arguments = ()
+        if setup:
+            arguments = (setup(),)
+        start = time.time()
+        function(*arguments)
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def run_case(source, repeat, writer_names):
+    """Return a dictionary with the timings for one document `source`."""
+    parser = rst.Parser()
+    reader = standalone.Reader(parser=parser)
+    settings = frontend.OptionParser(
+        components=(parser, reader)).get_default_values()
+    settings._update(settings_overrides, 'loose')
+
+    def parse():
+        document = utils.new_document('<benchmark>', settings)
+        parser.parse(source, document)
+        return document
+
+    def transform(document):
+        document.transformer.populate_from_components((reader, parser))
+        document.transformer.apply_transforms()
+
+    doctree = core.publish_doctree(source,
+                                   settings_overrides=settings_overrides)
+    results = {'lines': source.count('\n'),
+               'nodes': len(doctree.traverse()),
+               'parse': best_time(parse, repeat),
+               'transforms': best_time(transform, repeat, parse),
+               'publish_doctree': best_time(
+                   lambda: core.publish_doctree(
+                       source, settings_overrides=settings_overrides),
+                   repeat)}
+    for writer_name in writer_names:
+        results[writer_name] = best_time(
+            lambda document: core.publish_from_doctree(
+                document, writer_name=writer_name,
+                settings_overrides=settings_overrides),
+            repeat, lambda: copy.deepcopy(doctree))
+    return results
+
+def main(args):
+    option_parser = optparse.OptionParser(
+        usage='%prog [options] [case ...]',
+        description='Cases: %s.' % ', '.join([name for name, g in cases]))
+    option_parser.add_option(
+        '--scale', type='int', default=1,
+        help='Document size multiplier.  Default: 1.')
+    option_parser.add_option(
+        '--repeat', type='int', default=3,
+        help='Number of runs; the best time is reported.  Default: 3.')
+    option_parser.add_option(
+        '--writers', default=','.join(writers),
+        help='Comma-separated writer names.  Default: %default.')
+    option_parser.add_option(
+        '--json', metavar='<file>',
+        help='Save the results to <file> in JSON format.')
+    option_parser.add_option(
+        '--compare', metavar='<file>',
+        help='Show the ratio to the results saved in <file>.')
+    options, names = option_parser.parse_args(args)
+    generators = dict(cases)
+    for name in names:
+        if name not in generators:
+            option_parser.error('unknown case: %s' % name)
+    if not names:
+        names = [name for name, generator in cases]
+    writer_names = [name for name in options.writers.split(',') if name]
+    baseline = {}
+    if options.compare:
+        baseline = json.load(open(options.compare))['results']
+    results = {}
+    for name in names:
+        source = u'\n'.join(generators[name](options.scale)) + u'\n'
+        results[name] = run_case(source, options.repeat, writer_names)
+        print('%s: %d lines, %d nodes' % (name, results[name]['lines'],
+                                         results[name]['nodes']))
+        for key in ['parse', 'transforms', 'publish_doctree'] + writer_names:
+            line = '  %-16s %9.3f s' % (key, results[name][key])
+            old = baseline.get(name, {}).get(key)
+            if old:
+                line += '  %6.2fx' % (results[name][key] / old)
+            print(line)
+    if options.json:
+        report = {'docutils': docutils.__version__,
+                  'python': platform.python_version(),
+                  'platform': platform.platform(),
+                  'scale': options.scale,
+                  'repeat': options.repeat,
+                  'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+                  'results': results}
+        output = open(options.json, 'w')
+        try:
+            json.dump(report, output, indent=2, sort_keys=True)
+        finally:
+            output.close()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
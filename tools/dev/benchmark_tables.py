@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+# $Id$
+# Copyright: This script has been placed in the public domain.
+
+"""
+Time the grid table parser on large synthetic tables.
+
+Usage: benchmark_tables.py [rows columns]
+
+Without arguments, a series of table sizes is timed.
+"""
+
+import sys
+import time
+
+from docutils.statemachine import StringList
+from docutils.parsers.rst import tableparser
+
+
+def grid_table(rows, columns):
+    """Return the lines of a grid table with a header row and spans."""
+    width = len(u' r%dc%d ' % (rows, columns))
+    border = u'+' + u'+'.join([u'-' * width] * columns) + u'+'
+    lines = [border]
+    for row in range(rows):
+        cells = [(u' r%dc%d' % (row, column)).ljust(width)
+                 for column in range(columns)]
+        if row % 10 == 5 and columns > 1:
+            # a cell spanning two columns
+            cells[0:2] = [(u' r%d span' % row).ljust(2 * width + 1)]
+        lines.append(u'|' + u'|'.join(cells) + u'|')
+        if row == 0:
+            lines.append(border.replace(u'-', u'='))
+        else:
+            lines.append(border)
+    return lines
+
+
+def time_table(rows, columns):
+    block = StringList(grid_table(rows, columns), 'benchmark')
+    start = time.time()
+    colspecs, headrows, bodyrows = tableparser.GridTableParser().parse(block)
+    elapsed = time.time() - start
+    assert len(colspecs) == columns and len(headrows) + len(bodyrows) == rows
+    return elapsed
+
+
+def main(args):
+    if args:
+        sizes = [tuple([int(arg) for arg in args])]
+    else:
+        sizes = [(100, 20), (500, 50), (2000, 50), (500, 200), (2000, 200)]
+    for size in sizes:
+        elapsed = time_table(*size)
+        print('%5d rows x %3d columns: %8.3f s' % (size[0], size[1], elapsed))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
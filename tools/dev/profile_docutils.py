@@ -6,7 +6,8 @@
 
 import os.path
 import docutils.core
-import hotshot.stats
+import cProfile
+import pstats
 
 print('Profiler started.')
 
@@ -14,21 +15,21 @@ os.chdir(os.path.join(os.path.dirname(docutils.__file__), '..'))
 
 print('Profiling...')
 
-prof = hotshot.Profile('docutils.prof')
+prof = cProfile.Profile()
 prof.runcall(docutils.core.publish_file, source_path='HISTORY.txt',
              destination_path='prof.HISTORY.html', writer_name='html')
-prof.close()
+prof.dump_stats('docutils.prof')
 
 print('Loading statistics...')
 
 print("""
-stats = hotshot.stats.load('docutils.prof')
+stats = pstats.Stats('docutils.prof')
 stats.strip_dirs()
 stats.sort_stats('time')  # 'cumulative'; 'calls'
 stats.print_stats(40)
 """)
 
-stats = hotshot.stats.load('docutils.prof')
+stats = pstats.Stats('docutils.prof')
 stats.strip_dirs()
 stats.sort_stats('time')
 stats.print_stats(40)
@@ -64,6 +64,11 @@ def process_and_return_filelist(options):
     cout.close()
     return (dirs, files)
 
+def run_buildhtml(options):
+    p = Popen(buildhtml_path+" "+options, shell=True,
+              stdout=PIPE, stderr=STDOUT, close_fds=True)
+    return p.communicate()[0].decode('ascii', 'replace')
+
 class BuildHtmlTests(unittest.TestCase):
     tree = ( "_tmp_test_tree",
              "_tmp_test_tree/one.txt",
@@ -115,5 +120,113 @@ class BuildHtmlTests(unittest.TestCase):
         self.assertEqual( len(dirs), 1)
         self.assertEqual( files, [])
 
+    def test_jobs(self):
+        opts = "--dry-run --jobs=2 "+ self.root
+        dirs, files = process_and_return_filelist( opts )
+        self.assertEqual(files.count("one.txt"), 4)
+        self.assertEqual((dirs, files),
+                         process_and_return_filelist("--dry-run "+ self.root))
+
+    def test_jobs_build(self):
+        tree = os.path.join(self.root, "_tmp_test_tree")
+        fd_s = open(os.path.join(tree, "dir1", "two.txt"), "w")
+        fd_s.write("A problem_.\n")
+        fd_s.close()
+        outputs = [os.path.join(self.root, s[:-4] + ".html")
+                   for s in self.tree if s.endswith(".txt")]
+        try:
+            sequential = run_buildhtml( tree )
+            for path in outputs:
+                os.remove(path)
+            parallel = run_buildhtml( "--jobs=2 " + tree )
+            for path in outputs:
+                self.assertTrue(os.path.exists(path))
+            self.assertTrue("dummy" in open(outputs[0]).read())
+            # same messages in the same order, with processing times:
+            self.assertEqual(parallel.count("::: Processing:"), 8)
+            self.assertTrue('(ERROR/3) Unknown target name: "problem".'
+                            in parallel)
+            self.assertEqual(re.sub(r" \(\d+\.\d\d s\)\n", "\n", parallel),
+                             sequential)
+        finally:
+            for path in outputs:
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def test_build_cache(self):
+        tree = os.path.join(self.root, "_tmp_test_tree")
+        cache = os.path.join(self.root, "_tmp_build_cache")
+        opts = "--local --build-cache=%s %s" % (cache, tree)
+        outputs = [os.path.join(tree, "one.html"),
+                   os.path.join(tree, "two.html")]
+        try:
+            output = run_buildhtml( opts )
+            self.assertEqual(output.count("::: Processing:"), 2)
+            self.assertTrue(os.path.exists(cache))
+            # second run: all files are up to date
+            output = run_buildhtml( opts )
+            self.assertEqual(output.count("::: Up to date:"), 2)
+            # missing output: process this file again
+            os.remove(outputs[1])
+            output = run_buildhtml( opts )
+            self.assertTrue("::: Up to date: one.txt" in output)
+            self.assertTrue("::: Processing: two.txt" in output)
+        finally:
+            for path in outputs + [cache]:
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def test_build_cache_errors(self):
+        tree = os.path.join(self.root, "_tmp_test_tree", "dir1")
+        cache = os.path.join(self.root, "_tmp_build_cache")
+        opts = "--local --build-cache=%s %s" % (cache, tree)
+        fd_s = open(os.path.join(tree, "two.txt"), "w")
+        fd_s.write("A problem_.\n")
+        fd_s.close()
+        outputs = [os.path.join(tree, "one.html"),
+                   os.path.join(tree, "two.html")]
+        try:
+            output = run_buildhtml( opts )
+            self.assertTrue('(ERROR/3) Unknown target name: "problem".'
+                            in output)
+            # a file with errors is processed (and reported) again:
+            output = run_buildhtml( opts )
+            self.assertTrue("::: Up to date: one.txt" in output)
+            self.assertTrue("::: Processing: two.txt" in output)
+            self.assertTrue('(ERROR/3) Unknown target name: "problem".'
+                            in output)
+            output = run_buildhtml( "--jobs=2 " + opts )
+            self.assertTrue("::: Processing: two.txt (" in output)
+        finally:
+            for path in outputs + [cache]:
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def test_build_cache_include(self):
+        tree = os.path.join(self.root, "_tmp_test_tree", "dir2")
+        cache = os.path.join(self.root, "_tmp_build_cache")
+        opts = "--local --build-cache=%s %s" % (cache, tree)
+        fd_s = open(os.path.join(tree, "two.txt"), "w")
+        fd_s.write(".. include:: sub/one.txt\n")
+        fd_s.close()
+        outputs = [os.path.join(tree, "one.html"),
+                   os.path.join(tree, "two.html")]
+        try:
+            output = run_buildhtml( opts )
+            output = run_buildhtml( opts )
+            self.assertEqual(output.count("::: Up to date:"), 2)
+            # changing the included file triggers a rebuild:
+            fd_s = open(os.path.join(tree, "sub", "one.txt"), "w")
+            fd_s.write("changed")
+            fd_s.close()
+            output = run_buildhtml( opts )
+            self.assertTrue("::: Up to date: one.txt" in output)
+            self.assertTrue("::: Processing: two.txt" in output)
+            self.assertTrue("changed" in open(outputs[1]).read())
+        finally:
+            for path in outputs + [cache]:
+                if os.path.exists(path):
+                    os.remove(path)
+
 if __name__ == '__main__':
     unittest.main()